@@ -0,0 +1,160 @@
+"""
+Admission control for expensive API endpoints.
+
+Each endpoint class (fetch, generate, render) gets a concurrency limit and a
+bounded wait queue. Requests beyond the queue are answered with 429 and a
+Retry-After estimated from recent service times, so the threadpool never
+accumulates an unbounded backlog.
+"""
+
+import os
+import math
+import time
+import asyncio
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Dict, Optional
+
+from fastapi.responses import JSONResponse
+
+# Endpoint class -> API paths it covers
+ENDPOINT_CLASSES: Dict[str, tuple] = {
+    "fetch": ("/api/fetch",),
+    "generate": ("/api/portfolio", "/api/portfolio-from-data"),
+    "render": ("/api/generate-from-edited",),
+}
+
+DEFAULT_CONCURRENCY = {"fetch": 8, "generate": 4, "render": 4}
+DEFAULT_QUEUE_SIZE = {"fetch": 32, "generate": 8, "render": 16}
+# A queued request waits at most this long for a slot before being turned away
+MAX_WAIT_SECONDS = float(os.environ.get("ADMISSION_MAX_WAIT_SECONDS", "30"))
+# Used for Retry-After until a class has completed any requests
+DEFAULT_SERVICE_SECONDS = 2.0
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request cannot be queued or waited too long for a slot."""
+
+    def __init__(self, endpoint_class: str, retry_after: int, reason: str):
+        super().__init__(f"{endpoint_class}: {reason}")
+        self.endpoint_class = endpoint_class
+        self.retry_after = retry_after
+        self.reason = reason
+
+
+class EndpointLimiter:
+    """Concurrency limit plus bounded wait queue for one endpoint class."""
+
+    def __init__(self, name: str, concurrency: int, queue_size: int, max_wait: float = MAX_WAIT_SECONDS):
+        self.name = name
+        self.concurrency = max(1, concurrency)
+        self.queue_size = max(0, queue_size)
+        self.max_wait = max_wait
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self._service_times = deque(maxlen=100)
+        self.active = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.rejected = 0
+        self.timed_out = 0
+
+    def mean_service_time(self) -> float:
+        if not self._service_times:
+            return DEFAULT_SERVICE_SECONDS
+        return sum(self._service_times) / len(self._service_times)
+
+    def retry_after(self) -> int:
+        """Seconds until the current backlog is expected to drain."""
+        backlog = self.waiting + self.active + 1
+        return max(1, math.ceil(self.mean_service_time() * backlog / self.concurrency))
+
+    @asynccontextmanager
+    async def slot(self):
+        if self._semaphore.locked() and self.waiting >= self.queue_size:
+            self.rejected += 1
+            raise AdmissionRejected(self.name, self.retry_after(), "queue full")
+
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), timeout=self.max_wait)
+        except asyncio.TimeoutError:
+            self.timed_out += 1
+            raise AdmissionRejected(self.name, self.retry_after(), "timed out waiting for a slot")
+        finally:
+            self.waiting -= 1
+
+        self.active += 1
+        self.admitted += 1
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self._service_times.append(time.monotonic() - started)
+            self.active -= 1
+            self._semaphore.release()
+
+    def snapshot(self) -> dict:
+        return {
+            "concurrency": self.concurrency,
+            "queue_size": self.queue_size,
+            "active": self.active,
+            "queue_depth": self.waiting,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+            "mean_service_seconds": round(self.mean_service_time(), 3),
+        }
+
+
+class AdmissionController:
+    """Maps request paths to their endpoint-class limiter."""
+
+    def __init__(self, limiters: Dict[str, EndpointLimiter]):
+        self.limiters = limiters
+        self._by_path = {
+            path: limiters[name]
+            for name, paths in ENDPOINT_CLASSES.items()
+            if name in limiters
+            for path in paths
+        }
+
+    @classmethod
+    def from_env(cls) -> "AdmissionController":
+        """Build limiters from ADMISSION_<CLASS>_CONCURRENCY / ADMISSION_<CLASS>_QUEUE."""
+        limiters = {}
+        for name in ENDPOINT_CLASSES:
+            concurrency = int(os.environ.get(f"ADMISSION_{name.upper()}_CONCURRENCY", DEFAULT_CONCURRENCY[name]))
+            queue_size = int(os.environ.get(f"ADMISSION_{name.upper()}_QUEUE", DEFAULT_QUEUE_SIZE[name]))
+            limiters[name] = EndpointLimiter(name, concurrency, queue_size)
+        return cls(limiters)
+
+    def limiter_for(self, path: str) -> Optional[EndpointLimiter]:
+        return self._by_path.get(path.rstrip("/") or "/")
+
+    def snapshot(self) -> dict:
+        return {name: limiter.snapshot() for name, limiter in self.limiters.items()}
+
+
+class AdmissionMiddleware:
+    """ASGI middleware that admits requests before they reach the threadpool."""
+
+    def __init__(self, app, controller: AdmissionController):
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope, receive, send):
+        limiter = self.controller.limiter_for(scope["path"]) if scope["type"] == "http" else None
+        if limiter is None:
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            async with limiter.slot():
+                await self.app(scope, receive, send)
+        except AdmissionRejected as e:
+            response = JSONResponse(
+                {"detail": f"Server busy ({e.reason}), retry later", "endpoint_class": e.endpoint_class},
+                status_code=429,
+                headers={"Retry-After": str(e.retry_after)},
+            )
+            await response(scope, receive, send)
@@ -1,23 +1,26 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, Header, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from fetcher import fetch_and_shape
-from organized_structure.generation.render_pdf import (
-    render_html_portfolio,
-    render_pdf_portfolio,
-)
+from admission import AdmissionController, AdmissionMiddleware
+from organized_structure.generation import render_pool
+from organized_structure.generation.render_pool import RenderTimeoutError
+from organized_structure.generation.asset_cache import pdf_image
+from organized_structure.generation.render_pdf import PREVIEW_VIEW, apply_view
+from organized_structure.generation.preview import PatchError, PreviewSession
+from organized_structure.generation.thumbnail import thumbnail_path
+from organized_structure.generation.html_artifacts import SIDECAR_SUFFIXES, fresh_sidecars, negotiate_encoding, sidecar_path
+from organized_structure.generation.log_config import configure_logging, get_logger
 from pathlib import Path
 import json
-import copy
 from datetime import datetime
-from xhtml2pdf import pisa
 from fastapi.responses import FileResponse, Response
-from urllib.parse import unquote
+from urllib.parse import quote, unquote
 import os
 import sys
 import shutil
 import base64
-import requests
 
 ROOT = Path(__file__).parent
 # Ensure we can import improved generator and extraction utilities
@@ -31,8 +34,26 @@ for p in (GEN_DIR, CORE_DIR):
 from generate_portfolio_improved import generate_portfolio_improved  # noqa: E402
 from parse_and_extract import extract_repo_features, extract_user_features  # noqa: E402
 
+configure_logging()
+logger = get_logger(__name__)
+
 app = FastAPI()
+admission = AdmissionController.from_env()
+
+
+@app.on_event("startup")
+def start_render_pool():
+    # Spawn the render workers up front so reportlab/jinja2/xhtml2pdf are imported once
+    render_pool.warm_render_pool()
 
+
+@app.on_event("shutdown")
+def stop_render_pool():
+    render_pool.shutdown_render_pool()
+
+
+# Added before CORS so 429 responses still carry CORS headers
+app.add_middleware(AdmissionMiddleware, controller=admission)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -47,6 +68,12 @@ def health():
     return {"ok": True}
 
 
+@app.get("/api/admission")
+def admission_stats():
+    """Concurrency, queue depth and rejection counters per endpoint class."""
+    return admission.snapshot()
+
+
 @app.get("/api/latest")
 def latest_outputs():
     try:
@@ -54,18 +81,23 @@ def latest_outputs():
         html_dir = root / "generated_htmls"
         pdf_dir = root / "generated_pdfs"
 
-        def newest_file(p: Path) -> str | None:
+        def newest_file(p: Path, suffix: str) -> str | None:
             if not p.exists():
                 return None
-            files = [f for f in p.iterdir() if f.is_file()]
+            # Skip sidecars such as .thumb.png and precompressed copies
+            files = [f for f in p.iterdir() if f.is_file() and f.suffix == suffix]
             if not files:
                 return None
             files.sort(key=lambda f: f.stat().st_mtime, reverse=True)
             return str(files[0])
 
-        latest_html = newest_file(html_dir)
-        latest_pdf = newest_file(pdf_dir)
-        return {"html_path": latest_html, "pdf_path": latest_pdf}
+        latest_html = newest_file(html_dir, ".html")
+        latest_pdf = newest_file(pdf_dir, ".pdf")
+        return {
+            "html_path": latest_html,
+            "pdf_path": latest_pdf,
+            "pdf_thumbnail_url": thumbnail_url(Path(latest_pdf)) if latest_pdf else None,
+        }
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -88,30 +120,13 @@ class PortfolioRequest(BaseModel):
     token: str
     profile_url_or_username: str
     output_dir: str | None = None
+    # View limits for html_path/pdf_path; the full portfolio is rendered too when include_full is set
+    max_skills: int | None = PREVIEW_VIEW["max_skills"]
+    max_projects: int | None = PREVIEW_VIEW["max_projects"]
+    include_full: bool = False
 
 
-def _download_file(url: str, target_dir: Path, filename: str | None = None) -> Path | None:
-    try:
-        r = requests.get(url, timeout=10)
-        if r.status_code == 200 and r.content:
-            suffix = ""
-            ct = r.headers.get("Content-Type", "application/octet-stream")
-            if "/" in ct:
-                ext = ct.split("/")[-1].split(";")[0]
-                if ext and len(ext) < 10:
-                    suffix = "." + ext
-            target_dir.mkdir(parents=True, exist_ok=True)
-            name = filename or ("asset_" + datetime.now().strftime("%H%M%S"))
-            out = target_dir / f"{name}{suffix}"
-            with open(out, "wb") as f:
-                f.write(r.content)
-            return out
-    except Exception:
-        return None
-    return None
-
-
-def build_pdf_safe_html(portfolio: dict, assets_dir: Path) -> str:
+def build_pdf_safe_html(portfolio: dict) -> str:
     """Create a minimal, xhtml2pdf-friendly HTML string from portfolio data."""
     name = portfolio.get("name", "")
     headline = portfolio.get("headline", "")
@@ -119,9 +134,10 @@ def build_pdf_safe_html(portfolio: dict, assets_dir: Path) -> str:
     avatar_url = portfolio.get("avatarUrl")
     avatar_path = None
     if avatar_url and avatar_url.startswith("http"):
-        local = _download_file(avatar_url, assets_dir, filename="avatar")
+        # Shown at 96px (one inch) by xhtml2pdf
+        local = pdf_image(avatar_url, 1.0)
         if local and local.exists():
-            avatar_path = local.as_posix()
+            avatar_path = local.resolve().as_posix()
 
     def esc(s: str | None) -> str:
         return (s or "").replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
@@ -159,19 +175,9 @@ def build_pdf_safe_html(portfolio: dict, assets_dir: Path) -> str:
 
 def html_to_pdf_simple(portfolio: dict, pdf_path: Path) -> bool:
     try:
-        base_dir = pdf_path.parent
-        html_content = build_pdf_safe_html(portfolio, base_dir)
-
-        def link_callback(uri, rel):
-            if uri.startswith("file://"):
-                return uri[7:]
-            if uri.startswith("/") or ":\\" in uri or ":/" in uri:
-                return uri
-            return str((base_dir / uri).resolve())
-
-        with open(pdf_path, "wb") as pdf_file:
-            result = pisa.CreatePDF(src=html_content, dest=pdf_file, encoding="utf-8", link_callback=link_callback)
-        return not result.err
+        html_content = build_pdf_safe_html(portfolio)
+        # pisa.CreatePDF is CPU-bound; run it in the render pool
+        return render_pool.html_to_pdf(html_content, str(pdf_path))
     except Exception:
         return False
 
@@ -206,6 +212,65 @@ def render_html_fallback(portfolio: dict, output_root: Path, username: str, time
     return html_path
 
 
+def render_view_variants(portfolio: dict, username: str, timestamp: str, view: dict, include_full: bool):
+    """
+    Render the limited view (and optionally the full portfolio) from one shared dict.
+
+    Returns:
+        (limited_html, limited_pdf, full_html, full_pdf) paths; the full ones are None unless requested
+    """
+    limited_base = f"portfolio_limited_{username}_{timestamp}"
+    jobs = [
+        ("html", portfolio, limited_base, "professional", view),
+        ("pdf", portfolio, limited_base, "minimal", view),
+    ]
+    if include_full:
+        full_base = f"portfolio_{username}_{timestamp}"
+        jobs += [
+            ("html", portfolio, full_base, "professional"),
+            ("pdf", portfolio, full_base, "minimal"),
+        ]
+    rendered = render_pool.render_all(jobs)
+    if not include_full:
+        rendered += [None, None]
+    return tuple(rendered)
+
+
+def publish_artifact(rendered: str | None, dest_dir: Path) -> Path | None:
+    """Copy a rendered file into dest_dir; returns the published path or None."""
+    if not rendered or not Path(rendered).exists():
+        return None
+    dest_dir.mkdir(parents=True, exist_ok=True)
+    dest = dest_dir / Path(rendered).name
+    try:
+        copy_with_sidecars(Path(rendered), dest)
+    except Exception:
+        return Path(rendered)
+    return dest
+
+
+def copy_with_sidecars(src: Path, dest: Path) -> None:
+    """Copy a rendered file with its sidecars (.thumb.png for PDFs, .gz/.br for HTML)."""
+    shutil.copyfile(src, dest)
+    sidecars = [(thumbnail_path(src), thumbnail_path(dest))]
+    sidecars += [(sidecar_path(src, enc), sidecar_path(dest, enc)) for enc in SIDECAR_SUFFIXES]
+    for sidecar_src, sidecar_dest in sidecars:
+        if sidecar_src.exists():
+            shutil.copyfile(sidecar_src, sidecar_dest)
+
+
+def thumbnail_etag(thumb: Path) -> str:
+    st = thumb.stat()
+    return f"{st.st_mtime_ns:x}-{st.st_size:x}"
+
+
+def thumbnail_url(pdf_path: Path | None) -> str | None:
+    """Versioned /thumbnail URL for a published PDF (None when it has no thumbnail)."""
+    if not pdf_path or not thumbnail_path(pdf_path).exists():
+        return None
+    return f"/thumbnail?path={quote(str(pdf_path))}&v={thumbnail_etag(thumbnail_path(pdf_path))}"
+
+
 @app.post("/api/portfolio")
 def create_portfolio(req: PortfolioRequest):
     try:
@@ -235,17 +300,13 @@ def create_portfolio(req: PortfolioRequest):
         with open(portfolio_json, "w", encoding="utf-8") as f:
             json.dump(portfolio, f, indent=2, ensure_ascii=False)
 
-        # Create a limited copy for initial HTML/PDF rendering (top 5 skills, top 3 projects)
-        limited_portfolio = copy.deepcopy(portfolio)
-        limited_portfolio["skills"] = (limited_portfolio.get("skills") or [])[:5]
-        limited_portfolio["top_projects"] = (limited_portfolio.get("top_projects") or [])[:3]
-        limited_portfolio_json = generated / f"portfolio_limited_{username}_{timestamp}.json"
-        with open(limited_portfolio_json, "w", encoding="utf-8") as f:
-            json.dump(limited_portfolio, f, indent=2, ensure_ascii=False)
-
-        # Render HTML and PDF using limited portfolio for initial outputs
-        html_rendered = render_html_portfolio(str(limited_portfolio_json), theme='professional')
-        pdf_rendered = render_pdf_portfolio(str(limited_portfolio_json), theme='minimal')
+        # Initial outputs use the limited view (top 5 skills, top 3 projects by default),
+        # applied at render time on the shared portfolio instead of a copied JSON file
+        view = {"max_skills": req.max_skills, "max_projects": req.max_projects}
+        limited_portfolio = apply_view(portfolio, **view)
+        html_rendered, pdf_rendered, full_html, full_pdf = render_view_variants(
+            portfolio, username, timestamp, view, req.include_full
+        )
 
         html_path = Path(html_rendered) if html_rendered else None
         pdf_path = None
@@ -259,7 +320,7 @@ def create_portfolio(req: PortfolioRequest):
         html_final = html_final_dir / html_path.name if html_path else None
         if html_path and html_path.exists():
             try:
-                shutil.copyfile(html_path, html_final)
+                copy_with_sidecars(html_path, html_final)
             except Exception:
                 html_final = html_path
 
@@ -270,7 +331,7 @@ def create_portfolio(req: PortfolioRequest):
             pdf_src = Path(pdf_rendered)
             pdf_path = pdf_dir / pdf_src.name
             try:
-                shutil.copyfile(pdf_src, pdf_path)
+                copy_with_sidecars(pdf_src, pdf_path)
             except Exception:
                 pdf_path = None
         else:
@@ -281,6 +342,9 @@ def create_portfolio(req: PortfolioRequest):
                 if not ok:
                     pdf_path = None
 
+        full_html_final = publish_artifact(full_html, html_final_dir)
+        full_pdf_final = publish_artifact(full_pdf, pdf_dir)
+
         # Extract repositories for frontend "Add from GitHub" feature
         repositories = []
         if repos:
@@ -308,10 +372,17 @@ def create_portfolio(req: PortfolioRequest):
             "html_path": str(html_final) if html_final else None,
             "summary_path": None,
             "pdf_path": str(pdf_path) if pdf_path else None,
+            "pdf_thumbnail_url": thumbnail_url(pdf_path),
+            "full_html_path": str(full_html_final) if full_html_final else None,
+            "full_pdf_path": str(full_pdf_final) if full_pdf_final else None,
             "portfolio": portfolio,
             "repositories": repositories,
             "user": user_data,
         }
+    except HTTPException:
+        raise
+    except RenderTimeoutError as e:
+        raise HTTPException(status_code=504, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -333,11 +404,16 @@ def download_file(path: str):
 class PortfolioFromDataRequest(BaseModel):
     data: list[dict]
     output_dir: str | None = None
+    max_skills: int | None = PREVIEW_VIEW["max_skills"]
+    max_projects: int | None = PREVIEW_VIEW["max_projects"]
+    include_full: bool = False
 
 
 class GenerateFromEditedRequest(BaseModel):
     portfolio: dict
     output_dir: str | None = None
+    # Editor session whose previous render is reused; defaults to the portfolio's username
+    session_id: str | None = None
 
 
 @app.post("/api/generate-from-edited")
@@ -349,7 +425,8 @@ def generate_from_edited(req: GenerateFromEditedRequest):
             raise HTTPException(status_code=400, detail="portfolio is required")
 
         # Log what we received
-        print(f"[generate-from-edited] Received portfolio: name={portfolio.get('name')}, skills={len(portfolio.get('skills', []))}, projects={len(portfolio.get('top_projects', []))}")
+        logger.debug("generate-from-edited: name=%s skills=%d projects=%d", portfolio.get('name'),
+                     len(portfolio.get('skills') or []), len(portfolio.get('top_projects') or []))
 
         # Prepare output directories
         root = Path(req.output_dir) if req.output_dir else Path("organized_structure/outputs")
@@ -364,36 +441,17 @@ def generate_from_edited(req: GenerateFromEditedRequest):
             "unknown"
         )
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        
-        # Save the edited portfolio JSON - use this for rendering
-        portfolio_for_render_json = generated / f"portfolio_edited_{username}_{timestamp}.json"
-        portfolio_for_render_json = portfolio_for_render_json.resolve()  # Make path absolute
+        session_key = "".join(c for c in (req.session_id or username) if c.isalnum() or c in "-_") or "unknown"
+
+        # One JSON per editing session, overwritten by each autosave
+        portfolio_for_render_json = (generated / f"portfolio_edited_{session_key}.json").resolve()
         with open(portfolio_for_render_json, "w", encoding="utf-8") as f:
             json.dump(portfolio, f, indent=2, ensure_ascii=False)
-        
-        print(f"[generate-from-edited] Saved portfolio JSON to: {portfolio_for_render_json}")
-        print(f"[generate-from-edited] JSON file exists: {portfolio_for_render_json.exists()}")
-        
-        # Verify the JSON was saved correctly by reading it back
-        with open(portfolio_for_render_json, "r", encoding="utf-8") as f:
-            verify_portfolio = json.load(f)
-        print(f"[generate-from-edited] Verified JSON: name={verify_portfolio.get('name')}, skills={len(verify_portfolio.get('skills', []))}, projects={len(verify_portfolio.get('top_projects', []))}")
-        
-        # Show sample of skills and projects to verify edits
-        if verify_portfolio.get('skills'):
-            print(f"[generate-from-edited] Sample skills: {verify_portfolio.get('skills')[:5]}")
-        if verify_portfolio.get('top_projects'):
-            print(f"[generate-from-edited] Sample projects: {[p.get('name') for p in verify_portfolio.get('top_projects', [])[:3]]}")
-
-        # Render HTML and PDF using the edited portfolio JSON file (use absolute path)
-        json_path_str = str(portfolio_for_render_json)
-        print(f"[generate-from-edited] Rendering HTML from: {json_path_str}")
-        html_rendered = render_html_portfolio(json_path_str, theme='professional')
-        print(f"[generate-from-edited] HTML rendered to: {html_rendered}")
-        
-        print(f"[generate-from-edited] Rendering PDF from: {json_path_str}")
-        pdf_rendered = render_pdf_portfolio(json_path_str, theme='minimal')
-        print(f"[generate-from-edited] PDF rendered to: {pdf_rendered}")
+
+        # Only the sections that changed since this session's last render are rebuilt
+        rendered = render_pool.render_edited(portfolio, session_key, portfolio_for_render_json.stem)
+        html_rendered, pdf_rendered = rendered["html_path"], rendered["pdf_path"]
+        logger.debug("generate-from-edited: rebuilt sections %s", rendered['rebuilt'])
 
         html_path = Path(html_rendered) if html_rendered else None
         pdf_path = None
@@ -408,10 +466,9 @@ def generate_from_edited(req: GenerateFromEditedRequest):
         html_final = html_final_dir / html_path.name if html_path else None
         if html_path and html_path.exists():
             try:
-                shutil.copyfile(html_path, html_final)
-                print(f"[generate-from-edited] Copied HTML to: {html_final}")
+                copy_with_sidecars(html_path, html_final)
             except Exception as e:
-                print(f"[generate-from-edited] Failed to copy HTML: {e}")
+                logger.warning("generate-from-edited: failed to copy HTML to %s: %s", html_final, e)
                 html_final = html_path
 
         pdf_dir = root / "generated_pdfs"
@@ -422,36 +479,77 @@ def generate_from_edited(req: GenerateFromEditedRequest):
             pdf_src = Path(pdf_rendered)
             pdf_path = pdf_dir / pdf_src.name
             try:
-                shutil.copyfile(pdf_src, pdf_path)
-                print(f"[generate-from-edited] Copied PDF to: {pdf_path}")
+                copy_with_sidecars(pdf_src, pdf_path)
             except Exception as e:
-                print(f"[generate-from-edited] Failed to copy PDF: {e}")
+                logger.warning("generate-from-edited: failed to copy PDF to %s: %s", pdf_path, e)
                 pdf_path = None
         else:
             # Fallback to simple HTML-to-PDF using the edited portfolio data
             if html_final and html_final.exists():
                 pdf_path = pdf_dir / (html_final.stem + ".pdf")
-                print(f"[generate-from-edited] Generating PDF fallback from edited portfolio")
                 ok = html_to_pdf_simple(portfolio, pdf_path)  # Use the edited portfolio directly
                 if not ok:
-                    print(f"[generate-from-edited] PDF fallback generation failed")
+                    logger.warning("generate-from-edited: PDF fallback generation failed")
                     pdf_path = None
-                else:
-                    print(f"[generate-from-edited] PDF fallback generated: {pdf_path}")
 
-        print(f"[generate-from-edited] Final paths - HTML: {html_final}, PDF: {pdf_path}")
+        logger.info("generate-from-edited: html=%s pdf=%s", html_final, pdf_path)
 
         return {
             "success": True,
             "json_path": str(portfolio_for_render_json),
             "html_path": str(html_final) if html_final else None,
             "pdf_path": str(pdf_path) if pdf_path else None,
+            "pdf_thumbnail_url": thumbnail_url(pdf_path),
+            "rebuilt_sections": rendered["rebuilt"],
             "portfolio": portfolio,
         }
+    except HTTPException:
+        raise
+    except RenderTimeoutError as e:
+        raise HTTPException(status_code=504, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
+@app.websocket("/ws/preview")
+async def preview_socket(websocket: WebSocket):
+    """
+    Live HTML preview for the editor (PDF is only built on export via /api/generate-from-edited).
+
+    Client messages:
+        {"type": "load", "portfolio": {...}}   -> {"type": "document", "html": ..., "version": n}
+        {"type": "patch", "patch": [ops]}      -> {"type": "fragments", "fragments": {block: html}, "version": n}
+    Patch ops follow RFC 6902 (add / remove / replace). Blocks are delimited in the
+    document by <!--block:name--> ... <!--/block:name--> comments.
+    """
+    await websocket.accept()
+    session = PreviewSession(theme="professional")
+    try:
+        while True:
+            try:
+                try:
+                    message = json.loads(await websocket.receive_text())
+                except (KeyError, ValueError):
+                    # KeyError: a binary frame has no "text"; ValueError: not valid JSON
+                    raise PatchError("messages must be JSON text")
+                if not isinstance(message, dict):
+                    raise PatchError("messages must be JSON objects")
+                kind = message.get("type")
+                if kind == "load" and isinstance(message.get("portfolio"), dict):
+                    reply = await run_in_threadpool(session.load, message["portfolio"])
+                elif kind == "patch" and isinstance(message.get("patch"), list):
+                    if not session.version:
+                        raise PatchError("send a load message before patching")
+                    reply = await run_in_threadpool(session.patch, message["patch"])
+                else:
+                    raise PatchError("expected {type: load, portfolio} or {type: patch, patch}")
+            except PatchError as e:
+                reply = {"type": "error", "detail": str(e), "version": session.version}
+            await websocket.send_json(reply)
+    except WebSocketDisconnect:
+        pass
+
+
 @app.post("/api/portfolio-from-data")
 def create_portfolio_from_data(req: PortfolioFromDataRequest):
     try:
@@ -482,16 +580,12 @@ def create_portfolio_from_data(req: PortfolioFromDataRequest):
         with open(portfolio_json, "w", encoding="utf-8") as f:
             json.dump(portfolio, f, indent=2, ensure_ascii=False)
 
-        limited_portfolio = copy.deepcopy(portfolio)
-        limited_portfolio["skills"] = (limited_portfolio.get("skills") or [])[:5]
-        limited_portfolio["top_projects"] = (limited_portfolio.get("top_projects") or [])[:3]
-        limited_portfolio_json = generated / f"portfolio_limited_{username}_{timestamp}.json"
-        with open(limited_portfolio_json, "w", encoding="utf-8") as f:
-            json.dump(limited_portfolio, f, indent=2, ensure_ascii=False)
-
-        # Render with render_pdf
-        html_rendered = render_html_portfolio(str(limited_portfolio_json), theme='professional')
-        pdf_rendered = render_pdf_portfolio(str(limited_portfolio_json), theme='minimal')
+        # Render the limited view (and the full portfolio if requested) from the same dict
+        view = {"max_skills": req.max_skills, "max_projects": req.max_projects}
+        limited_portfolio = apply_view(portfolio, **view)
+        html_rendered, pdf_rendered, full_html, full_pdf = render_view_variants(
+            portfolio, username, timestamp, view, req.include_full
+        )
 
         html_path = Path(html_rendered) if html_rendered else None
         pdf_path = None
@@ -503,7 +597,7 @@ def create_portfolio_from_data(req: PortfolioFromDataRequest):
         html_final = html_final_dir / html_path.name if html_path else None
         if html_path and html_path.exists():
             try:
-                shutil.copyfile(html_path, html_final)
+                copy_with_sidecars(html_path, html_final)
             except Exception:
                 html_final = html_path
 
@@ -513,7 +607,7 @@ def create_portfolio_from_data(req: PortfolioFromDataRequest):
             pdf_src = Path(pdf_rendered)
             pdf_path = pdf_dir / pdf_src.name
             try:
-                shutil.copyfile(pdf_src, pdf_path)
+                copy_with_sidecars(pdf_src, pdf_path)
             except Exception:
                 pdf_path = None
         else:
@@ -523,6 +617,9 @@ def create_portfolio_from_data(req: PortfolioFromDataRequest):
                 if not ok:
                     pdf_path = None
 
+        full_html_final = publish_artifact(full_html, html_final_dir)
+        full_pdf_final = publish_artifact(full_pdf, pdf_dir)
+
         return {
             "success": True,
             "input_json": str(input_json),
@@ -530,22 +627,65 @@ def create_portfolio_from_data(req: PortfolioFromDataRequest):
             "html_path": str(html_final) if html_final else None,
             "summary_path": None,
             "pdf_path": str(pdf_path) if pdf_path else None,
+            "pdf_thumbnail_url": thumbnail_url(pdf_path),
+            "full_html_path": str(full_html_final) if full_html_final else None,
+            "full_pdf_path": str(full_pdf_final) if full_pdf_final else None,
             "portfolio": portfolio,
         }
+    except HTTPException:
+        raise
+    except RenderTimeoutError as e:
+        raise HTTPException(status_code=504, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@app.get("/thumbnail")
+def pdf_thumbnail(path: str, v: str | None = None, if_none_match: str | None = Header(default=None)):
+    """
+    First-page PNG preview of a generated PDF.
+
+    Requests carrying the current version (?v=, as returned in pdf_thumbnail_url) are
+    cacheable forever; unversioned ones must revalidate against the ETag.
+    """
+    try:
+        decoded = Path(unquote(path))
+        thumb = thumbnail_path(decoded) if decoded.suffix.lower() == ".pdf" else None
+        if thumb is None or not thumb.is_file():
+            raise HTTPException(status_code=404, detail="Thumbnail not found")
+        etag = thumbnail_etag(thumb)
+        headers = {
+            "ETag": f'"{etag}"',
+            "Cache-Control": "public, max-age=31536000, immutable" if v == etag else "no-cache",
+        }
+        if if_none_match and etag in if_none_match:
+            return Response(status_code=304, headers=headers)
+        return Response(content=thumb.read_bytes(), media_type="image/png", headers=headers)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
 @app.get("/view")
-def view_file(path: str):
+def view_file(path: str, accept_encoding: str | None = Header(default=None)):
     try:
         decoded = Path(unquote(path))
         if not decoded.exists() or not decoded.is_file():
             raise HTTPException(status_code=404, detail="File not found")
         media_type = "application/pdf" if decoded.suffix.lower() == ".pdf" else "text/html"
+        headers = {}
+        if media_type == "text/html":
+            # Serve the precompressed sidecar written at render time, if the client accepts it
+            sidecars = fresh_sidecars(decoded)
+            encoding = negotiate_encoding(accept_encoding, sidecars)
+            headers["Vary"] = "Accept-Encoding"
+            if encoding:
+                headers["Content-Encoding"] = encoding
+                decoded = sidecars[encoding]
         with open(decoded, "rb") as f:
             content = f.read()
-        return Response(content=content, media_type=media_type)
+        return Response(content=content, media_type=media_type, headers=headers)
     except HTTPException:
         raise
     except Exception as e:
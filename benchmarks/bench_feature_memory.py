@@ -0,0 +1,113 @@
+"""
+Feature-engineering memory benchmark: peak memory of create_final_feature_set
+on a synthetic crawl, reported as a multiple of the users table size.
+
+With a chunk size the repo table is written to a temporary CSV and streamed
+through owner_repo_stats_chunked instead (peak memory should follow the chunk
+size, not the repo count).
+
+Usage:
+    python benchmarks/bench_feature_memory.py [n_users] [repos_per_user] [chunk_size]
+"""
+
+import sys
+import time
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from feature_engineering import create_final_feature_set, owner_repo_stats_chunked  # noqa: E402
+
+LANGUAGES = ["Python", "JavaScript", "TypeScript", "Go", "Rust", "Java", "C++", "C", "Ruby", "PHP",
+             "Shell", "Kotlin", "Swift", "HTML", "CSS"]
+
+USER_COUNT_COLUMNS = [
+    'total_commit_contributions', 'total_pr_contributions', 'total_issue_contributions',
+    'total_pr_review_contributions', 'total_repositories', 'account_age_days',
+    'contributions_this_year', 'total_recent_additions', 'total_recent_deletions',
+    'unique_repos_committed', 'active_repos', 'total_gist_comments', 'following_count',
+    'followers_count', 'organizations_count', 'forked_repositories_count',
+    'pinned_items_count', 'total_languages', 'sponsoring_count', 'sponsors_count',
+    'total_started_repos', 'total_forked_repos', 'total_contributions',
+    'total_issue_comments', 'total_discussion_comments', 'total_commit_comments',
+]
+USER_RATE_COLUMNS = ['avg_files_per_commit', 'avg_additions_per_commit',
+                     'avg_deletions_per_commit', 'avg_days_since_last_push']
+
+
+def make_dataset(n_users: int, repos_per_user: float = 8.0, seed: int = 0):
+    """Synthetic users/repos tables with the crawl's column names and gaps."""
+    rng = np.random.default_rng(seed)
+    logins = np.array([f"user{i}" for i in range(n_users)], dtype=object)
+    users = {'login': logins}
+    for c in USER_COUNT_COLUMNS:
+        users[c] = rng.poisson(rng.uniform(1, 200), n_users)
+    for c in USER_RATE_COLUMNS:
+        users[c] = rng.gamma(2.0, 20.0, n_users)
+    for c in ['email', 'location', 'avatar_url', 'profile_url']:
+        users[c] = np.where(rng.random(n_users) < 0.6, "x", None)
+    df_users = pd.DataFrame(users)
+    # A few gaps, as in the real export
+    df_users.loc[rng.random(n_users) < 0.02, 'followers_count'] = np.nan
+
+    n_repos = int(n_users * repos_per_user)
+    # ~10% of users own no repos; a few repos belong to owners outside the users table
+    owners = rng.integers(0, int(n_users * 0.9) + 1, n_repos)
+    owner_login = np.array([f"user{i}" for i in owners], dtype=object)
+    owner_login[rng.random(n_repos) < 0.01] = "outsider"
+    df_repo = pd.DataFrame({
+        'owner_login': owner_login,
+        'name': np.array([f"repo{i}" for i in range(n_repos)], dtype=object),
+        'primary_language': np.where(rng.random(n_repos) < 0.9,
+                                     rng.choice(LANGUAGES, n_repos), None),
+        'languages_total_count': rng.integers(1, 8, n_repos),
+        'languages_total_size': rng.integers(1_000, 5_000_000, n_repos),
+        'stargazer_count': rng.zipf(2.0, n_repos),
+        'fork_count': rng.zipf(2.5, n_repos),
+        'watchers_count': rng.zipf(2.5, n_repos),
+        'is_private': rng.random(n_repos) < 0.1,
+        'is_fork': rng.random(n_repos) < 0.2,
+    })
+    return df_users, df_repo
+
+
+def main():
+    n_users = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    repos_per_user = float(sys.argv[2]) if len(sys.argv) > 2 else 8.0
+    chunk_size = int(sys.argv[3]) if len(sys.argv) > 3 else 0
+    df_users, df_repo = make_dataset(n_users, repos_per_user)
+    users_mb = df_users.memory_usage(deep=True).sum() / 2**20
+    repos_mb = df_repo.memory_usage(deep=True).sum() / 2**20
+    print(f"users: {len(df_users):,} rows, {users_mb:.1f} MiB | repos: {len(df_repo):,} rows, {repos_mb:.1f} MiB")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if chunk_size:
+            repos_csv = Path(tmp) / "repos.csv"
+            df_repo.to_csv(repos_csv, index=False)
+            del df_repo
+            print(f"streaming repos from CSV in chunks of {chunk_size:,} rows")
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        repo_source = owner_repo_stats_chunked(repos_csv, chunk_size) if chunk_size else df_repo
+        features = create_final_feature_set(df_users, repo_source)
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    peak_mb = peak / 2**20
+    out_mb = features.memory_usage(deep=True).sum() / 2**20
+    print(f"\noutput: {features.shape}, {out_mb:.1f} MiB")
+    print(f"peak allocated during feature engineering: {peak_mb:.1f} MiB "
+          f"({peak_mb / users_mb:.2f}x users table, {peak_mb / out_mb:.2f}x output)")
+    print(f"wall time: {elapsed:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
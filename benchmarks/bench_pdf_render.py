@@ -0,0 +1,54 @@
+"""
+PDF render benchmark: CPU time per document with the cached PdfTheme
+versus rebuilding styles and table styles on every render (the old behaviour).
+
+Usage:
+    python benchmarks/bench_pdf_render.py [portfolio.json] [iterations]
+"""
+
+import io
+import json
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from reportlab.platypus import SimpleDocTemplate  # noqa: E402
+from organized_structure.generation.pdf_theme import PdfTheme, get_pdf_theme  # noqa: E402
+
+
+def render_once(theme: PdfTheme, portfolio: dict) -> int:
+    buf = io.BytesIO()
+    doc = SimpleDocTemplate(buf, pagesize=theme.pagesize, **theme.margins)
+    doc.build(theme.build_story(portfolio))
+    return len(buf.getvalue())
+
+
+def bench(label: str, make_theme, portfolio: dict, iterations: int) -> float:
+    render_once(make_theme(), portfolio)  # warm-up (imports, font metrics)
+    start = time.process_time()
+    for _ in range(iterations):
+        render_once(make_theme(), portfolio)
+    per_doc_ms = (time.process_time() - start) / iterations * 1000
+    print(f"{label:<28} {per_doc_ms:8.2f} ms CPU/doc")
+    return per_doc_ms
+
+
+def main():
+    portfolio_path = Path(sys.argv[1]) if len(sys.argv) > 1 else ROOT / "organized_structure" / "examples" / "portfolio.json"
+    iterations = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    with open(portfolio_path, "r", encoding="utf-8") as f:
+        portfolio = json.load(f)
+    # Keep the benchmark offline and focused on layout cost
+    portfolio.pop("avatarUrl", None)
+
+    print(f"Rendering {portfolio_path.name} x{iterations}")
+    fresh = bench("theme rebuilt per render", lambda: PdfTheme(), portfolio, iterations)
+    cached = bench("cached theme", lambda: get_pdf_theme("minimal"), portfolio, iterations)
+    print(f"saving: {fresh - cached:.2f} ms/doc ({(1 - cached / fresh) * 100:.1f}%)")
+
+
+if __name__ == "__main__":
+    main()
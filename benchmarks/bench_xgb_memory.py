@@ -0,0 +1,114 @@
+"""
+XGBoost training memory benchmark: peak resident memory of fitting the ranking
+preprocessing + XGBoost regressor in memory versus in external-memory mode
+(shards streamed through external_memory.train_external_memory).
+
+Resident memory is sampled from /proc while training runs (Linux), so the data
+generation before it does not count; run each mode in its own process. Shards
+are written before training starts, from a frame that is then dropped.
+
+Usage:
+    python benchmarks/bench_xgb_memory.py {memory,external} [n_rows] [n_features] [shard_rows]
+"""
+
+import os
+import gc
+import sys
+import time
+import tempfile
+import threading
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from sklearn.compose import ColumnTransformer
+from sklearn.impute import SimpleImputer
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+from xgboost import XGBRegressor
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from external_memory import write_shards, train_external_memory  # noqa: E402
+
+
+def make_dataset(n_rows: int, n_features: int, seed: int = 0):
+    """Synthetic count-like features with gaps and a target built from a few of them."""
+    rng = np.random.default_rng(seed)
+    X = pd.DataFrame(rng.gamma(2.0, 20.0, (n_rows, n_features)),
+                     columns=[f"f{i}" for i in range(n_features)])
+    X = X.mask(rng.random(X.shape) < 0.02)
+    y = np.log1p(X["f0"].fillna(0)) + 0.5 * np.sqrt(X["f1"].fillna(0)) + rng.normal(0, 0.1, n_rows)
+    return X, y.to_numpy()
+
+
+def rss_mb() -> float:
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+
+
+class PeakRSS:
+    """Highest resident memory seen while the block runs."""
+
+    def __enter__(self):
+        self.start = self.peak = rss_mb()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        return self
+
+    def _sample(self):
+        while not self._stop.wait(0.02):
+            self.peak = max(self.peak, rss_mb())
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, rss_mb())
+
+
+def main():
+    mode = sys.argv[1] if len(sys.argv) > 1 else "memory"
+    n_rows = int(sys.argv[2]) if len(sys.argv) > 2 else 2_000_000
+    n_features = int(sys.argv[3]) if len(sys.argv) > 3 else 40
+    shard_rows = int(sys.argv[4]) if len(sys.argv) > 4 else 100_000
+
+    features = [f"f{i}" for i in range(n_features)]
+    prep = ColumnTransformer([
+        ("num", Pipeline([
+            ("impute", SimpleImputer(strategy="median")),
+            ("scale", StandardScaler(with_mean=False))
+        ]), features)
+    ])
+    model = XGBRegressor(objective="reg:squarederror", tree_method="hist", n_estimators=100,
+                         max_depth=6, learning_rate=0.1, random_state=42)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        X, y = make_dataset(n_rows, n_features)
+        print(f"{mode}: {n_rows:,} rows x {n_features} features, "
+              f"{X.memory_usage().sum() / 2**20:.1f} MiB raw")
+        if mode == "external":
+            # Fitted on a sample, so no transformed copy of the full frame is ever made
+            prep.fit(X.sample(min(n_rows, 200_000), random_state=0))
+            shards = write_shards(X, y, Path(tmp) / "train", shard_rows)
+            del X, y
+            gc.collect()
+            start = time.perf_counter()
+            with PeakRSS() as rss:
+                train_external_memory(shards, features, ["target_0"], model.get_xgb_params(),
+                                      model.n_estimators, transform=prep.transform,
+                                      cache_dir=Path(tmp) / "cache")
+        else:
+            start = time.perf_counter()
+            with PeakRSS() as rss:
+                Pipeline([("prep", prep), ("model", model)]).fit(X, y)
+        elapsed = time.perf_counter() - start
+
+    print(f"peak RSS while training: {rss.peak:.0f} MiB "
+          f"(+{rss.peak - rss.start:.0f} MiB over the {rss.start:.0f} MiB before)")
+    print(f"training wall time: {elapsed:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Incremental render check: a multi-page portfolio edited several times in one
+render_edited() session must give the same PDF bytes as a fresh full render of
+each edit (ReportLab invariant mode, so dates and document IDs are fixed).
+
+Multi-page output matters: doc.build() splits flowables across pages in place,
+so anything reused from an earlier build shows up here.
+
+Usage:
+    python benchmarks/check_incremental_render.py [portfolio.json] [copies of top_projects]
+"""
+
+import io
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from reportlab import rl_config  # noqa: E402
+from reportlab.platypus import SimpleDocTemplate  # noqa: E402
+
+rl_config.invariant = 1
+
+from organized_structure.generation.incremental import render_edited  # noqa: E402
+from organized_structure.generation.pdf_theme import PdfTheme  # noqa: E402
+
+
+def fresh_pdf(portfolio: dict) -> bytes:
+    theme = PdfTheme()
+    buf = io.BytesIO()
+    doc = SimpleDocTemplate(buf, pagesize=theme.pagesize, **theme.margins)
+    doc.build(theme.build_story(portfolio))
+    return buf.getvalue()
+
+
+def edits(portfolio: dict):
+    """(label, portfolio) pairs: only one or two sections change per step."""
+    yield "initial", portfolio
+    portfolio = dict(portfolio, summary="An edited summary. " * 8)
+    yield "summary", portfolio
+    portfolio = dict(portfolio, skills=list(portfolio.get("skills") or []) + ["Rust", "Go"])
+    yield "skills", portfolio
+    yield "unchanged", dict(portfolio)
+    portfolio = dict(portfolio, top_projects=list(reversed(portfolio["top_projects"])))
+    yield "projects", portfolio
+    portfolio = dict(portfolio, summary="Short again.", name=f"{portfolio.get('name', '')} (edited)")
+    yield "summary+header", portfolio
+
+
+def main():
+    portfolio_path = Path(sys.argv[1]) if len(sys.argv) > 1 else ROOT / "organized_structure" / "examples" / "portfolio.json"
+    copies = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    with open(portfolio_path, "r", encoding="utf-8") as f:
+        portfolio = json.load(f)
+    # Offline: no avatar download
+    portfolio.pop("avatarUrl", None)
+    portfolio["top_projects"] = list(portfolio.get("top_projects") or []) * copies
+
+    failures = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        for label, edited in edits(portfolio):
+            result = render_edited(edited, "check", "check")
+            with open(result["pdf_path"], "rb") as f:
+                incremental = f.read()
+            expected = fresh_pdf(edited)
+            pages = expected.count(b"/Type /Page\n")
+            ok = incremental == expected
+            failures += not ok
+            print(f"{label:<16} {pages} pages  rebuilt pdf={result['rebuilt']['pdf']}  "
+                  f"{'identical' if ok else 'DIFFERENT'}")
+    print("OK" if not failures else f"{failures} edit(s) differ from a fresh render")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
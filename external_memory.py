@@ -0,0 +1,190 @@
+"""
+External-Memory XGBoost Training
+Train XGBoost regressors from Parquet/CSV shards instead of one in-memory matrix
+
+A ShardIter hands XGBoost one shard at a time (preprocessed on the fly), XGBoost
+sketches the feature quantiles in a streaming pass over the shards and keeps the
+quantized pages in an on-disk cache, so peak memory is one shard plus the model,
+not the full transformed training matrix.
+
+Without ExtMemQuantileDMatrix (XGBoost < 3.0) the iterator feeds an external-memory
+DMatrix instead, which XGBoost sketches the same way when training with `hist`.
+"""
+
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+from xgboost import XGBRegressor
+
+from training_data import HAS_PYARROW, CACHE_SUFFIX
+
+HAS_EXTMEM_QUANTILE = hasattr(xgb, "ExtMemQuantileDMatrix")
+
+DEFAULT_SHARD_ROWS = 100_000
+
+
+def write_shards(X: pd.DataFrame, y, out_dir, rows_per_shard: int = DEFAULT_SHARD_ROWS,
+                 target_names: Optional[Sequence[str]] = None) -> List[Path]:
+    """
+    Write features and targets as row shards (Parquet with pyarrow, else CSV).
+
+    Existing shards in `out_dir` are replaced.
+
+    Args:
+        X: Feature frame
+        y: Target vector or frame (one column per output)
+        out_dir: Shard directory
+        rows_per_shard: Rows per shard (the iterator's batch size)
+        target_names: Target column names (default target_0, target_1, ...)
+
+    Returns:
+        Shard paths in row order
+    """
+    out_dir = Path(out_dir)
+    if out_dir.exists():
+        shutil.rmtree(out_dir)
+    out_dir.mkdir(parents=True)
+
+    y = y.to_numpy() if isinstance(y, (pd.Series, pd.DataFrame)) else np.asarray(y)
+    y = y.reshape(len(y), -1)
+    target_names = list(target_names or [f"target_{i}" for i in range(y.shape[1])])
+    suffix = CACHE_SUFFIX if HAS_PYARROW else ".csv"
+
+    shards = []
+    for n, start in enumerate(range(0, len(X), rows_per_shard)):
+        part = X.iloc[start:start + rows_per_shard].reset_index(drop=True)
+        part = part.assign(**dict(zip(target_names, y[start:start + rows_per_shard].T)))
+        path = out_dir / f"shard_{n:05d}{suffix}"
+        if HAS_PYARROW:
+            part.to_parquet(path, index=False)
+        else:
+            part.to_csv(path, index=False)
+        shards.append(path)
+    return shards
+
+
+def read_shard(path, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """One shard, Parquet or CSV by suffix."""
+    path = Path(path)
+    if path.suffix == CACHE_SUFFIX:
+        return pd.read_parquet(path, columns=columns)
+    return pd.read_csv(path, usecols=columns, low_memory=False)
+
+
+class ShardIter(xgb.DataIter):
+    """
+    XGBoost data iterator over Parquet/CSV shards.
+
+    Each call to next() reads one shard, applies `transform` to its feature
+    columns (e.g. a fitted preprocessing ColumnTransformer) and passes the batch on.
+    """
+
+    def __init__(self, shards: Sequence, features: List[str], targets: List[str],
+                 transform: Optional[Callable] = None, cache_prefix: Optional[str] = None):
+        self.shards = [Path(s) for s in shards]
+        self.features = list(features)
+        self.targets = list(targets)
+        self.transform = transform
+        self._it = 0
+        super().__init__(cache_prefix=cache_prefix)
+
+    def next(self, input_data: Callable) -> bool:
+        if self._it == len(self.shards):
+            return False
+        frame = read_shard(self.shards[self._it], self.features + self.targets)
+        X = frame[self.features]
+        if self.transform is not None:
+            X = self.transform(X)
+        y = frame[self.targets].to_numpy(dtype=np.float32)
+        input_data(data=np.asarray(X, dtype=np.float32), label=y if y.shape[1] > 1 else y[:, 0])
+        self._it += 1
+        return True
+
+    def reset(self) -> None:
+        self._it = 0
+
+
+def _dmatrix(it: ShardIter, max_bin: int, ref=None, nthread: Optional[int] = None) -> xgb.DMatrix:
+    if HAS_EXTMEM_QUANTILE:
+        return xgb.ExtMemQuantileDMatrix(it, max_bin=max_bin, ref=ref, nthread=nthread)
+    return xgb.DMatrix(it, nthread=nthread)
+
+
+def train_external_memory(train_shards: Sequence, features: List[str], targets: List[str],
+                          params: Dict, num_boost_round: int,
+                          eval_shards: Optional[Sequence] = None,
+                          transform: Optional[Callable] = None,
+                          early_stopping_rounds: Optional[int] = None,
+                          cache_dir=None) -> XGBRegressor:
+    """
+    Train an XGBoost regressor from shards in external-memory mode.
+
+    Args:
+        train_shards: Training shards (see write_shards)
+        features: Feature columns, in the order the model expects
+        targets: Target columns (several train one multi-output booster)
+        params: XGBRegressor-style parameters, e.g. get_xgb_params() (n_estimators is num_boost_round)
+        num_boost_round: Boosting rounds
+        eval_shards: Validation shards (reported, and used for early stopping)
+        transform: Applied to each batch's features, e.g. a fitted ColumnTransformer's transform
+        early_stopping_rounds: Stop when validation RMSE has not improved for this many rounds
+        cache_dir: Directory for XGBoost's page cache (a temporary directory when None)
+
+    Returns:
+        A fitted XGBRegressor, usable as the model step of a Pipeline
+    """
+    # Unset (None) entries, as in XGBRegressor.get_xgb_params(), keep XGBoost's defaults
+    params = {k: v for k, v in params.items() if v is not None}
+    params.pop("n_estimators", None)
+    nthread = params.pop("n_jobs", None)
+    nthread = None if nthread is None or nthread <= 0 else nthread
+    max_bin = params.pop("max_bin", 256)
+    params.pop("early_stopping_rounds", None)
+    params.setdefault("tree_method", "hist")
+    params.setdefault("eval_metric", "rmse")
+    if len(targets) > 1:
+        params.setdefault("multi_strategy", "one_output_per_tree")
+    if params.get("tree_method") == "gpu_hist":
+        params["tree_method"] = "hist"
+        params.setdefault("device", "cuda")
+    booster_params = {("seed" if k == "random_state" else k): v for k, v in params.items()}
+    if nthread:
+        booster_params["nthread"] = nthread
+
+    own_cache = cache_dir is None
+    cache_dir = Path(tempfile.mkdtemp(prefix="xgb_extmem_") if own_cache else cache_dir)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    dtrain = dval = None
+    try:
+        dtrain = _dmatrix(ShardIter(train_shards, features, targets, transform,
+                                    cache_prefix=os.path.join(cache_dir, "train")),
+                          max_bin, nthread=nthread)
+        evals = [(dtrain, "train")]
+        if eval_shards:
+            dval = _dmatrix(ShardIter(eval_shards, features, targets, transform,
+                                      cache_prefix=os.path.join(cache_dir, "val")),
+                            max_bin, ref=dtrain, nthread=nthread)
+            evals.append((dval, "validation"))
+        booster = xgb.train(
+            booster_params, dtrain, num_boost_round=num_boost_round, evals=evals,
+            early_stopping_rounds=early_stopping_rounds if eval_shards else None,
+            verbose_eval=False,
+        )
+    finally:
+        # Freeing the matrices removes their cache pages
+        dtrain = dval = evals = None
+        if own_cache:
+            shutil.rmtree(cache_dir, ignore_errors=True)
+
+    if early_stopping_rounds and eval_shards:
+        booster = booster[:booster.best_iteration + 1]
+    model = XGBRegressor(**{k: v for k, v in params.items() if k != "eval_metric"},
+                         n_estimators=booster.num_boosted_rounds(), n_jobs=nthread)
+    model.load_model(bytearray(booster.save_raw("json")))
+    return model
@@ -0,0 +1,871 @@
+"""
+Feature Engineering
+User-level features for the ranking / skills / behavior models (used by ml_model.py)
+
+Builders are column producers: they read from and write whole columns into one
+FeatureFrame that sits on top of the users table, so the table is never copied
+per builder and every owner-level join is a single reindex on `login`. All
+owner-level repository statistics come from one cached groupby pass
+(owner_repo_stats), or, for repo tables larger than RAM, from
+owner_repo_stats_chunked, which streams the table in owner partitions.
+"""
+
+import math
+import pickle
+import tempfile
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from training_data import HAS_PYARROW, compact_dtypes
+
+if HAS_PYARROW:
+    import pyarrow.parquet as pq
+
+
+class FeatureFrame:
+    """
+    Column store for feature engineering.
+
+    Reads fall through to the (never copied) users table; writes add or
+    replace whole columns. Column order and join semantics mirror the
+    DataFrame/merge pipeline this replaces, so to_frame() is identical to it.
+    """
+
+    def __init__(self, base: pd.DataFrame):
+        self.base = base
+        self.index = base.index
+        self._order: List[str] = list(base.columns)
+        self._names = set(self._order)
+        self._cols: Dict[str, pd.Series] = {}
+
+    @property
+    def columns(self) -> List[str]:
+        return list(self._order)
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._names
+
+    def __getitem__(self, name):
+        if isinstance(name, list):
+            return pd.concat([self[c] for c in name], axis=1)
+        if name not in self._names:
+            raise KeyError(name)
+        if name in self._cols:
+            return self._cols[name]
+        return self.base[name]
+
+    def __setitem__(self, name: str, values) -> None:
+        if isinstance(values, pd.Series) and values.index is self.index:
+            series = values.rename(name)
+        elif isinstance(values, pd.Series):
+            series = values.reindex(self.index).rename(name)
+        else:
+            series = pd.Series(values, index=self.index, name=name)
+        if name not in self._names:
+            self._order.append(name)
+            self._names.add(name)
+        self._cols[name] = series
+
+    def ensure(self, names: Iterable[str], default=0) -> None:
+        """Add `default` columns for any of `names` that do not exist yet."""
+        for c in names:
+            if c not in self:
+                self[c] = default
+
+    def _rename(self, old: str, new: str) -> None:
+        series = self[old]
+        self._order[self._order.index(old)] = new
+        self._names.discard(old)
+        self._names.add(new)
+        self._cols.pop(old, None)
+        self._cols[new] = series.rename(new)
+
+    def join(self, stats: pd.DataFrame, on: str = 'login', key_name: str = None) -> None:
+        """
+        Left-join owner-level `stats` (indexed by owner) on column `on`.
+
+        Same result as DataFrame.merge(stats, left_on=on, right_index=True,
+        how='left'), or with key_name set, merge(stats.reset_index(),
+        left_on=on, right_on=key_name): clashing names get _x / _y suffixes.
+        """
+        keys = self[on].to_numpy()
+        added = []
+        if key_name is not None:
+            owner = pd.Series(stats.index, index=stats.index).reindex(keys).set_axis(self.index)
+            # The key column takes the dtype of `on`, not the categorical owner_login of the
+            # compact repo table (a categorical here breaks fillna(0) on the final features)
+            owner = owner.astype(self[on].dtype)
+            added.append((key_name, owner))
+        for col in stats.columns:
+            added.append((col, stats[col].reindex(keys).set_axis(self.index)))
+
+        for col, series in added:
+            if col in self:
+                self._rename(col, f"{col}_x")
+                col = f"{col}_y"
+            self[col] = series
+
+    def fillna_all(self, value) -> None:
+        """DataFrame.fillna(value) over every column, copying only columns with gaps."""
+        for c in self._order:
+            series = self[c]
+            if series.isna().any():
+                self._cols[c] = series.fillna(value)
+
+    def to_frame(self) -> pd.DataFrame:
+        """Assemble the single output frame (the only full-width copy)."""
+        frame = pd.concat([self[c] for c in self._order], axis=1)
+        frame.columns = self._order
+        return frame
+
+
+# ---------- owner-level repository statistics ----------
+# {output column: (repo column, aggregation)}, all computed in one groupby('owner_login') pass
+OWNER_REPO_AGGREGATIONS = {
+    'total_forked_repos_owned': ('is_fork', 'sum'),
+    'total_stars_received': ('stargazer_count', 'sum'),
+    'total_forks_received': ('fork_count', 'sum'),
+    'total_watchers': ('watchers_count', 'sum'),
+    'total_languages_size': ('languages_total_size', 'sum'),
+    'total_languages_count': ('languages_total_count', 'sum'),
+    'avg_stars_per_repo': ('stargazer_count', 'mean'),
+    'max_stars_repo': ('stargazer_count', 'max'),
+    'stars_std_dev': ('stargazer_count', 'std'),
+    'avg_forks_per_repo': ('fork_count', 'mean'),
+    'max_forks_repo': ('fork_count', 'max'),
+    'avg_watchers_per_repo': ('watchers_count', 'mean'),
+    'avg_languages_per_repo': ('languages_total_count', 'mean'),
+    'avg_repo_size': ('languages_total_size', 'mean'),
+    'public_repo_ratio': ('is_public', 'mean'),
+}
+# Averages that only exist when the repo column has at least one value
+_NEEDS_VALUES = {'avg_languages_per_repo', 'avg_repo_size'}
+# Repo identifier used for repo_count_all, in order of preference
+REPO_ID_COLUMNS = ['name', 'name_with_owner', 'repo_id']
+LANGUAGE_STAT_COLUMNS = ['language_specialization', 'language_balance', 'repo_language_diversity']
+
+_owner_stats_cache: Optional[Tuple[tuple, pd.DataFrame, pd.DataFrame]] = None
+
+
+def _language_stats(df_repo) -> pd.DataFrame:
+    """Specialization, Simpson balance and diversity of primary_language per owner."""
+    has_language = df_repo['primary_language'].notna()
+    # Long-form (owner, language) counts; never densified into an owner x language matrix
+    sizes = (df_repo.loc[has_language, ['owner_login', 'primary_language']]
+             .groupby(['owner_login', 'primary_language'], observed=True)
+             .size())
+    sizes = sizes[sizes > 0]
+    by_owner = sizes.groupby(level=0, observed=True)
+    # Proportions p_ij = count(lang j for user i) / total repos for user i
+    p = sizes.div(by_owner.sum(), level=0)
+    p_by_owner = p.groupby(level=0, observed=True)
+    return pd.DataFrame({
+        # Specialization: dominance of the top language = max_j p_ij  (0..1)
+        'language_specialization': p_by_owner.max(),
+        # Diversity: Simpson's index = 1 - sum_j p_ij^2  (0..1, higher = more diverse)
+        'language_balance': 1 - p.pow(2).groupby(level=0, observed=True).sum(),
+        # Repo-level language diversity = number of distinct primary_language values
+        'repo_language_diversity': by_owner.size().astype(float),
+    })
+
+
+def compute_owner_repo_stats(df_repo) -> pd.DataFrame:
+    """
+    Every owner-level repository statistic the builders use, indexed by owner_login.
+
+    One groupby over the repo table; a statistic is present only when its
+    source columns exist, so callers check `column in stats`.
+    """
+    columns = set(df_repo.columns)
+    aggregations = {}
+    for out, (src, how) in OWNER_REPO_AGGREGATIONS.items():
+        source = 'is_private' if src == 'is_public' else src
+        if source not in columns:
+            continue
+        if out in _NEEDS_VALUES and not df_repo[source].notna().any():
+            continue
+        aggregations[out] = pd.NamedAgg(src, how)
+    repo_id_col = next((c for c in REPO_ID_COLUMNS if c in columns), None)
+    if repo_id_col is not None:
+        aggregations['repo_count_all'] = pd.NamedAgg(repo_id_col, 'nunique')
+
+    sources = sorted({agg.column for agg in aggregations.values()} - {'is_public'})
+    frame = df_repo[['owner_login'] + sources]
+    if 'is_private' in columns:
+        frame = frame.assign(is_public=df_repo['is_private'].eq(False).astype(float))
+    if aggregations:
+        stats = frame.groupby('owner_login', observed=True).agg(**aggregations)
+    else:
+        stats = pd.DataFrame(index=pd.Index(frame['owner_login'].dropna().unique(), name='owner_login'))
+
+    if 'primary_language' in columns and df_repo['primary_language'].notna().any():
+        stats = stats.join(_language_stats(df_repo), how='outer')
+    return stats
+
+
+def owner_repo_stats(df_repo, refresh: bool = False) -> pd.DataFrame:
+    """
+    Cached compute_owner_repo_stats for the repo table currently in use.
+
+    The cache holds one table and is keyed on its identity, shape and columns;
+    pass refresh=True after modifying values in place.
+    """
+    global _owner_stats_cache
+    if isinstance(df_repo, ChunkedRepoStats):
+        return df_repo.stats
+    key = (id(df_repo), df_repo.shape, tuple(df_repo.columns))
+    if not refresh and _owner_stats_cache is not None:
+        cached_key, cached_repo, stats = _owner_stats_cache
+        if cached_key == key and cached_repo is df_repo:
+            return stats
+    stats = compute_owner_repo_stats(df_repo)
+    _owner_stats_cache = (key, df_repo, stats)
+    return stats
+
+
+# ---------- out-of-core owner statistics ----------
+# Repo columns the builders aggregate; absent ones are added (keys as NaN, counts as 0)
+REPO_REQUIRED_COLUMNS = ['owner_login', 'primary_language', 'languages_total_count', 'stargazer_count',
+                         'fork_count', 'watchers_count', 'is_private', 'is_fork']
+
+
+def ensure_repo_columns(df_repo: pd.DataFrame) -> pd.DataFrame:
+    """Add missing REPO_REQUIRED_COLUMNS in place."""
+    for c in REPO_REQUIRED_COLUMNS:
+        if c not in df_repo.columns:
+            df_repo[c] = np.nan if c in ['owner_login', 'primary_language'] else 0
+    return df_repo
+
+
+class ChunkedRepoStats:
+    """
+    Stands in for df_repo once the owner statistics were computed out of core.
+
+    Builders read `stats` through owner_repo_stats(); `columns` and len()
+    describe the streamed repo table for the checks callers make on df_repo.
+    """
+
+    def __init__(self, stats: pd.DataFrame, columns: List[str], n_rows: int):
+        self.stats = stats
+        self.columns = pd.Index(columns)
+        self.n_rows = n_rows
+
+    def __len__(self) -> int:
+        return self.n_rows
+
+
+def _count_rows(source: Path) -> int:
+    if source.suffix == '.parquet':
+        return pq.ParquetFile(source).metadata.num_rows
+    with open(source, 'rb') as f:
+        # Newlines inside quoted fields overcount; this only sizes the partitions
+        return max(sum(block.count(b'\n') for block in iter(lambda: f.read(1 << 20), b'')) - 1, 0)
+
+
+def _iter_repo_chunks(source: Path, chunk_size: int, dtypes: Optional[Dict[str, str]]) -> Iterator[pd.DataFrame]:
+    if source.suffix == '.parquet':
+        batches = (b.to_pandas() for b in pq.ParquetFile(source).iter_batches(batch_size=chunk_size))
+    else:
+        batches = pd.read_csv(source, chunksize=chunk_size, low_memory=False)
+    for chunk in batches:
+        yield compact_dtypes(ensure_repo_columns(chunk), dtypes)
+
+
+def partition_repos(source, work_dir, chunk_size: int, n_partitions: Optional[int] = None,
+                    dtypes: Optional[Dict[str, str]] = None) -> Tuple[List[Path], List[str], int]:
+    """
+    Stream a repo CSV (or Parquet file) into partitions keyed by a hash of owner_login.
+
+    Every repo of an owner lands in the same partition, so per-partition
+    statistics are exact. Rows without an owner go to partition 0, where they
+    count towards "does this column have any values" as they do in memory.
+
+    Returns:
+        (partition files that received rows, repo table columns, row count)
+    """
+    source, work_dir = Path(source), Path(work_dir)
+    if n_partitions is None:
+        n_partitions = max(1, math.ceil(_count_rows(source) / chunk_size))
+    paths = [work_dir / f"repos-{i:05d}.pkl" for i in range(n_partitions)]
+    written = set()
+    columns: List[str] = []
+    n_rows = 0
+    for chunk in _iter_repo_chunks(source, chunk_size, dtypes):
+        columns = columns or list(chunk.columns)
+        n_rows += len(chunk)
+        owner = chunk['owner_login']
+        hashes = pd.util.hash_pandas_object(owner.astype(object), index=False).to_numpy()
+        part = np.where(owner.notna().to_numpy(), hashes % n_partitions, 0)
+        for i, rows in chunk.groupby(part, sort=False):
+            # Partition files are streams of pickled frames, appended to per chunk
+            with open(paths[i], 'ab') as f:
+                pickle.dump(rows, f, protocol=pickle.HIGHEST_PROTOCOL)
+            written.add(i)
+    return [paths[i] for i in sorted(written)], columns, n_rows
+
+
+def _read_partition(path: Path) -> pd.DataFrame:
+    frames = []
+    with open(path, 'rb') as f:
+        while True:
+            try:
+                frames.append(pickle.load(f))
+            except EOFError:
+                break
+    return pd.concat(frames, ignore_index=True)
+
+
+def owner_repo_stats_chunked(source, chunk_size: int, dtypes: Optional[Dict[str, str]] = None,
+                             n_partitions: Optional[int] = None, work_dir=None) -> ChunkedRepoStats:
+    """
+    compute_owner_repo_stats for a repo table that does not fit in memory.
+
+    The table is streamed `chunk_size` rows at a time into owner partitions
+    of about `chunk_size` rows each (on disk, under `work_dir` or a temporary
+    directory), then the partitions are aggregated one at a time. Memory is
+    bounded by the chunk size plus the output, one row per owner; an owner
+    with more than `chunk_size` repos still has all of them in one partition.
+
+    The statistics equal compute_owner_repo_stats on the whole table (same
+    rows per owner, same order), with owner_login as a categorical index
+    when the dtype map asks for one, as load_table() does.
+    """
+    with tempfile.TemporaryDirectory(dir=work_dir, prefix="repo_partitions_") as tmp:
+        paths, columns, n_rows = partition_repos(source, tmp, chunk_size, n_partitions, dtypes)
+        parts = [compute_owner_repo_stats(_read_partition(path)) for path in paths]
+
+    order = list(OWNER_REPO_AGGREGATIONS) + ['repo_count_all'] + LANGUAGE_STAT_COLUMNS
+    if parts:
+        stats = pd.concat(parts).sort_index()
+    else:
+        stats = pd.DataFrame(index=pd.Index([], name='owner_login'))
+    # A partition without any value of a column leaves its owners NaN, as the whole-table groupby does
+    stats = stats[[c for c in order if c in stats.columns]]
+    if (dtypes or {}).get('owner_login') == 'category':
+        stats.index = stats.index.astype('category')
+    stats.index.name = 'owner_login'
+    return ChunkedRepoStats(stats, columns, n_rows)
+
+
+# ---------- helpers ----------
+def _minmax01(s):
+    s = pd.to_numeric(s, errors='coerce').fillna(0.0)
+    lo, hi = s.min(), s.max()
+    return (s - lo) / (hi - lo) if hi > lo else s*0 + 0.5
+
+
+def _robust01(s, q=0.90):
+    """Scale to [0,1] with cap at q-quantile to reduce outlier dominance."""
+    s = pd.to_numeric(s, errors='coerce').fillna(0.0)
+    hi = s.quantile(q)
+    if hi <= 0:
+        return s*0.0
+    s = s.clip(lower=0, upper=hi)
+    return s / (hi + 1e-9)
+
+
+def add_multitasking_variants(users_features: FeatureFrame, df_repo):
+
+    EPS = 1e-9
+    # figure out join key
+    key = 'login' if 'login' in users_features else (
+        'username' if 'username' in users_features else None
+    )
+    if key is None:
+        raise ValueError("❌ ERROR: No valid owner column found in repository data! Cannot compute multitasking metrics.")
+
+    # total repos per owner (portfolio size), counted on name / name_with_owner / repo_id
+    stats = owner_repo_stats(df_repo)
+    if 'repo_count_all' not in stats:
+        raise ValueError("❌ ERROR: No valid repository identifier column (name/name_with_owner/repo_id) found! Cannot compute multitasking metrics.")
+
+    users_features.join(stats[['repo_count_all']], on=key)
+    users_features['repo_count_all'] = users_features['repo_count_all'].fillna(0)
+
+    # 1) coverage of active set
+    users_features['recent_active_repo_coverage'] = (
+        users_features['unique_repos_committed'] / (users_features['active_repos'] + 1)
+    )
+
+    # 2) breadth-only (normalized 0..1)
+    users_features['multitasking_breadth'] = _minmax01(users_features['unique_repos_committed'])
+
+    # 3) share of total portfolio touched
+    users_features['multitasking_share_of_portfolio'] = (
+        users_features['unique_repos_committed'] / (users_features['repo_count_all'] + 1)
+    )
+
+    # 4) blended index (0..1)
+    users_features['multitasking_index'] = (
+        0.5*users_features['multitasking_breadth'] + 0.5*users_features['recent_active_repo_coverage']
+    )
+
+
+# ---------- feature builders ----------
+def create_developer_activity_features(users_features: FeatureFrame, df_repo):
+    print("Creating Developer Activity Features...")
+
+    must = ['total_commit_contributions','total_pr_contributions','total_issue_contributions',
+            'total_pr_review_contributions','total_repositories','account_age_days',
+            'contributions_this_year','avg_files_per_commit','avg_additions_per_commit',
+            'avg_deletions_per_commit','total_recent_additions','total_recent_deletions',
+            'unique_repos_committed','active_repos','total_contributions']
+    users_features.ensure(must, 0)
+
+    # 1) Activity intensity
+    activity_cols = ['total_commit_contributions','total_pr_contributions',
+                     'total_issue_contributions','total_pr_review_contributions']
+    activity = users_features[activity_cols]
+    users_features['activity_intensity_score'] = activity.sum(axis=1)
+
+    # 2) Consistency (inverse of CV)
+    variation = activity.std(axis=1) / (activity.mean(axis=1) + 1)
+    users_features['contribution_consistency'] = 1 / (1 + variation)
+
+    # 3) Repo creation rate
+    users_features['repo_creation_rate'] = users_features['total_repositories'] / (users_features['account_age_days'] / 365 + 1)
+    #3a) Commit frequency (commits per account-year)
+    users_features['commit_freq_per_year'] = (
+    users_features['total_commit_contributions'] /
+    (users_features['account_age_days'] / 365.0 + 1.0))
+
+    # 4) Recent activity ratio
+    users_features['recent_activity_ratio'] = users_features['contributions_this_year'] / (users_features['total_contributions'] + 1)
+
+    # 5) Change rate (single, robust signal)
+    users_features['code_change_rate'] = (
+        users_features['avg_additions_per_commit'] + users_features['avg_deletions_per_commit']
+    ) / 2.0
+
+    # 6) Development velocity
+    users_features['development_velocity'] = (
+        users_features['total_recent_additions'] + users_features['total_recent_deletions']
+    ) / (users_features['unique_repos_committed'] + 1)
+
+    # 7) Multitasking (blended)
+    add_multitasking_variants(users_features, df_repo)
+    users_features['multitasking_score'] = users_features['multitasking_index']
+
+
+
+def create_technical_skills_features(users_features: FeatureFrame, df_repo):
+    """
+    Technical skills from the data you actually have:
+      - specialization & diversity from distribution of primary_language across a user's repos
+      - breadth from df_users['total_languages'] (already computed in your users table)
+      - repo_language_diversity = #distinct primary_language across repos
+      - avg_languages_per_repo from repo languages_total_count
+      - avg_repo_size (optional extra) from repo languages_total_size
+    """
+    print("Creating Technical Skills Features (repo-driven)...")
+
+    # Ensure the breadth column exists even if missing in df_users
+    users_features.ensure(['total_languages'], 0)
+    users_features['tech_stack_breadth'] = users_features['total_languages']
+
+    stats = owner_repo_stats(df_repo)
+
+    # ---------- Language distribution per user (specialization, balance, diversity) ----------
+    if 'language_specialization' in stats:
+        users_features.join(stats[LANGUAGE_STAT_COLUMNS])
+    else:
+        # If we can't compute language distribution, create zeros.
+        users_features['language_specialization'] = 0.0
+        users_features['language_balance'] = 0.0
+        users_features['repo_language_diversity'] = 0.0
+
+    # Fill NA from the join above
+    for c in ['language_specialization', 'language_balance', 'repo_language_diversity']:
+        if c not in users_features:
+            users_features[c] = 0.0
+        else:
+            users_features[c] = users_features[c].fillna(0.0)
+
+    # ---------- Avg #languages per repo (from languages_total_count) ----------
+    if 'avg_languages_per_repo' in stats:
+        users_features.join(stats[['avg_languages_per_repo']])
+    if 'avg_languages_per_repo' not in users_features:
+        users_features['avg_languages_per_repo'] = 0.0
+    else:
+        users_features['avg_languages_per_repo'] = users_features['avg_languages_per_repo'].fillna(0.0)
+
+    # ---------- Optional: average repo "size" (if you want a coarse experience proxy) ----------
+    if 'avg_repo_size' in stats:
+        users_features.join(stats[['avg_repo_size']])
+        users_features['avg_repo_size'] = users_features['avg_repo_size'].fillna(0.0)
+    else:
+        users_features['avg_repo_size'] = 0.0
+
+
+
+def create_collaboration_features(users_features: FeatureFrame, df_repo):
+    print("Creating Collaboration Features...")
+
+    users_features.ensure(['total_issue_comments','total_pr_review_contributions','total_discussion_comments','total_commit_comments',
+                           'total_pr_contributions','total_issue_contributions','total_commit_contributions',
+                           'forked_repositories_count','following_count','followers_count','organizations_count',
+                           'account_age_days','total_gist_comments','total_repositories'], 0)
+
+    # 1) Community engagement
+    engagement_cols = ['total_issue_comments','total_pr_review_contributions','total_discussion_comments','total_commit_comments']
+    users_features['community_engagement_score'] = users_features[engagement_cols].sum(axis=1)
+
+    # 2) Collaboration ratio
+    users_features['collaboration_ratio'] = (users_features['total_pr_contributions'] + users_features['total_issue_contributions']) / (users_features['total_commit_contributions'] + 1)
+
+    # 3) Fork contribution rate
+    users_features['fork_contribution_rate'] = users_features['forked_repositories_count'] / (users_features['total_repositories'] + 1)
+
+    # 4) Mentorship
+    users_features['mentorship_score'] = (
+        users_features['total_pr_review_contributions'] + users_features['total_gist_comments'] * 0.5
+    ) / (users_features['account_age_days'] / 365 + 1)
+
+    # 5) Stars/forks/watchers per owner
+    stats = owner_repo_stats(df_repo)
+    users_features.join(stats[['total_forked_repos_owned', 'total_stars_received',
+                               'total_forks_received', 'total_watchers']])
+    # Every column built so far (user columns included) is zero-filled here, as before
+    users_features.fillna_all(0)
+
+    # 6) Network influence
+    users_features['network_influence'] = np.log1p(
+        users_features['followers_count'] * 2 + users_features['total_stars_received'] * 0.5 + users_features['total_forks_received'] * 1.5
+    )
+
+    # ---------- NEW: Social coding index (normalized engagement per account-year) ----------
+    acct_years = (users_features['account_age_days'] / 365.0).replace([np.inf,-np.inf], 0).fillna(0)
+    social_raw = (
+        users_features['total_issue_comments']
+      + users_features['total_pr_review_contributions']
+      + users_features['total_discussion_comments']
+      + users_features['total_commit_comments']
+      + 0.5*(users_features['total_pr_contributions'] + users_features['total_issue_contributions'])
+    ) / (acct_years + 1.0)
+
+    users_features['social_coding_index'] = _robust01(np.log1p(social_raw))
+
+
+
+def create_project_quality_features(users_features: FeatureFrame, df_repo):
+    print("Creating Project Quality Features (patched)...")
+
+    # Ensure user-level cols exist
+    users_features.ensure(['active_repos','total_repositories','pinned_items_count','avg_days_since_last_push','total_languages'], 0)
+
+    users_features['repo_active_score']   = users_features['active_repos'] / (users_features['total_repositories'] + 1)
+    users_features['showcase_score'] = users_features['pinned_items_count'] / 6.0
+    users_features['maintenance_rate']    = users_features['avg_days_since_last_push']
+    users_features['maintenance_score']   = 1.0 / (1.0 + users_features['maintenance_rate'] / 30.0)
+
+    # Repo aggregates that exist for this table (avg_languages_per_repo needs
+    # languages_total_count values; it is often missing for users with no public repos)
+    quality_cols = ['avg_stars_per_repo','max_stars_repo','stars_std_dev',
+                    'avg_forks_per_repo','max_forks_repo',
+                    'avg_watchers_per_repo','avg_languages_per_repo','public_repo_ratio']
+    stats = owner_repo_stats(df_repo)
+    available = [c for c in quality_cols if c in stats]
+    if available:
+        repo_quality_stats = stats[available]
+    else:
+        repo_quality_stats = pd.DataFrame(columns=quality_cols, index=pd.Index([], name='owner_login'))
+
+    # Keeps the owner_login column and the avg_languages_per_repo_x/_y pair the merge used to produce
+    users_features.join(repo_quality_stats, key_name='owner_login')
+
+    # Ensure all expected cols exist & are filled
+    needed = ['avg_stars_per_repo','max_stars_repo','stars_std_dev',
+              'avg_forks_per_repo','max_forks_repo',
+              'avg_watchers_per_repo','avg_languages_per_repo','public_repo_ratio']
+    users_features.ensure(needed, 0.0)
+    for c in needed:
+        users_features[c] = users_features[c].fillna(0.0)
+
+    users_features['code_change_rate'] = (
+        users_features['avg_additions_per_commit'] + users_features['avg_deletions_per_commit']) / 2.0
+
+    lang_richness = _robust01(users_features['avg_languages_per_repo'])       # multi-language repos
+    files_touched = _robust01(users_features['avg_files_per_commit'])         # breadth per commit
+    churn_level  = _robust01(users_features['code_change_rate'])              # code change size
+    active_ratio = users_features['repo_active_score'].clip(0, 1)             # portfolio activeness
+
+    users_features['project_complexity'] = (
+        0.30 * lang_richness +
+        0.25 * files_touched +
+        0.25 * churn_level  +
+        0.20 * active_ratio
+    ).astype(float)  # stays in [0,1]
+
+    # ---- Code review metrics ----
+    users_features['code_review_participation'] = (
+        users_features['total_pr_review_contributions'] /
+        (users_features['total_pr_contributions'] + 1.0)
+    )
+
+    acct_years = (users_features['account_age_days'] / 365.0).replace([np.inf, -np.inf], 0).fillna(0)
+    review_intensity = users_features['total_pr_review_contributions'] / (acct_years + 1.0)  # reviews per year
+    review_intensity_n = _robust01(review_intensity)
+    review_ratio = users_features['code_review_participation'].fillna(0).clip(0, 1)
+
+    users_features['code_review_index'] = (0.5 * review_intensity_n + 0.5 * review_ratio).astype(float)
+
+
+def create_developer_influence_features(users_features: FeatureFrame):
+    """
+    Influence & leadership features with robust, defensible scaling.
+
+    Adds:
+      - reputation_score (unchanged from your idea)
+      - impact_factor, influence_growth_rate, viral_repo_score (unchanged)
+      - leadership_score in [0,1], plus component columns:
+          lead_org, lead_mentorship, lead_review, lead_support
+    """
+    print("Creating Developer Influence Features (robust)...")
+
+    # Ensure required columns exist
+    users_features.ensure([
+        'total_stars_received','total_forks_received','sponsoring_count','sponsors_count',
+        'followers_count','organizations_count','mentorship_score','avg_stars_per_repo',
+        'max_stars_repo','total_repositories','account_age_days','total_pr_review_contributions'
+    ], 0.0)
+
+    # ---- Reputation & impact (as you had) ----
+    users_features['reputation_score'] = (
+        np.log1p(users_features['followers_count'])        * 0.3 +
+        np.log1p(users_features['total_stars_received'])   * 0.3 +
+        np.log1p(users_features['total_forks_received'])   * 0.2 +
+        np.log1p(users_features['sponsoring_count'])       * 0.1 +
+        np.log1p(users_features['sponsors_count'])         * 0.1
+    )
+
+    users_features['impact_factor'] = (
+        users_features['total_stars_received'] + 2.0 * users_features['total_forks_received']
+    ) / (users_features['total_repositories'] + 1.0)
+
+    users_features['influence_growth_rate'] = (
+        users_features['followers_count'] / (users_features['account_age_days'] / 365.0 + 1.0)
+    )
+
+    users_features['viral_repo_score'] = (
+        users_features['max_stars_repo'] / (users_features['avg_stars_per_repo'] + 1.0)
+    )
+
+    # ---- Leadership score (robust, defensible) ----
+    # Years on platform
+    acct_years = (users_features['account_age_days'] / 365.0).replace([np.inf, -np.inf], 0).fillna(0)
+
+    # Components:
+    # 1) Organizational leadership: membership/roles in orgs (cap at 3 orgs for interpretability)
+    lead_org = (users_features['organizations_count'].clip(0, 3) / 3.0).astype(float)
+
+    # 2) Mentorship leadership: use the mentorship_score directly
+    #    NO FALLBACK - must have real data
+    if 'mentorship_score' not in users_features:
+        raise ValueError("❌ ERROR: mentorship_score not found in dataset! Cannot compute leadership_score.")
+    mentorship_raw = users_features['mentorship_score']
+    lead_mentorship = _robust01(mentorship_raw)
+
+    # 3) Review leadership: PR review intensity per year (distinct from mentorship if that includes gist comments, etc.)
+    review_intensity = users_features['total_pr_review_contributions'] / (acct_years + 1.0)
+    lead_review = _robust01(review_intensity)
+
+    # 4) Community support: sponsors + sponsoring (log dampened to avoid runaway)
+    support_raw = np.log1p(users_features['sponsoring_count'] + users_features['sponsors_count'])
+    lead_support = _robust01(support_raw)
+
+    # Save components for transparency (optional but handy for EDA)
+    users_features['lead_org']        = lead_org
+    users_features['lead_mentorship'] = lead_mentorship
+    users_features['lead_review']     = lead_review
+    users_features['lead_support']    = lead_support
+
+    # Weighted blend (sums to 1.0). Rationale:
+    # - Org & Mentorship (0.35 each): primary signals of leading people/projects.
+    # - Reviews (0.20): leadership in quality/process.
+    # - Support (0.10): external recognition; useful but not core to leadership.
+    users_features['leadership_score'] = (
+        0.35 * lead_org +
+        0.35 * lead_mentorship +
+        0.20 * lead_review +
+        0.10 * lead_support
+    ).astype(float)
+
+    # ---- Simple profile completeness (keep) ----
+    avail = [c for c in ['email','location','avatar_url','profile_url'] if c in users_features]
+    if avail:
+        users_features['profile_completeness'] = sum(
+            (~users_features[c].isna()).astype(int) for c in avail
+        ) / float(len(avail))
+    else:
+        users_features['profile_completeness'] = 0.0
+
+
+
+def create_behavioral_patterns(users_features: FeatureFrame):
+    """
+    Behavioral pattern features (robust & normalized).
+
+    Outputs (all in [0,1], unless noted):
+      - maintainer_score        : share of started vs (started + forked)
+      - team_player_score       : blend of orgs, collaboration intensity, fork rate
+      - generalist_score        : normalized total_languages
+      - work_consistency        : 1 / (1 + stars_std_dev / (avg_stars_per_repo + eps))
+      - learning_velocity       : generalist_score * recent_activity_ratio (clipped)
+      - innovation_index        : sqrt(normalized started repos * normalized avg stars)
+
+    Notes:
+      * Uses robust 0..1 scaling capped at cohort 90th percentile to reduce outlier dominance.
+      * Includes fallbacks if collaboration_ratio / fork_contribution_rate / recent_activity_ratio
+        weren't computed earlier in the pipeline.
+    """
+    print("Creating Behavioral Pattern Features (normalized & robust)...")
+
+    # ---------- ensure required columns exist (init with 0.0) ----------
+    users_features.ensure([
+        'total_started_repos','total_forked_repos','organizations_count',
+        'total_languages','stars_std_dev','avg_stars_per_repo'
+    ], 0.0)
+
+    # Check that required columns exist - NO FALLBACKS
+    required_cols = [
+        'total_pr_contributions','total_issue_contributions','total_commit_contributions',
+        'forked_repositories_count','total_repositories',
+        'total_contributions','contributions_this_year'
+    ]
+    missing_cols = [c for c in required_cols if c not in users_features]
+    if missing_cols:
+        raise ValueError(f"❌ ERROR: Required columns missing from dataset: {missing_cols}. Cannot compute composite features without real data.")
+
+    eps = 1e-9
+
+    # ---------- Compute ratios if not present (but only using real data) ----------
+    # collaboration_ratio = (PRs + Issues) / (Commits + 1)
+    if 'collaboration_ratio' not in users_features:
+        # This is OK - we're computing from real data, not using a fallback
+        users_features['collaboration_ratio'] = (
+            (users_features['total_pr_contributions'] + users_features['total_issue_contributions']) /
+            (users_features['total_commit_contributions'] + 1.0)
+        )
+
+    # fork_contribution_rate = forked_repositories_count / (total_repositories + 1)
+    if 'fork_contribution_rate' not in users_features:
+        users_features['fork_contribution_rate'] = (
+            users_features['forked_repositories_count'] / (users_features['total_repositories'] + 1.0)
+        )
+
+    # recent_activity_ratio = contributions_this_year / (total_contributions + 1)
+    if 'recent_activity_ratio' not in users_features:
+        users_features['recent_activity_ratio'] = (
+            users_features['contributions_this_year'] / (users_features['total_contributions'] + 1.0)
+        )
+
+    # ---------- 1) Maintainer vs Contributor ----------
+    denom = users_features['total_started_repos'] + users_features['total_forked_repos']
+    users_features['maintainer_score'] = (
+        users_features['total_started_repos'] / (denom + 1.0)
+    ).astype(float)  # [0,1]
+
+    # ---------- 2) Team player score (normalized blend) ----------
+    # orgs: cap at 3 orgs => [0,1]
+    org_norm    = (users_features['organizations_count'].clip(0, 3) / 3.0).astype(float)
+    # collab_ratio: robust 0..1
+    collab_norm = _robust01(users_features['collaboration_ratio'])
+    # fork contribution rate: already a ratio
+    fork_rate   = users_features['fork_contribution_rate'].fillna(0.0).clip(0, 1)
+
+    users_features['team_player_score'] = (
+        0.35 * org_norm + 0.45 * collab_norm + 0.20 * fork_rate
+    ).astype(float)  # [0,1]
+
+    # ---------- 3) Specialist vs Generalist ----------
+    users_features['generalist_score'] = _robust01(users_features['total_languages'])  # [0,1]
+
+    # ---------- 4) Work consistency (bounded, higher = steadier stars) ----------
+    var_ratio = users_features['stars_std_dev'] / (users_features['avg_stars_per_repo'] + eps)
+    var_ratio = var_ratio.replace([np.inf, -np.inf], np.nan).fillna(0.0).clip(lower=0)
+    users_features['work_consistency'] = (1.0 / (1.0 + var_ratio)).astype(float)  # [0,1]
+
+    # ---------- 5) Learning velocity (breadth x recentness) ----------
+    recent = users_features['recent_activity_ratio'].fillna(0.0).clip(0, 1)
+    users_features['learning_velocity'] = (
+        users_features['generalist_score'] * recent
+    ).astype(float)  # [0,1]
+
+    # ---------- 6) Innovation index (originality x reception) ----------
+    started_n  = _robust01(users_features['total_started_repos'])
+    avgstars_n = _robust01(users_features['avg_stars_per_repo'])
+    users_features['innovation_index'] = np.sqrt(started_n * avgstars_n).astype(float)  # [0,1]
+
+
+
+def create_final_feature_set(df_users, df_repo):
+    """
+    Every engineered feature for the users table.
+
+    `df_repo` is the repo table, or the ChunkedRepoStats from
+    owner_repo_stats_chunked when the table does not fit in memory; both give
+    the same features.
+    """
+    print("\n" + "="*80)
+    print("Starting Feature Engineering Process...")
+    print("="*80 + "\n")
+
+    # One column store over df_users; the builders never copy the users table
+    features = FeatureFrame(df_users)
+
+    # Make sure we have a 'login' key to join on
+    if 'login' not in features and 'username' in features:
+        features['login'] = features['username']
+    n_original = len(features.columns)
+
+    # Build features in sequence (each step adds columns)
+    create_developer_activity_features(features, df_repo)
+    create_technical_skills_features(features, df_repo)
+    create_collaboration_features(features, df_repo)
+    create_project_quality_features(features, df_repo)
+    create_developer_influence_features(features)
+    create_behavioral_patterns(features)
+
+    # ---- No portfolio_score / No developer_category ----
+    # (If you had any downstream code using these, remove or guard it.)
+
+    final_features = features.to_frame()
+    print("\nFeature engineering complete!")
+    print(f"Total features created: {final_features.shape[1] - n_original}")
+    print(f"Final dataset shape: {final_features.shape}")
+    return final_features
+
+
+def get_feature_groups():
+    return {
+        'activity_features': [
+            'activity_intensity_score','contribution_consistency','repo_creation_rate',
+            'recent_activity_ratio','code_change_rate','development_velocity','multitasking_score','commit_freq_per_year'
+        ],
+        'technical_features': [
+            'language_specialization','tech_stack_breadth','repo_language_diversity',
+            'avg_languages_per_repo','project_complexity'
+        ],
+        'collaboration_features': [
+            'community_engagement_score','collaboration_ratio','fork_contribution_rate',
+            'social_coding_index','mentorship_score','network_influence'
+        ],
+        'quality_features': [
+            'repo_active_score','showcase_score','maintenance_score',
+            'avg_stars_per_repo','public_repo_ratio','code_review_participation'
+        ],
+        'influence_features': [
+            'reputation_score','impact_factor','influence_growth_rate',
+            'viral_repo_score','leadership_score'
+        ],
+        'behavioral_features': [
+            'maintainer_score','team_player_score','generalist_score',
+            'work_consistency','learning_velocity','innovation_index'
+        ]
+    }
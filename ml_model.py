@@ -1,4 +1,9 @@
 
+# Stage-annotated script: runs top to bottom as-is, or as a cached stage graph with
+# `python training_dag.py` ("# %% setup" regions run before every stage, each
+# "# %% stage:" line declares the stage's inputs, outputs and source files)
+# %% setup
+
 # Fix Windows console encoding for emojis
 import sys
 import io
@@ -6,7 +11,7 @@ if sys.platform == 'win32':
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
     sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
 
-import os, glob, warnings, pickle
+import os, glob, shutil, warnings, pickle
 import numpy as np
 import pandas as pd
 
@@ -25,6 +30,20 @@ warnings.filterwarnings("ignore")
 # All outputs will be saved in these directories
 SAVE_DIR = "training_outputs"
 MODEL_DIR = "organized_structure/models"
+# Cores each model may use (-1 = all). training_dag.py sets this per stage so the ranking,
+# skills and behavior families training side by side share the machine instead of oversubscribing it
+N_JOBS = int(os.environ.get("TRAINING_N_JOBS", "-1"))
+# Ranking XGBoost search: configurations sampled and the boosting-round budget of the
+# final successive-halving rung (1 candidate = only the baseline parameters, rounds still early-stopped)
+RANK_SEARCH_CANDIDATES = int(os.environ.get("RANK_SEARCH_CANDIDATES", "27"))
+RANK_SEARCH_MAX_ROUNDS = int(os.environ.get("RANK_SEARCH_MAX_ROUNDS", "1000"))
+# XGBoost external-memory mode: the ranking and skills XGBoost models stream their training rows
+# from Parquet/CSV shards of XGB_SHARD_ROWS rows (preprocessed batch by batch, quantized pages
+# cached under SHARD_DIR) instead of one in-memory matrix; the search then tunes on a sample
+XGB_EXTERNAL_MEMORY = os.environ.get("XGB_EXTERNAL_MEMORY", "0") == "1"
+XGB_SHARD_ROWS = int(os.environ.get("XGB_SHARD_ROWS", "100000"))
+RANK_SEARCH_SAMPLE_ROWS = int(os.environ.get("RANK_SEARCH_SAMPLE_ROWS", "200000"))
+SHARD_DIR = f"{SAVE_DIR}/shards"
 os.makedirs(SAVE_DIR, exist_ok=True)
 os.makedirs(MODEL_DIR, exist_ok=True)
 
@@ -51,12 +70,28 @@ print("📂 Loading data from local CSV files...")
 print(f"   Users: {users_csv}")
 print(f"   Repos: {repos_csv}\n")
 
+# Read through training_data.py: the first run converts each CSV to Parquet with compact
+# dtypes (categorical owner_login/primary_language, int32 counts, float32), later runs
+# read the cache. Without pyarrow the CSVs are read directly with the same dtypes.
+from training_data import load_table, read_table, write_table, USER_DTYPES, REPO_DTYPES
+from feature_engineering import ChunkedRepoStats, ensure_repo_columns, owner_repo_stats_chunked
+
+# Out-of-core mode for repo tables larger than RAM: a row count streams the repos CSV in
+# owner partitions of about that size (df_repo then only carries the owner statistics)
+FEATURE_CHUNK_SIZE = int(os.environ.get("FEATURE_CHUNK_SIZE", "0"))
+
+# %% stage: features | outputs: owner_stats, shortlist_path, output_path | files: users_csv, repos_csv | code: training_data.py, feature_engineering.py | writes: {save_dir}/*_{timestamp}.*
+
 if 'df_users' not in globals() or 'df_repo' not in globals():
     print("Loading:")
     print(" -", users_csv)
     print(" -", repos_csv)
-    df_users = pd.read_csv(users_csv, low_memory=False)
-    df_repo  = pd.read_csv(repos_csv, low_memory=False)
+    df_users = load_table(users_csv, USER_DTYPES)
+    if FEATURE_CHUNK_SIZE > 0:
+        print(f"   Streaming repos in chunks of {FEATURE_CHUNK_SIZE:,} rows")
+        df_repo = owner_repo_stats_chunked(repos_csv, FEATURE_CHUNK_SIZE, dtypes=REPO_DTYPES)
+    else:
+        df_repo = load_table(repos_csv, REPO_DTYPES)
 else:
     print("Using df_users and df_repo already in memory.")
 
@@ -75,670 +110,22 @@ for c in expected_user_numeric:
     if c not in df_users.columns:
         df_users[c] = 0
 
-# Repo safety: required aggregator columns
-for c in ['owner_login','primary_language','languages_total_count','stargazer_count','fork_count','watchers_count','is_private','is_fork']:
-    if c not in df_repo.columns:
-        df_repo[c] = np.nan if c in ['owner_login','primary_language'] else 0
+# Repo safety: required aggregator columns (the chunked reader adds them per chunk)
+if not isinstance(df_repo, ChunkedRepoStats):
+    ensure_repo_columns(df_repo)
 
 """Feature Engineering"""
 
 # ====== Feature Engineering (robust, Colab-ready) ======
-import os
-import numpy as np
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
-
-sns.set_theme(style="whitegrid")
-
-# ---------- helpers ----------
-def _minmax01(s):
-    s = pd.to_numeric(s, errors='coerce').fillna(0.0)
-    lo, hi = s.min(), s.max()
-    return (s - lo) / (hi - lo) if hi > lo else s*0 + 0.5
-
-def add_multitasking_variants(users_features, df_repo):
-
-    EPS = 1e-9
-    # figure out join key
-    key = 'login' if 'login' in users_features.columns else (
-        'username' if 'username' in users_features.columns else None
-    )
-    if key is None:
-        raise ValueError("❌ ERROR: No valid owner column found in repository data! Cannot compute multitasking metrics.")
-
-    # pick a repo identifier that actually exists
-    if 'name' in df_repo.columns:
-        repo_id_col = 'name'
-    elif 'name_with_owner' in df_repo.columns:
-        repo_id_col = 'name_with_owner'
-    elif 'repo_id' in df_repo.columns:
-        repo_id_col = 'repo_id'
-    else:
-        raise ValueError("❌ ERROR: No valid repository identifier column (name/name_with_owner/repo_id) found! Cannot compute multitasking metrics.")
-
-    # total repos per owner (portfolio size)
-    repo_counts = (df_repo.groupby('owner_login')[repo_id_col]
-                   .nunique()
-                   .rename('repo_count_all')
-                   .to_frame())
-
-    users_features = users_features.merge(
-        repo_counts, left_on=key, right_index=True, how='left'
-    )
-    if 'repo_count_all' not in users_features.columns:
-        users_features['repo_count_all'] = 0
-    users_features['repo_count_all'] = users_features['repo_count_all'].fillna(0)
-
-    # 1) coverage of active set
-    users_features['recent_active_repo_coverage'] = (
-        users_features['unique_repos_committed'] / (users_features['active_repos'] + 1)
-    )
-
-    # 2) breadth-only (normalized 0..1)
-    users_features['multitasking_breadth'] = _minmax01(users_features['unique_repos_committed'])
-
-    # 3) share of total portfolio touched
-    users_features['multitasking_share_of_portfolio'] = (
-        users_features['unique_repos_committed'] / (users_features['repo_count_all'] + 1)
-    )
-
-    # 4) blended index (0..1)
-    users_features['multitasking_index'] = (
-        0.5*users_features['multitasking_breadth'] + 0.5*users_features['recent_active_repo_coverage']
-    )
-    return users_features
-
-# ---------- feature builders ----------
-def create_developer_activity_features(df_users, df_repo):
-    print("Creating Developer Activity Features...")
-    users_features = df_users.copy()
-
-    must = ['total_commit_contributions','total_pr_contributions','total_issue_contributions',
-            'total_pr_review_contributions','total_repositories','account_age_days',
-            'contributions_this_year','avg_files_per_commit','avg_additions_per_commit',
-            'avg_deletions_per_commit','total_recent_additions','total_recent_deletions',
-            'unique_repos_committed','active_repos','total_contributions']
-    for c in must:
-        if c not in users_features.columns: users_features[c] = 0
-
-    # 1) Activity intensity
-    activity_cols = ['total_commit_contributions','total_pr_contributions',
-                     'total_issue_contributions','total_pr_review_contributions']
-    users_features['activity_intensity_score'] = users_features[activity_cols].sum(axis=1)
-
-    # 2) Consistency (inverse of CV)
-    users_features['contribution_consistency'] = (
-        users_features[activity_cols].std(axis=1) /
-        (users_features[activity_cols].mean(axis=1) + 1)
-    )
-    users_features['contribution_consistency'] = 1 / (1 + users_features['contribution_consistency'])
-
-    # 3) Repo creation rate
-    users_features['repo_creation_rate'] = users_features['total_repositories'] / (users_features['account_age_days'] / 365 + 1)
-    #3a) Commit frequency (commits per account-year)
-    users_features['commit_freq_per_year'] = (
-    users_features['total_commit_contributions'] /
-    (users_features['account_age_days'] / 365.0 + 1.0))
-
-    # 4) Recent activity ratio
-    users_features['recent_activity_ratio'] = users_features['contributions_this_year'] / (users_features['total_contributions'] + 1)
-
-    # 5) Change rate (single, robust signal)
-    users_features['code_change_rate'] = (
-        users_features['avg_additions_per_commit'] + users_features['avg_deletions_per_commit']
-    ) / 2.0
-
-    # 6) Development velocity
-    users_features['development_velocity'] = (
-        users_features['total_recent_additions'] + users_features['total_recent_deletions']
-    ) / (users_features['unique_repos_committed'] + 1)
-
-    # 7) Multitasking (blended)
-    users_features = add_multitasking_variants(users_features, df_repo)
-    users_features['multitasking_score'] = users_features['multitasking_index']
-    return users_features
-
-
-
-def create_technical_skills_features(df_users, df_repo):
-    """
-    Technical skills from the data you actually have:
-      - specialization & diversity from distribution of primary_language across a user's repos
-      - breadth from df_users['total_languages'] (already computed in your users table)
-      - repo_language_diversity = #distinct primary_language across repos
-      - avg_languages_per_repo from repo languages_total_count
-      - avg_repo_size (optional extra) from repo languages_total_size
-    """
-    print("Creating Technical Skills Features (repo-driven)...")
-    users_features = df_users.copy()
-
-    # Ensure the breadth column exists even if missing in df_users
-    if 'total_languages' not in users_features.columns:
-        users_features['total_languages'] = 0
-    users_features['tech_stack_breadth'] = users_features['total_languages']
-
-    # ---------- Build language distribution per user from repos ----------
-    # We will compute per-user counts of primary_language, then turn them into proportions.
-    has_primary = {'owner_login', 'primary_language'}.issubset(df_repo.columns)
-    if has_primary and df_repo['primary_language'].notna().any():
-        # Count repos per (user, primary_language)
-        lang_counts = (
-            df_repo.dropna(subset=['primary_language'])
-                  .groupby(['owner_login', 'primary_language'])
-                  .size()
-                  .unstack(fill_value=0)
-        )
-
-        # Totals per user (only repos that have a primary_language)
-        totals = lang_counts.sum(axis=1)
-        # Proportions p_ij = count(lang j for user i) / total repos for user i
-        p = lang_counts.div(totals.replace(0, np.nan), axis=0)
-
-        # Specialization: dominance of the top language = max_j p_ij  (0..1)
-        spec = p.max(axis=1).fillna(0).rename('language_specialization')
-
-        # Diversity: Simpson's index = 1 - sum_j p_ij^2  (0..1, higher = more diverse)
-        simpson = (1 - (p.pow(2)).sum(axis=1)).fillna(0).rename('language_balance')
-
-        # Repo-level language diversity = number of distinct primary_language values
-        repo_lang_div = (lang_counts.gt(0).sum(axis=1)
-                         .astype(float)
-                         .rename('repo_language_diversity'))
-
-        # Merge these back onto users by login
-        users_features = users_features.merge(
-            pd.concat([spec, simpson, repo_lang_div], axis=1),
-            left_on='login', right_index=True, how='left'
-        )
-    else:
-        # If we can't compute language distribution, create zeros.
-        users_features['language_specialization'] = 0.0
-        users_features['language_balance'] = 0.0
-        users_features['repo_language_diversity'] = 0.0
-
-    # Fill NA from the merge above
-    for c in ['language_specialization', 'language_balance', 'repo_language_diversity']:
-        if c not in users_features.columns:
-            users_features[c] = 0.0
-        else:
-            users_features[c] = users_features[c].fillna(0.0)
-
-    # ---------- Avg #languages per repo (from languages_total_count) ----------
-    if {'owner_login', 'languages_total_count'}.issubset(df_repo.columns) and df_repo['languages_total_count'].notna().any():
-        avg_langs = (df_repo.groupby('owner_login')['languages_total_count']
-                           .mean()
-                           .to_frame('avg_languages_per_repo'))
-        users_features = users_features.merge(
-            avg_langs, left_on='login', right_index=True, how='left'
-        )
-    if 'avg_languages_per_repo' not in users_features.columns:
-        users_features['avg_languages_per_repo'] = 0.0
-    else:
-        users_features['avg_languages_per_repo'] = users_features['avg_languages_per_repo'].fillna(0.0)
-
-    # ---------- Optional: average repo "size" (if you want a coarse experience proxy) ----------
-    if {'owner_login', 'languages_total_size'}.issubset(df_repo.columns) and df_repo['languages_total_size'].notna().any():
-        avg_size = (df_repo.groupby('owner_login')['languages_total_size']
-                           .mean()
-                           .to_frame('avg_repo_size'))
-        users_features = users_features.merge(
-            avg_size, left_on='login', right_index=True, how='left'
-        )
-        users_features['avg_repo_size'] = users_features['avg_repo_size'].fillna(0.0)
-    else:
-        users_features['avg_repo_size'] = 0.0
-
-
-
-    return users_features
-
-
-
-def create_collaboration_features(df_users, df_repo):
-    print("Creating Collaboration Features...")
-    users_features = df_users.copy()
-
-    for c in ['total_issue_comments','total_pr_review_contributions','total_discussion_comments','total_commit_comments',
-              'total_pr_contributions','total_issue_contributions','total_commit_contributions',
-              'forked_repositories_count','following_count','followers_count','organizations_count',
-              'account_age_days','total_gist_comments','total_repositories']:
-        if c not in users_features.columns: users_features[c] = 0
-
-    # 1) Community engagement
-    engagement_cols = ['total_issue_comments','total_pr_review_contributions','total_discussion_comments','total_commit_comments']
-    users_features['community_engagement_score'] = users_features[engagement_cols].sum(axis=1)
-
-    # 2) Collaboration ratio
-    users_features['collaboration_ratio'] = (users_features['total_pr_contributions'] + users_features['total_issue_contributions']) / (users_features['total_commit_contributions'] + 1)
-
-    # 3) Fork contribution rate
-    users_features['fork_contribution_rate'] = users_features['forked_repositories_count'] / (users_features['total_repositories'] + 1)
-
-    # 4) Mentorship
-    users_features['mentorship_score'] = (
-        users_features['total_pr_review_contributions'] + users_features['total_gist_comments'] * 0.5
-    ) / (users_features['account_age_days'] / 365 + 1)
-
-    # 5) Stars/forks/watchers per owner
-    repo_contrib = df_repo.groupby('owner_login').agg({
-        'is_fork':'sum','stargazer_count':'sum','fork_count':'sum','watchers_count':'sum'
-    }).rename(columns={'is_fork':'total_forked_repos_owned',
-                       'stargazer_count':'total_stars_received',
-                       'fork_count':'total_forks_received',
-                       'watchers_count':'total_watchers'})
-    users_features = users_features.merge(repo_contrib, left_on='login', right_index=True, how='left').fillna(0)
-
-    # 6) Network influence
-    users_features['network_influence'] = np.log1p(
-        users_features['followers_count'] * 2 + users_features['total_stars_received'] * 0.5 + users_features['total_forks_received'] * 1.5
-    )
-
-    # ---------- NEW: Social coding index (normalized engagement per account-year) ----------
-    def _robust01(s, q=0.90):
-        s = pd.to_numeric(s, errors='coerce').fillna(0.0)
-        hi = s.quantile(q)
-        if hi <= 0:
-            return s*0.0
-        s = s.clip(lower=0, upper=hi)
-        return s / (hi + 1e-9)
-
-    acct_years = (users_features['account_age_days'] / 365.0).replace([np.inf,-np.inf], 0).fillna(0)
-    social_raw = (
-        users_features['total_issue_comments']
-      + users_features['total_pr_review_contributions']
-      + users_features['total_discussion_comments']
-      + users_features['total_commit_comments']
-      + 0.5*(users_features['total_pr_contributions'] + users_features['total_issue_contributions'])
-    ) / (acct_years + 1.0)
-
-    users_features['social_coding_index'] = _robust01(np.log1p(social_raw))
-
-    return users_features
-
-
-
-def create_project_quality_features(df_users, df_repo):
-    print("Creating Project Quality Features (patched)...")
-    users_features = df_users.copy()
-
-    # Ensure user-level cols exist
-    for c in ['active_repos','total_repositories','pinned_items_count','avg_days_since_last_push','total_languages']:
-        if c not in users_features.columns: users_features[c] = 0
-
-    users_features['repo_active_score']   = users_features['active_repos'] / (users_features['total_repositories'] + 1)
-    users_features['showcase_score'] = users_features['pinned_items_count'] / 6.0
-    users_features['maintenance_rate']    = users_features['avg_days_since_last_push']
-    users_features['maintenance_score']   = 1.0 / (1.0 + users_features['maintenance_rate'] / 30.0)
-
-    # Build repo aggregates only for columns that exist
-    pieces = []
-
-    if {'owner_login','stargazer_count'}.issubset(df_repo.columns):
-        stars = (df_repo.groupby('owner_login')['stargazer_count']
-                 .agg(avg_stars_per_repo='mean', max_stars_repo='max', stars_std_dev='std'))
-        pieces.append(stars)
-
-    if {'owner_login','fork_count'}.issubset(df_repo.columns):
-        forks = (df_repo.groupby('owner_login')['fork_count']
-                 .agg(avg_forks_per_repo='mean', max_forks_repo='max'))
-        pieces.append(forks)
-
-    if {'owner_login','watchers_count'}.issubset(df_repo.columns):
-        watchers = (df_repo.groupby('owner_login')['watchers_count']
-                    .mean().to_frame('avg_watchers_per_repo'))
-        pieces.append(watchers)
-
-    # languages_total_count often missing for users with no public repos
-    if {'owner_login','languages_total_count'}.issubset(df_repo.columns) and df_repo['languages_total_count'].notna().any():
-        langs = (df_repo.groupby('owner_login')['languages_total_count']
-                 .mean().to_frame('avg_languages_per_repo'))
-        pieces.append(langs)
-
-    if {'owner_login','is_private'}.issubset(df_repo.columns):
-        public_ratio = (df_repo.groupby('owner_login')['is_private']
-                        .apply(lambda x: float((x == False).mean()))
-                        .to_frame('public_repo_ratio'))
-        pieces.append(public_ratio)
-
-    if pieces:
-        repo_quality_stats = pieces[0]
-        for p in pieces[1:]:
-            repo_quality_stats = repo_quality_stats.join(p, how='outer')
-        repo_quality_stats = repo_quality_stats.reset_index()
-    else:
-        repo_quality_stats = pd.DataFrame(columns=[
-            'owner_login','avg_stars_per_repo','max_stars_repo','stars_std_dev',
-            'avg_forks_per_repo','max_forks_repo',
-            'avg_watchers_per_repo','avg_languages_per_repo','public_repo_ratio'
-        ])
-
-    users_features = users_features.merge(
-        repo_quality_stats, left_on='login', right_on='owner_login', how='left'
-    )
-
-    # Ensure all expected cols exist & are filled
-    needed = ['avg_stars_per_repo','max_stars_repo','stars_std_dev',
-              'avg_forks_per_repo','max_forks_repo',
-              'avg_watchers_per_repo','avg_languages_per_repo','public_repo_ratio']
-    for c in needed:
-        if c not in users_features.columns:
-            users_features[c] = 0.0
-    users_features[needed] = users_features[needed].fillna(0.0)
-
-    users_features['code_change_rate'] = (
-        users_features['avg_additions_per_commit'] + users_features['avg_deletions_per_commit']) / 2.0
-
-    # Robust scaling helper (cap at 90th percentile)
-    def _robust01(s, q=0.90):
-        s = pd.to_numeric(s, errors='coerce').fillna(0.0)
-        hi = s.quantile(q)
-        if hi <= 0:
-            return s*0.0
-        s = s.clip(lower=0, upper=hi)
-        return s / (hi + 1e-9)
-
-    lang_richness = _robust01(users_features['avg_languages_per_repo'])       # multi-language repos
-    files_touched = _robust01(users_features['avg_files_per_commit'])         # breadth per commit
-    churn_level  = _robust01(users_features['code_change_rate'])              # code change size
-    active_ratio = users_features['repo_active_score'].clip(0, 1)             # portfolio activeness
-
-    users_features['project_complexity'] = (
-        0.30 * lang_richness +
-        0.25 * files_touched +
-        0.25 * churn_level  +
-        0.20 * active_ratio
-    ).astype(float)  # stays in [0,1]
-
-    # ---- Code review metrics ----
-    users_features['code_review_participation'] = (
-        users_features['total_pr_review_contributions'] /
-        (users_features['total_pr_contributions'] + 1.0)
-    )
-
-    acct_years = (users_features['account_age_days'] / 365.0).replace([np.inf, -np.inf], 0).fillna(0)
-    review_intensity = users_features['total_pr_review_contributions'] / (acct_years + 1.0)  # reviews per year
-    review_intensity_n = _robust01(review_intensity)
-    review_ratio = users_features['code_review_participation'].fillna(0).clip(0, 1)
-
-    users_features['code_review_index'] = (0.5 * review_intensity_n + 0.5 * review_ratio).astype(float)
-
-    return users_features
-
-
-def create_developer_influence_features(df_users):
-    """
-    Influence & leadership features with robust, defensible scaling.
-
-    Adds:
-      - reputation_score (unchanged from your idea)
-      - impact_factor, influence_growth_rate, viral_repo_score (unchanged)
-      - leadership_score in [0,1], plus component columns:
-          lead_org, lead_mentorship, lead_review, lead_support
-    """
-    print("Creating Developer Influence Features (robust)...")
-    users_features = df_users.copy()
-
-    # Ensure required columns exist
-    for c in [
-        'total_stars_received','total_forks_received','sponsoring_count','sponsors_count',
-        'followers_count','organizations_count','mentorship_score','avg_stars_per_repo',
-        'max_stars_repo','total_repositories','account_age_days','total_pr_review_contributions'
-    ]:
-        if c not in users_features.columns:
-            users_features[c] = 0.0
-
-    # ---- Reputation & impact (as you had) ----
-    users_features['reputation_score'] = (
-        np.log1p(users_features['followers_count'])        * 0.3 +
-        np.log1p(users_features['total_stars_received'])   * 0.3 +
-        np.log1p(users_features['total_forks_received'])   * 0.2 +
-        np.log1p(users_features['sponsoring_count'])       * 0.1 +
-        np.log1p(users_features['sponsors_count'])         * 0.1
-    )
-
-    users_features['impact_factor'] = (
-        users_features['total_stars_received'] + 2.0 * users_features['total_forks_received']
-    ) / (users_features['total_repositories'] + 1.0)
-
-    users_features['influence_growth_rate'] = (
-        users_features['followers_count'] / (users_features['account_age_days'] / 365.0 + 1.0)
-    )
-
-    users_features['viral_repo_score'] = (
-        users_features['max_stars_repo'] / (users_features['avg_stars_per_repo'] + 1.0)
-    )
-
-    # ---- Leadership score (robust, defensible) ----
-    # Helper: robust 0..1 scaling capped at 90th percentile to reduce outlier dominance
-    def _robust01(s, q=0.90):
-        s = pd.to_numeric(s, errors='coerce').fillna(0.0)
-        hi = s.quantile(q)
-        if hi <= 0:
-            return s*0.0
-        s = s.clip(lower=0, upper=hi)
-        return s / (hi + 1e-9)
-
-    # Years on platform
-    acct_years = (users_features['account_age_days'] / 365.0).replace([np.inf, -np.inf], 0).fillna(0)
-
-    # Components:
-    # 1) Organizational leadership: membership/roles in orgs (cap at 3 orgs for interpretability)
-    lead_org = (users_features['organizations_count'].clip(0, 3) / 3.0).astype(float)
-
-    # 2) Mentorship leadership: use the mentorship_score directly
-    #    NO FALLBACK - must have real data
-    if 'mentorship_score' not in users_features.columns:
-        raise ValueError("❌ ERROR: mentorship_score not found in dataset! Cannot compute leadership_score.")
-    mentorship_raw = users_features['mentorship_score']
-    lead_mentorship = _robust01(mentorship_raw)
-
-    # 3) Review leadership: PR review intensity per year (distinct from mentorship if that includes gist comments, etc.)
-    review_intensity = users_features['total_pr_review_contributions'] / (acct_years + 1.0)
-    lead_review = _robust01(review_intensity)
-
-    # 4) Community support: sponsors + sponsoring (log dampened to avoid runaway)
-    support_raw = np.log1p(users_features['sponsoring_count'] + users_features['sponsors_count'])
-    lead_support = _robust01(support_raw)
-
-    # Save components for transparency (optional but handy for EDA)
-    users_features['lead_org']        = lead_org
-    users_features['lead_mentorship'] = lead_mentorship
-    users_features['lead_review']     = lead_review
-    users_features['lead_support']    = lead_support
-
-    # Weighted blend (sums to 1.0). Rationale:
-    # - Org & Mentorship (0.35 each): primary signals of leading people/projects.
-    # - Reviews (0.20): leadership in quality/process.
-    # - Support (0.10): external recognition; useful but not core to leadership.
-    users_features['leadership_score'] = (
-        0.35 * lead_org +
-        0.35 * lead_mentorship +
-        0.20 * lead_review +
-        0.10 * lead_support
-    ).astype(float)
-
-    # ---- Simple profile completeness (keep) ----
-    avail = [c for c in ['email','location','avatar_url','profile_url'] if c in users_features.columns]
-    if avail:
-        users_features['profile_completeness'] = sum(
-            (~users_features[c].isna()).astype(int) for c in avail
-        ) / float(len(avail))
-    else:
-        users_features['profile_completeness'] = 0.0
-
-    return users_features
-
-
-
-def create_behavioral_patterns(df_users):
-    """
-    Behavioral pattern features (robust & normalized).
-
-    Outputs (all in [0,1], unless noted):
-      - maintainer_score        : share of started vs (started + forked)
-      - team_player_score       : blend of orgs, collaboration intensity, fork rate
-      - generalist_score        : normalized total_languages
-      - work_consistency        : 1 / (1 + stars_std_dev / (avg_stars_per_repo + eps))
-      - learning_velocity       : generalist_score * recent_activity_ratio (clipped)
-      - innovation_index        : sqrt(normalized started repos * normalized avg stars)
-
-    Notes:
-      * Uses robust 0..1 scaling capped at cohort 90th percentile to reduce outlier dominance.
-      * Includes fallbacks if collaboration_ratio / fork_contribution_rate / recent_activity_ratio
-        weren't computed earlier in the pipeline.
-    """
-    print("Creating Behavioral Pattern Features (normalized & robust)...")
-    users_features = df_users.copy()
-
-    # ---------- ensure required columns exist (init with 0.0) ----------
-    base_needed = [
-        'total_started_repos','total_forked_repos','organizations_count',
-        'total_languages','stars_std_dev','avg_stars_per_repo'
-    ]
-    for c in base_needed:
-        if c not in users_features.columns:
-            users_features[c] = 0.0
-
-    # Check that required columns exist - NO FALLBACKS
-    required_cols = [
-        'total_pr_contributions','total_issue_contributions','total_commit_contributions',
-        'forked_repositories_count','total_repositories',
-        'total_contributions','contributions_this_year'
-    ]
-    missing_cols = [c for c in required_cols if c not in users_features.columns]
-    if missing_cols:
-        raise ValueError(f"❌ ERROR: Required columns missing from dataset: {missing_cols}. Cannot compute composite features without real data.")
-
-    # ---------- helpers ----------
-    def _robust01(s, q=0.90):
-        """Scale to [0,1] with cap at q-quantile to reduce outlier dominance."""
-        s = pd.to_numeric(s, errors='coerce').fillna(0.0)
-        hi = s.quantile(q)
-        if hi <= 0:
-            return s * 0.0
-        s = s.clip(lower=0, upper=hi)
-        return s / (hi + 1e-9)
-
-    eps = 1e-9
-
-    # ---------- Compute ratios if not present (but only using real data) ----------
-    # collaboration_ratio = (PRs + Issues) / (Commits + 1)
-    if 'collaboration_ratio' not in users_features.columns:
-        # This is OK - we're computing from real data, not using a fallback
-        users_features['collaboration_ratio'] = (
-            (users_features['total_pr_contributions'] + users_features['total_issue_contributions']) /
-            (users_features['total_commit_contributions'] + 1.0)
-        )
-
-    # fork_contribution_rate = forked_repositories_count / (total_repositories + 1)
-    if 'fork_contribution_rate' not in users_features.columns:
-        users_features['fork_contribution_rate'] = (
-            users_features['forked_repositories_count'] / (users_features['total_repositories'] + 1.0)
-        )
-
-    # recent_activity_ratio = contributions_this_year / (total_contributions + 1)
-    if 'recent_activity_ratio' not in users_features.columns:
-        users_features['recent_activity_ratio'] = (
-            users_features['contributions_this_year'] / (users_features['total_contributions'] + 1.0)
-        )
-
-    # ---------- 1) Maintainer vs Contributor ----------
-    denom = users_features['total_started_repos'] + users_features['total_forked_repos']
-    users_features['maintainer_score'] = (
-        users_features['total_started_repos'] / (denom + 1.0)
-    ).astype(float)  # [0,1]
-
-    # ---------- 2) Team player score (normalized blend) ----------
-    # orgs: cap at 3 orgs => [0,1]
-    org_norm    = (users_features['organizations_count'].clip(0, 3) / 3.0).astype(float)
-    # collab_ratio: robust 0..1
-    collab_norm = _robust01(users_features['collaboration_ratio'])
-    # fork contribution rate: already a ratio
-    fork_rate   = users_features['fork_contribution_rate'].fillna(0.0).clip(0, 1)
-
-    users_features['team_player_score'] = (
-        0.35 * org_norm + 0.45 * collab_norm + 0.20 * fork_rate
-    ).astype(float)  # [0,1]
-
-    # ---------- 3) Specialist vs Generalist ----------
-    users_features['generalist_score'] = _robust01(users_features['total_languages'])  # [0,1]
-
-    # ---------- 4) Work consistency (bounded, higher = steadier stars) ----------
-    var_ratio = users_features['stars_std_dev'] / (users_features['avg_stars_per_repo'] + eps)
-    var_ratio = var_ratio.replace([np.inf, -np.inf], np.nan).fillna(0.0).clip(lower=0)
-    users_features['work_consistency'] = (1.0 / (1.0 + var_ratio)).astype(float)  # [0,1]
-
-    # ---------- 5) Learning velocity (breadth x recentness) ----------
-    recent = users_features['recent_activity_ratio'].fillna(0.0).clip(0, 1)
-    users_features['learning_velocity'] = (
-        users_features['generalist_score'] * recent
-    ).astype(float)  # [0,1]
-
-    # ---------- 6) Innovation index (originality x reception) ----------
-    started_n  = _robust01(users_features['total_started_repos'])
-    avgstars_n = _robust01(users_features['avg_stars_per_repo'])
-    users_features['innovation_index'] = np.sqrt(started_n * avgstars_n).astype(float)  # [0,1]
-
-    return users_features
-
-
-
-
-def create_final_feature_set(df_users, df_repo):
-    print("\n" + "="*80)
-    print("Starting Feature Engineering Process...")
-    print("="*80 + "\n")
-
-    # Make sure we have a 'login' key to join on
-    if 'login' not in df_users.columns and 'username' in df_users.columns:
-        df_users = df_users.copy()
-        df_users['login'] = df_users['username']
-
-    # Build features in sequence (each step augments the frame)
-    features = create_developer_activity_features(df_users, df_repo)
-    features = create_technical_skills_features(features, df_repo)
-    features = create_collaboration_features(features, df_repo)
-    features = create_project_quality_features(features, df_repo)
-    features = create_developer_influence_features(features)
-    features = create_behavioral_patterns(features)
-
-    # ---- No portfolio_score / No developer_category ----
-    # (If you had any downstream code using these, remove or guard it.)
-
-    print("\nFeature engineering complete!")
-    print(f"Total features created: {features.shape[1] - df_users.shape[1]}")
-    print(f"Final dataset shape: {features.shape}")
-    return features
-
-
-def get_feature_groups():
-    return {
-        'activity_features': [
-            'activity_intensity_score','contribution_consistency','repo_creation_rate',
-            'recent_activity_ratio','code_change_rate','development_velocity','multitasking_score','commit_freq_per_year'
-        ],
-        'technical_features': [
-            'language_specialization','tech_stack_breadth','repo_language_diversity',
-            'avg_languages_per_repo','project_complexity'
-        ],
-        'collaboration_features': [
-            'community_engagement_score','collaboration_ratio','fork_contribution_rate',
-            'social_coding_index','mentorship_score','network_influence'
-        ],
-        'quality_features': [
-            'repo_active_score','showcase_score','maintenance_score',
-            'avg_stars_per_repo','public_repo_ratio','code_review_participation'
-        ],
-        'influence_features': [
-            'reputation_score','impact_factor','influence_growth_rate',
-            'viral_repo_score','leadership_score'
-        ],
-        'behavioral_features': [
-            'maintainer_score','team_player_score','generalist_score',
-            'work_consistency','learning_velocity','innovation_index'
-        ]
-    }
+# Builders live in feature_engineering.py: they write columns into one frame over
+# df_users instead of copying and re-merging it per builder (peak memory tracked by
+# benchmarks/bench_feature_memory.py)
+from feature_engineering import (
+    create_developer_activity_features, create_technical_skills_features,
+    create_collaboration_features, create_project_quality_features,
+    create_developer_influence_features, create_behavioral_patterns,
+    create_final_feature_set, get_feature_groups,
+)
 
 # ====== SAVE ENGINEERED FEATURES (safe, self-contained) ======
 import os, json
@@ -816,7 +203,7 @@ timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
 
 # Full dataset
 output_path = os.path.join(save_dir, f'final_features_{timestamp}.csv')
-final_features.to_csv(output_path, index=False)
+write_table(final_features, output_path)
 print(f"✅ Saved final_features to: {output_path}  | Shape: {final_features.shape}")
 
 # Engineered-only (guard if empty)
@@ -826,7 +213,7 @@ print(f"✅ Saved engineered features only to: {engineered_path}  | Count: {len(
 
 # Shortlist (model-ready)
 shortlist_path = os.path.join(save_dir, f'model_features_shortlist_{timestamp}.csv')
-model_df.to_csv(shortlist_path, index=False)
+write_table(model_df, shortlist_path)
 print(f"✅ Saved model shortlist to: {shortlist_path}  | Shape: {model_df.shape}")
 
 # Feature groups metadata
@@ -857,6 +244,29 @@ print("\n" + "="*60)
 print(f"All files saved successfully to: {save_dir}")
 print("="*60)
 
+# Owner-level repository aggregates for the ranking target: the one cached groupby over
+# df_repo the feature builders used, so later stages need nothing else from df_repo
+# NO FALLBACKS - Must have real repository data with all required columns
+from feature_engineering import owner_repo_stats
+print(f"\n📦 Repository statistics from {len(df_repo)} repositories in {repos_csv}")
+
+# Check for required columns - NO FALLBACKS
+required_repo_cols = ['stargazer_count', 'fork_count', 'watchers_count', 'languages_total_size', 'languages_total_count']
+missing_repo_cols = [col for col in required_repo_cols if col not in df_repo.columns]
+if missing_repo_cols:
+    raise ValueError(f"❌ ERROR: Required repository columns missing: {missing_repo_cols}! Cannot train ranking model without real repository data.")
+
+# Owner login links repos to users
+# (in chunked mode df_repo already is the owner statistics)
+if isinstance(df_repo, ChunkedRepoStats) or df_repo['owner_login'].notna().any():
+    owner_stats = owner_repo_stats(df_repo)
+elif 'owner' in df_repo.columns:
+    owner_stats = owner_repo_stats(df_repo.assign(owner_login=df_repo['owner']))
+else:
+    raise ValueError("❌ ERROR: No owner_login/owner column in repository data! Cannot link repos to users.")
+
+# %% setup
+
 """Developer Ranking"""
 
 
@@ -901,7 +311,7 @@ except ImportError:
 
 print("="*80 + "\n")
 
-from sklearn.model_selection import train_test_split, StratifiedKFold, GridSearchCV
+from sklearn.model_selection import train_test_split, StratifiedKFold
 from sklearn.preprocessing import StandardScaler
 from sklearn.impute import SimpleImputer
 from sklearn.pipeline import Pipeline
@@ -910,22 +320,53 @@ from sklearn.metrics import (
     f1_score, accuracy_score, classification_report, confusion_matrix,
     mean_squared_error, r2_score
 )
+from sklearn.base import clone
 from sklearn.multiclass import OneVsRestClassifier
 from sklearn.linear_model import LogisticRegression
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.svm import SVC
 from xgboost import XGBRegressor, XGBClassifier
+from ranking_search import successive_halving
+from external_memory import write_shards, train_external_memory
 
 SEED = 42
 np.random.seed(SEED)
 
+"""Helper Functions"""
+
+def robust01(s, q=0.90):
+    """Normalize series to 0-1 range with outlier clipping"""
+    s = pd.to_numeric(s, errors="coerce").fillna(0.0)
+    hi = s.quantile(q)
+    if hi <= 0:
+        return s * 0.0
+    s = s.clip(0, hi)
+    return s / (hi + 1e-9)
+
+def ndcg_at_k(y_true, y_pred, k=20):
+    """Normalized Discounted Cumulative Gain at K"""
+    idx = np.argsort(-y_pred)[:k]
+    gains = np.array(y_true)[idx]
+    dcg = np.sum((2**gains - 1) / np.log2(np.arange(2, k+2)))
+    ideal = np.sort(y_true)[::-1][:k]
+    idcg = np.sum((2**ideal - 1) / np.log2(np.arange(2, k+2)))
+    return float(dcg / (idcg + 1e-9))
+
+print("✅ Helper functions defined!")
+
+# %% stage: ranking_data | inputs: owner_stats, shortlist_path, output_path | outputs: df, rank_components, final_features_files
+
 # Use the same SAVE_DIR as defined earlier
 # SAVE_DIR = "training_outputs" (already defined at line 15)
 
-# Look for feature shortlist CSV in current directory or training_outputs
-cands = sorted(glob.glob("model_features_shortlist_*.csv"))
-if not cands:
-    cands = sorted(glob.glob(os.path.join(SAVE_DIR, "model_features_shortlist_*.csv")))
+# The shortlist the features stage just wrote; otherwise look for one
+# in the current directory or training_outputs
+if 'shortlist_path' in globals():
+    cands = [shortlist_path]
+else:
+    cands = sorted(glob.glob("model_features_shortlist_*.csv"))
+    if not cands:
+        cands = sorted(glob.glob(os.path.join(SAVE_DIR, "model_features_shortlist_*.csv")))
 
 if not cands:
     print("⚠️  Warning: model_features_shortlist_*.csv not found")
@@ -937,7 +378,7 @@ if not cands:
         df = df_users.copy()
 else:
     SHORTLIST_PATH = cands[-1]
-    df = pd.read_csv(SHORTLIST_PATH)
+    df = read_table(SHORTLIST_PATH)
     
 assert "id" in df.columns, "Shortlist must include an 'id' column"
 
@@ -949,28 +390,6 @@ else:
 print(f"   Shape: {df.shape}")
 print(f"   Columns: {list(df.columns[:10])}... (showing first 10)")
 
-"""Helper Functions"""
-
-def robust01(s, q=0.90):
-    """Normalize series to 0-1 range with outlier clipping"""
-    s = pd.to_numeric(s, errors="coerce").fillna(0.0)
-    hi = s.quantile(q)
-    if hi <= 0:
-        return s * 0.0
-    s = s.clip(0, hi)
-    return s / (hi + 1e-9)
-
-def ndcg_at_k(y_true, y_pred, k=20):
-    """Normalized Discounted Cumulative Gain at K"""
-    idx = np.argsort(-y_pred)[:k]
-    gains = np.array(y_true)[idx]
-    dcg = np.sum((2**gains - 1) / np.log2(np.arange(2, k+2)))
-    ideal = np.sort(y_true)[::-1][:k]
-    idcg = np.sum((2**ideal - 1) / np.log2(np.arange(2, k+2)))
-    return float(dcg / (idcg + 1e-9))
-
-print("✅ Helper functions defined!")
-
 """Ranking Target Variable - UPDATED FOR DIRECT PRIORITY METRICS"""
 
 print("\n🎯 Creating NEW rank_target with direct priority metrics:")
@@ -981,16 +400,18 @@ print("   Loading full features from final_features to get raw metrics...")
 
 # Load user-level metrics (commits, recency) from final_features
 # Note: Stars/forks/watchers now come from repository-level data below
-final_features_files = sorted(glob.glob(os.path.join(SAVE_DIR, "final_features_*.csv")))
+if 'output_path' in globals():
+    final_features_files = [output_path]  # written by the features stage
+else:
+    final_features_files = sorted(glob.glob(os.path.join(SAVE_DIR, "final_features_*.csv")))
 if final_features_files:
     final_features_path = final_features_files[-1]
     print(f"   Loading user-level metrics from: {final_features_path}")
 
-    df_full = pd.read_csv(final_features_path)
-    
     # Extract only commits and recency (stars/forks come from repo data)
     # Note: final_features uses 'login' as key, shortlist uses 'id'
     user_metrics_cols = ['login', 'total_commit_contributions', 'recent_activity_ratio']
+    df_full = read_table(final_features_path, columns=user_metrics_cols)
     available_metrics = [c for c in user_metrics_cols if c in df_full.columns]
     
     # Merge user-level metrics into our working dataframe
@@ -1005,39 +426,24 @@ if final_features_files:
 else:
     raise FileNotFoundError("❌ ERROR: final_features not found! Cannot get user-level commits/recency data.")
 
-# Load repository-level data for per-repo ranking metrics
-# NO FALLBACKS - Must have real repository data with all required columns
+# Repository-level metrics for per-repo ranking come from owner_stats, the owner
+# aggregates the feature builders already computed (no CSV re-read)
 print("\n   Loading repository-level metrics for ranking...")
-repo_csv = "github_repos_20251023_064928.csv"
-if not os.path.exists(repo_csv):
-    raise FileNotFoundError(f"❌ ERROR: Repository CSV not found: {repo_csv}! Cannot train ranking model without repository data.")
+print(f"   ✅ Using repository statistics of {len(owner_stats)} owners")
 
-df_repos = pd.read_csv(repo_csv)
-print(f"   ✅ Loaded {len(df_repos)} repositories")
-
-# Check for required columns - NO FALLBACKS
-required_repo_cols = ['stargazer_count', 'fork_count', 'watchers_count', 'languages_total_size', 'languages_total_count']
-missing_repo_cols = [col for col in required_repo_cols if col not in df_repos.columns]
-if missing_repo_cols:
-    raise ValueError(f"❌ ERROR: Required repository columns missing: {missing_repo_cols}! Cannot train ranking model without real repository data.")
-
-# Map owner_login to id for merging with user data
-if 'owner_login' in df_repos.columns:
-    df_repos['id'] = df_repos['owner_login']
-elif 'owner' in df_repos.columns:
-    df_repos['id'] = df_repos['owner']
-else:
-    raise ValueError("❌ ERROR: No owner_login/owner column in repository data! Cannot link repos to users.")
-
-# Aggregate repository metrics per user (sum of all their repos)
+# Repository metrics per user (sum of all their repos)
 # Bigger values = better
-repo_agg = df_repos.groupby('id').agg({
-    'stargazer_count': 'sum',           # Total stars across all repos
-    'fork_count': 'sum',                # Total forks across all repos
-    'watchers_count': 'sum',            # Total watchers across all repos
-    'languages_total_size': 'sum',      # Total language code size (bigger = better)
-    'languages_total_count': 'sum',     # Total language diversity (bigger = better)
-}).reset_index()
+repo_agg = (owner_stats[['total_stars_received', 'total_forks_received', 'total_watchers',
+                         'total_languages_size', 'total_languages_count']]
+            .rename(columns={
+                'total_stars_received': 'stargazer_count',         # Total stars across all repos
+                'total_forks_received': 'fork_count',              # Total forks across all repos
+                'total_watchers': 'watchers_count',                # Total watchers across all repos
+                'total_languages_size': 'languages_total_size',    # Total language code size (bigger = better)
+                'total_languages_count': 'languages_total_count',  # Total language diversity (bigger = better)
+            })
+            .rename_axis('id')
+            .reset_index())
 
 print(f"   ✅ Aggregated metrics for {len(repo_agg)} users")
 print(f"   Metrics: stargazer_count, fork_count, watchers_count, languages_total_size, languages_total_count")
@@ -1114,6 +520,8 @@ print("✅ Ranking target created!")
 print(f"   Components used: {len(rank_components)}")
 print(f"   Target stats - Mean: {df['rank_target'].mean():.4f}, Std: {df['rank_target'].std():.4f}")
 
+# %% stage: ranking_split | inputs: df, rank_components | outputs: Xr_train, Xr_val, Xr_test, yr_train, yr_val, yr_test, id_test, num_features, prep_rank, Xr_search, yr_search, Xr_search_val, yr_search_val
+
 """ Prepare Features and Split Data"""
 
 # Build X, y for ranking (drop id and the columns used to build target)
@@ -1151,17 +559,53 @@ prep_rank = ColumnTransformer([
     ]), num_features)
 ])
 
-# Create XGBoost Regressor
+# Fit the preprocessing once; the search and the final model both use it
+prep_rank.fit(Xr_train)
+
+if XGB_EXTERNAL_MEMORY:
+    # The final model streams the full split from shards; the search tunes on a random sample
+    rng = np.random.default_rng(SEED)
+    search_idx = np.sort(rng.choice(len(Xr_train), min(len(Xr_train), RANK_SEARCH_SAMPLE_ROWS), replace=False))
+    search_val_idx = np.sort(rng.choice(len(Xr_val), min(len(Xr_val), RANK_SEARCH_SAMPLE_ROWS // 3), replace=False))
+    Xr_search, yr_search = prep_rank.transform(Xr_train.iloc[search_idx]), yr_train[search_idx]
+    Xr_search_val, yr_search_val = prep_rank.transform(Xr_val.iloc[search_val_idx]), yr_val[search_val_idx]
+    print(f"   Search sample: {len(search_idx):,} train / {len(search_val_idx):,} validation rows")
+else:
+    Xr_search, yr_search = prep_rank.transform(Xr_train), yr_train
+    Xr_search_val, yr_search_val = prep_rank.transform(Xr_val), yr_val
+
+# %% stage: ranking_tune | inputs: Xr_search, yr_search, Xr_search_val, yr_search_val | outputs: ranking_search | code: ranking_search.py
+
+"""Hyperparameter Search (successive halving)"""
+
+print("🔎 Searching XGBoost parameters (successive halving, early stopping on validation)...")
+ranking_search = successive_halving(
+    Xr_search, yr_search, Xr_search_val, yr_search_val,
+    n_candidates=RANK_SEARCH_CANDIDATES,
+    max_rounds=RANK_SEARCH_MAX_ROUNDS,
+    n_jobs=N_JOBS,
+    random_state=SEED,
+    base_params={
+        "tree_method": "gpu_hist" if USE_GPU else "hist",
+        "device": "cuda" if USE_GPU else "cpu",
+    },
+)
+
+print(f"✅ Search completed in {ranking_search['wall_seconds']:.1f}s on {ranking_search['cpus']} CPU(s)")
+print(f"   Best validation RMSE: {ranking_search['best_val_rmse']:.5f} ({ranking_search['best_rounds']} rounds)")
+print(f"   Best parameters: {ranking_search['best_params']}")
+
+# %% stage: ranking | inputs: Xr_train, Xr_val, Xr_test, yr_train, yr_val, yr_test, id_test, num_features, prep_rank, ranking_search | outputs: pipe_rank_xgb, rank_mlp, TENSORFLOW_AVAILABLE, timestamp | code: external_memory.py
+
+# Create XGBoost Regressor with the searched configuration
 xgb_ranker = XGBRegressor(
     objective="reg:squarederror",
     tree_method="gpu_hist" if USE_GPU else "hist",  # GPU acceleration if available
-    n_estimators=600,
-    max_depth=6,
-    learning_rate=0.05,
-    subsample=0.9,
-    colsample_bytree=0.9,
+    n_estimators=ranking_search["best_rounds"],
+    **ranking_search["best_params"],
     random_state=SEED,
-    device="cuda" if USE_GPU else "cpu"  # Explicit device setting
+    device="cuda" if USE_GPU else "cpu",  # Explicit device setting
+    n_jobs=N_JOBS
 )
 
 # Create complete pipeline
@@ -1177,21 +621,29 @@ print(f"   - learning_rate: {xgb_ranker.learning_rate}")
 print("🚀 Training XGBoost Ranker with validation monitoring...")
 
 # For XGBoost 3.x with sklearn pipeline, we'll use a simpler approach
-# Manually preprocess the data and train the model with early stopping
-
-# Step 1: Fit and transform training data
-Xr_train_transformed = pipe_rank_xgb.named_steps['prep'].fit_transform(Xr_train)
-
-# Step 2: Transform validation data (without fitting)
-Xr_val_transformed = pipe_rank_xgb.named_steps['prep'].transform(Xr_val)
-
-# Step 3: Train XGBoost model directly with eval_set
-xgb_model = pipe_rank_xgb.named_steps['model']
-xgb_model.fit(
-    Xr_train_transformed, yr_train,
-    eval_set=[(Xr_val_transformed, yr_val)],
-    verbose=False
-)
+# The preprocessing is already fitted (ranking_split), so train the model directly
+# on the transformed data with eval_set
+if XGB_EXTERNAL_MEMORY:
+    # Shards of the raw split, preprocessed batch by batch while XGBoost streams them
+    shard_dir = f"{SHARD_DIR}/ranking"
+    xgb_model = train_external_memory(
+        write_shards(Xr_train, yr_train, f"{shard_dir}/train", XGB_SHARD_ROWS),
+        num_features, ["target_0"],
+        xgb_ranker.get_xgb_params(), xgb_ranker.n_estimators,
+        eval_shards=write_shards(Xr_val, yr_val, f"{shard_dir}/val", XGB_SHARD_ROWS),
+        transform=prep_rank.transform,
+        cache_dir=f"{shard_dir}/cache",
+    )
+    shutil.rmtree(shard_dir, ignore_errors=True)
+    pipe_rank_xgb.steps[-1] = ("model", xgb_model)
+    print(f"   External memory: {XGB_SHARD_ROWS:,}-row shards")
+else:
+    xgb_model = pipe_rank_xgb.named_steps['model']
+    xgb_model.fit(
+        prep_rank.transform(Xr_train), yr_train,
+        eval_set=[(prep_rank.transform(Xr_val), yr_val)],
+        verbose=False
+    )
 
 print(f"✅ XGBoost training completed!")
 print(f"   Trained with validation monitoring")
@@ -1253,6 +705,9 @@ try:
     from tensorflow import keras
     from tensorflow.keras import layers
     TENSORFLOW_AVAILABLE = True
+    if N_JOBS > 0:
+        tf.config.threading.set_intra_op_parallelism_threads(N_JOBS)
+        tf.config.threading.set_inter_op_parallelism_threads(1)
     
     def build_rank_mlp(input_dim):
         """Build a Multi-Layer Perceptron for ranking"""
@@ -1702,6 +1157,8 @@ print("\n" + "="*80)
 print("✅ ANALYSIS COMPLETE!")
 print("="*80)
 
+# %% stage: skills | inputs: df | outputs: SKILL_MODELS, skills_comparison_df | files: repos_csv | code: external_memory.py
+
 """Skill classification - UPDATED FOR FREQUENCY-BASED PROFICIENCY"""
 
 print("="*80)
@@ -1720,8 +1177,13 @@ print("   • Recency: Recent usage weighted higher")
 print("\n📂 Loading repository data for skills proficiency calculation...")
 repo_csv = "github_repos_20251023_064928.csv"
 
+# Only the columns this section uses (missing ones are skipped, checks below still apply)
+SKILLS_REPO_COLUMNS = ['owner_login', 'primary_language', 'language', 'stargazer_count', 'fork_count',
+                       'watchers_count', 'stars', 'forks', 'watchers', 'updated_at',
+                       'releases_count', 'languages_total_size']
+
 if os.path.exists(repo_csv):
-    df_repo = pd.read_csv(repo_csv)
+    df_repo = load_table(repo_csv, REPO_DTYPES, columns=SKILLS_REPO_COLUMNS)
     print(f"✅ Loaded {len(df_repo)} repositories from {repo_csv}")
     
     # Rename columns to match expected format
@@ -1783,7 +1245,8 @@ else:
     raise FileNotFoundError(f"Required file {repo_csv} not found for skills training")
 
 # Get top 30 most common languages
-language_counts = df_repo['primary_language'].value_counts().head(30)
+# astype(object): ties keep first-appearance order, as before the categorical dtype
+language_counts = df_repo['primary_language'].astype(object).value_counts().head(30)
 skill_cols = language_counts.index.tolist()
 
 print(f"\n✅ Found {len(skill_cols)} top skills:")
@@ -1913,7 +1376,7 @@ pipe_lr = Pipeline([
             alpha=1.0,
             random_state=SEED
         ),
-        n_jobs=-1
+        n_jobs=N_JOBS
     ))
 ])
 
@@ -1944,14 +1407,31 @@ pipe_xgb_sk = Pipeline([
             colsample_bytree=0.9,
             random_state=SEED,
             device="cuda" if USE_GPU else "cpu",
-            n_jobs=-1
+            n_jobs=1  # labels are fitted in parallel below; one thread each keeps the total at N_JOBS
         ),
-        n_jobs=-1
+        n_jobs=N_JOBS
     ))
 ])
 
 print("🚀 Training XGBoost Multi-Output Regressor...")
-pipe_xgb_sk.fit(Xsk_tr, ysk_tr)
+if XGB_EXTERNAL_MEMORY:
+    # One multi-output booster streamed from shards: MultiOutputRegressor would need the
+    # transformed matrix in memory (once per parallel label)
+    prep_xgb_sk = clone(prep_sk).fit(Xsk_tr)
+    shard_dir = f"{SHARD_DIR}/skills"
+    skills_xgb = pipe_xgb_sk.named_steps["model"].estimator
+    skills_xgb = train_external_memory(
+        write_shards(Xsk_tr, ysk_tr, f"{shard_dir}/train", XGB_SHARD_ROWS),
+        num_cols, [f"target_{i}" for i in range(ysk_tr.shape[1])],
+        {**skills_xgb.get_xgb_params(), "n_jobs": N_JOBS}, skills_xgb.n_estimators,
+        transform=prep_xgb_sk.transform,
+        cache_dir=f"{shard_dir}/cache",
+    )
+    shutil.rmtree(shard_dir, ignore_errors=True)
+    pipe_xgb_sk = Pipeline([("prep", prep_xgb_sk), ("model", skills_xgb)])
+    print(f"   External memory: {XGB_SHARD_ROWS:,}-row shards")
+else:
+    pipe_xgb_sk.fit(Xsk_tr, ysk_tr)
 print("✅ XGBoost training completed!")
 
 # Store both models
@@ -2238,6 +1718,8 @@ print(f"   Ranking Correlation: {best_model_row['Ranking Correlation']:.4f}")
 print("\n✅ Skills proficiency model training complete!")
 print("="*80)
 
+# %% stage: behavior | inputs: df, final_features_files | outputs: BEHAVIOR_MODELS, behavior_comparison_df, best_behavior_model
+
 """Behaviour Analysis
 
 Create Behavioral Labels from Proxy Features
@@ -2264,7 +1746,7 @@ if missing_proxies:
     
     # Load from final_features
     if final_features_files:
-        df_full_beh = pd.read_csv(final_features_files[-1])
+        df_full_beh = read_table(final_features_files[-1], columns=['login'] + list(proxy_defs.values()))
         proxy_cols_to_merge = ['login'] + [v for v in proxy_defs.values() if v in df_full_beh.columns]
         
         if len(proxy_cols_to_merge) > 1:
@@ -2341,31 +1823,66 @@ prep_bh = ColumnTransformer([
     ("num", Pipeline([
         ("impute", SimpleImputer(strategy="median")),
         ("scale", StandardScaler())
-    ]), X_bh.select_dtypes(include=['float64', 'int64']).columns.tolist())
+    ]), X_bh.select_dtypes(include='number').columns.tolist())
 ], remainder='passthrough')
 
+# Exact RBF SVM cost grows quadratically-to-cubically with rows per label (plus a 5-fold
+# Platt calibration for probability=True); above this many training rows it is skipped and
+# the Nystroem (approximate RBF features + linear model) and histogram GBDT options stand in
+BEHAVIOR_SVC_MAX_ROWS = int(os.environ.get("BEHAVIOR_SVC_MAX_ROWS", "20000"))
+NYSTROEM_COMPONENTS = 300
+
+from sklearn.kernel_approximation import Nystroem
+from sklearn.ensemble import HistGradientBoostingClassifier
+import time
+
 # Define models
 BEHAVIOR_MODELS = {
     "Logistic Regression OvR": Pipeline([
         ("prep", prep_bh),
         ("model", OneVsRestClassifier(
-            LogisticRegression(max_iter=1000, random_state=SEED, class_weight='balanced')
+            LogisticRegression(max_iter=1000, random_state=SEED, class_weight='balanced'),
+            n_jobs=N_JOBS
         ))
     ]),
     "SVM RBF OvR": Pipeline([
         ("prep", prep_bh),
         ("model", OneVsRestClassifier(
-            SVC(kernel='rbf', probability=True, random_state=SEED, class_weight='balanced')
+            SVC(kernel='rbf', probability=True, random_state=SEED, class_weight='balanced'),
+            n_jobs=N_JOBS
         ))
-    ])
+    ]),
+    # Same RBF kernel (gamma=1/n_features, as SVC's 'scale' on standardized inputs),
+    # approximated with NYSTROEM_COMPONENTS landmarks: linear in the number of rows
+    "Nystroem RBF + LogReg OvR": Pipeline([
+        ("prep", prep_bh),
+        ("rbf", Nystroem(kernel='rbf', n_components=NYSTROEM_COMPONENTS, random_state=SEED)),
+        ("model", OneVsRestClassifier(
+            LogisticRegression(max_iter=1000, random_state=SEED, class_weight='balanced'),
+            n_jobs=N_JOBS
+        ))
+    ]),
+    "HistGradientBoosting OvR": Pipeline([
+        ("prep", prep_bh),
+        ("model", OneVsRestClassifier(
+            HistGradientBoostingClassifier(random_state=SEED, class_weight='balanced'),
+            n_jobs=N_JOBS
+        ))
+    ]),
 }
 
+if len(Xbh_tr) > BEHAVIOR_SVC_MAX_ROWS:
+    print(f"\n⚠️ Skipping SVM RBF OvR: {len(Xbh_tr):,} training rows > BEHAVIOR_SVC_MAX_ROWS={BEHAVIOR_SVC_MAX_ROWS:,}")
+    del BEHAVIOR_MODELS["SVM RBF OvR"]
+
 # Train and evaluate models
 behavior_results = []
 
 for model_name, pipeline in BEHAVIOR_MODELS.items():
     print(f"\n⚙️  Training {model_name}...")
+    fit_started = time.perf_counter()
     pipeline.fit(Xbh_tr, ybh_tr)
+    fit_seconds = time.perf_counter() - fit_started
     y_pred = pipeline.predict(Xbh_te)
     
     # Calculate metrics
@@ -2385,18 +1902,19 @@ for model_name, pipeline in BEHAVIOR_MODELS.items():
     behavior_results.append([
         model_name, micro_f1, macro_f1, weighted_f1,
         hamming, jaccard_micro, jaccard_macro,
-        exact_match
+        exact_match, fit_seconds
     ])
     
     print(f"   ✓ Micro F1: {micro_f1:.4f}")
     print(f"   ✓ Macro F1: {macro_f1:.4f}")
     print(f"   ✓ Hamming Loss: {hamming:.4f}")
+    print(f"   ✓ Fit time: {fit_seconds:.1f}s")
 
 # Create comparison DataFrame
 behavior_comparison_df = pd.DataFrame(behavior_results, columns=[
     "Model", "Micro F1", "Macro F1", "Weighted F1",
     "Hamming Loss", "Jaccard Micro", "Jaccard Macro",
-    "Exact Match"
+    "Exact Match", "Fit Seconds"
 ])
 
 print("\n" + "="*80)
@@ -2416,6 +1934,8 @@ print(f"   Exact Match: {behavior_comparison_df.iloc[best_behavior_idx]['Exact M
 print("\n✅ Behavioral classification training complete!")
 print("="*80)
 
+# %% stage: save | inputs: pipe_rank_xgb, ranking_search, rank_mlp, TENSORFLOW_AVAILABLE, SKILL_MODELS, skills_comparison_df, BEHAVIOR_MODELS, behavior_comparison_df, best_behavior_model, timestamp | writes: {SAVE_DIR}/ranking_xgboost.pkl, {SAVE_DIR}/ranking_mlp.h5, {SAVE_DIR}/skills_classifier.pkl, {SAVE_DIR}/behavior_classifier.pkl, {SAVE_DIR}/*_comparison_{timestamp}.csv, {SAVE_DIR}/model_manifest.json
+
 """Save All Models and Results"""
 
 print("\n" + "="*80)
@@ -2450,6 +1970,36 @@ skills_comparison_df.to_csv(f"{SAVE_DIR}/skills_comparison_{timestamp}.csv", ind
 behavior_comparison_df.to_csv(f"{SAVE_DIR}/behavior_comparison_{timestamp}.csv", index=False)
 print(f"✅ Saved comparison CSVs")
 
+# Model manifest: what each saved model is and how the ranking configuration was chosen
+model_manifest = {
+    "generated": datetime.now().isoformat(timespec="seconds"),
+    "timestamp": timestamp,
+    "models": {
+        "ranking_xgboost.pkl": {
+            "params": {"n_estimators": ranking_search["best_rounds"], **ranking_search["best_params"]},
+            "search": {
+                "method": "successive_halving",
+                "n_candidates": ranking_search["n_candidates"],
+                "eta": ranking_search["eta"],
+                "max_rounds": ranking_search["max_rounds"],
+                "best_val_rmse": ranking_search["best_val_rmse"],
+                "rungs": [
+                    {"rounds": r["rounds"], "candidates": len(r["results"]),
+                     "best_val_rmse": r["results"][0]["val_rmse"]}
+                    for r in ranking_search["rungs"]
+                ],
+                "cpus": ranking_search["cpus"],
+                "wall_seconds": round(ranking_search["wall_seconds"], 2),
+            },
+        },
+        "skills_classifier.pkl": {"model": best_skills_model_name},
+        "behavior_classifier.pkl": {"model": best_behavior_model},
+    },
+}
+with open(f"{SAVE_DIR}/model_manifest.json", "w") as f:
+    json.dump(model_manifest, f, indent=2)
+print(f"✅ Saved: model_manifest.json")
+
 print("\n" + "="*80)
 print("🎉 ALL MODELS TRAINED AND SAVED SUCCESSFULLY!")
 print("="*80)
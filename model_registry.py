@@ -0,0 +1,113 @@
+"""
+Model Registry
+Numbered versions of a trained model, each with the rows it was trained on
+
+Versions live under REGISTRY_DIR/<name>/ as vNNNN.pkl plus vNNNN.keys.csv (the
+training rows' keys, so a later run can tell which rows are new) and an entry in
+versions.json. Publishing a version also replaces the live model file the
+portfolio generator loads and updates its entry in model_manifest.json.
+"""
+
+import os
+import json
+import shutil
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Set
+
+import joblib
+import pandas as pd
+
+MODEL_DIR = Path("organized_structure/models")
+REGISTRY_DIR = MODEL_DIR / "registry"
+MANIFEST_NAME = "model_manifest.json"
+
+
+def _versions_path(name: str) -> Path:
+    return REGISTRY_DIR / name / "versions.json"
+
+
+def list_versions(name: str) -> list:
+    """Version records of a model, oldest first (empty when none were published)."""
+    path = _versions_path(name)
+    if not path.exists():
+        return []
+    return json.loads(path.read_text())
+
+
+def latest(name: str) -> Optional[Dict]:
+    """Record of the newest version, or None."""
+    versions = list_versions(name)
+    return versions[-1] if versions else None
+
+
+def load_version(name: str, record: Dict):
+    """The model object of a version record."""
+    return joblib.load(REGISTRY_DIR / name / record["file"])
+
+
+def trained_keys(name: str, record: Dict) -> Optional[Set[str]]:
+    """Keys of the rows a version was trained on, or None if it did not record them."""
+    if not record.get("keys_file"):
+        return None
+    path = REGISTRY_DIR / name / record["keys_file"]
+    return set(pd.read_csv(path, dtype=str)["key"])
+
+
+def _atomic_dump(obj, path: Path) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    joblib.dump(obj, tmp)
+    os.replace(tmp, path)
+
+
+def publish(name: str, model, record: Dict, keys: Optional[Iterable[str]] = None,
+            live_file: Optional[str] = None) -> Dict:
+    """
+    Store a model as the next version of `name` and make it the live model.
+
+    Args:
+        name: Registry name, e.g. "ranking_xgboost"
+        model: Fitted model or pipeline
+        record: Metadata for the version (mode, parameters, metrics, timings, ...)
+        keys: Keys of the training rows
+        live_file: File under MODEL_DIR consumers load (default "<name>.pkl")
+
+    Returns:
+        The stored version record
+    """
+    versions = list_versions(name)
+    version = versions[-1]["version"] + 1 if versions else 1
+    stem = f"v{version:04d}"
+    version_dir = REGISTRY_DIR / name
+    version_dir.mkdir(parents=True, exist_ok=True)
+
+    _atomic_dump(model, version_dir / f"{stem}.pkl")
+    keys_file = None
+    if keys is not None:
+        keys_file = f"{stem}.keys.csv"
+        pd.DataFrame({"key": sorted(set(map(str, keys)))}).to_csv(version_dir / keys_file, index=False)
+
+    record = {
+        **record,
+        "version": version,
+        "parent_version": versions[-1]["version"] if versions else None,
+        "file": f"{stem}.pkl",
+        "keys_file": keys_file,
+        "published": datetime.now().isoformat(timespec="seconds"),
+    }
+    versions.append(record)
+    tmp = _versions_path(name).with_suffix(".json.tmp")
+    tmp.write_text(json.dumps(versions, indent=2))
+    os.replace(tmp, _versions_path(name))
+
+    live_file = live_file or f"{name}.pkl"
+    live_tmp = MODEL_DIR / (live_file + ".tmp")
+    shutil.copyfile(version_dir / f"{stem}.pkl", live_tmp)
+    os.replace(live_tmp, MODEL_DIR / live_file)
+
+    manifest_path = MODEL_DIR / MANIFEST_NAME
+    manifest = json.loads(manifest_path.read_text()) if manifest_path.exists() else {}
+    manifest["generated"] = record["published"]
+    manifest.setdefault("models", {})[live_file] = {k: v for k, v in record.items() if k != "keys_file"}
+    manifest_path.write_text(json.dumps(manifest, indent=2))
+    return record
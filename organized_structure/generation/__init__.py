@@ -5,7 +5,16 @@ Provides ML-powered portfolio generation from GitHub data
 
 from .generate_portfolio_improved import generate_portfolio_improved, load_models
 from .parse_and_extract import extract_repo_features, extract_user_features, prepare_features_for_models
-from .render_pdf import render_html_portfolio, render_pdf_portfolio
+from .render_pdf import (
+    render_html_portfolio, render_pdf_portfolio,
+    render_html_from_data, render_pdf_from_data, create_portfolio_suite,
+    apply_view, PREVIEW_VIEW,
+)
+from .incremental import render_edited
+from .log_config import configure_logging, get_logger
+from .preview import PreviewSession, apply_patch
+from .themes import available_themes, get_theme_template
+from .thumbnail import thumbnail_path, write_thumbnail
 
 __all__ = [
     'generate_portfolio_improved',
@@ -15,5 +24,19 @@ __all__ = [
     'prepare_features_for_models',
     'render_html_portfolio',
     'render_pdf_portfolio',
+    'render_html_from_data',
+    'render_pdf_from_data',
+    'create_portfolio_suite',
+    'apply_view',
+    'PREVIEW_VIEW',
+    'render_edited',
+    'configure_logging',
+    'get_logger',
+    'PreviewSession',
+    'apply_patch',
+    'available_themes',
+    'get_theme_template',
+    'thumbnail_path',
+    'write_thumbnail',
 ]
 
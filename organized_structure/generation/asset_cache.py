@@ -0,0 +1,220 @@
+"""
+Shared Asset Cache
+Content-addressed on-disk cache for remote assets (avatars, images) used by the renderers
+"""
+
+import os
+import json
+import time
+import base64
+import hashlib
+import mimetypes
+from pathlib import Path
+from typing import Optional
+
+import requests
+
+try:
+    from .image_pipeline import PDF_IMAGE_DPI, encode_for_pdf, pixels_for
+    HAS_PIL = True
+except ImportError:
+    try:  # imported from a script with this directory on sys.path
+        from image_pipeline import PDF_IMAGE_DPI, encode_for_pdf, pixels_for
+        HAS_PIL = True
+    except ImportError:  # Pillow not installed
+        PDF_IMAGE_DPI = 150
+        HAS_PIL = False
+
+# Shared by the backend and the render pool workers, so it lives on disk
+ASSET_CACHE_DIR = Path(os.environ.get("ASSET_CACHE_DIR", Path(__file__).parent.parent / "outputs" / "asset_cache"))
+ASSET_CACHE_TTL_SECONDS = int(os.environ.get("ASSET_CACHE_TTL_SECONDS", 24 * 3600))
+ASSET_CACHE_MAX_BYTES = int(os.environ.get("ASSET_CACHE_MAX_BYTES", 200 * 1024 * 1024))
+FETCH_TIMEOUT_SECONDS = 5
+
+# Printed size of the avatar in the PDF header
+PDF_AVATAR_INCHES = 0.6
+# Pixel size of the embedded HTML avatar (120 CSS px at 2x for high-DPI screens)
+HTML_AVATAR_PX = 240
+
+
+def _url_key(url: str) -> str:
+    return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+
+def _ext_for(content_type: str) -> str:
+    ext = content_type.split("/")[-1].split(";")[0].strip().lower() if "/" in content_type else ""
+    if ext == "jpeg":
+        ext = "jpg"
+    return "." + ext if ext and len(ext) < 10 and ext.isalnum() else ""
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def _touch(path: Path) -> None:
+    """Mark a cache file as recently used (eviction is LRU by mtime)."""
+    try:
+        os.utime(path, None)
+    except OSError:
+        pass
+
+
+def _read_meta(url: str) -> Optional[dict]:
+    meta_path = ASSET_CACHE_DIR / "urls" / f"{_url_key(url)}.json"
+    try:
+        with open(meta_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _blob_path(meta: dict) -> Path:
+    return ASSET_CACHE_DIR / "blobs" / f"{meta['sha256']}{meta.get('ext', '')}"
+
+
+def _fetch(url: str) -> Optional[dict]:
+    """Download a URL into the blob store and record its metadata."""
+    try:
+        r = requests.get(url, timeout=FETCH_TIMEOUT_SECONDS)
+    except requests.RequestException:
+        return None
+    if r.status_code != 200 or not r.content:
+        return None
+
+    content_type = r.headers.get("Content-Type", "application/octet-stream")
+    meta = {
+        "url": url,
+        "sha256": hashlib.sha256(r.content).hexdigest(),
+        "content_type": content_type,
+        "ext": _ext_for(content_type),
+        "fetched_at": time.time(),
+    }
+    blob = _blob_path(meta)
+    if not blob.exists():
+        _atomic_write(blob, r.content)
+    _atomic_write(
+        ASSET_CACHE_DIR / "urls" / f"{_url_key(url)}.json",
+        json.dumps(meta).encode("utf-8"),
+    )
+    _enforce_size_limit()
+    return meta
+
+
+def _lookup(url: str) -> Optional[dict]:
+    """Return fresh metadata for a URL, fetching it on a miss or after the TTL."""
+    meta = _read_meta(url)
+    if meta and _blob_path(meta).exists():
+        if time.time() - meta.get("fetched_at", 0) < ASSET_CACHE_TTL_SECONDS:
+            return meta
+        # Expired: refresh, but keep serving the stale copy if the refresh fails
+        return _fetch(url) or meta
+    return _fetch(url)
+
+
+def get_asset(url: str) -> Optional[Path]:
+    """
+    Get the cached file for a remote asset, downloading it only when needed.
+
+    Args:
+        url: http(s) URL of the asset
+
+    Returns:
+        Path to the cached bytes, or None if the asset could not be fetched
+    """
+    if not url or not url.startswith("http"):
+        return None
+    meta = _lookup(url)
+    if meta is None:
+        return None
+    blob = _blob_path(meta)
+    _touch(blob)
+    return blob
+
+
+def get_image_variant(url: str, max_px: int) -> Optional[Path]:
+    """
+    Get a pre-decoded, downsampled and re-encoded copy of a remote image.
+
+    Variants are keyed by content hash, so every URL serving the same image
+    shares one prepared file and the work is done once per cache lifetime.
+    Falls back to the original bytes without Pillow.
+
+    Args:
+        url: http(s) URL of the image
+        max_px: Longest edge of the variant in pixels
+
+    Returns:
+        Path to the prepared JPEG/PNG, or None if the image is unavailable
+    """
+    blob = get_asset(url)
+    if blob is None or not HAS_PIL:
+        return blob
+
+    sha256 = blob.name.split(".")[0]
+    variants_dir = ASSET_CACHE_DIR / "variants"
+    for ext in (".jpg", ".png"):
+        variant = variants_dir / f"{sha256}_{max_px}{ext}"
+        if variant.exists():
+            _touch(variant)
+            return variant
+
+    try:
+        data, ext = encode_for_pdf(blob, max_px)
+    except Exception:
+        return blob
+    variant = variants_dir / f"{sha256}_{max_px}{ext}"
+    _atomic_write(variant, data)
+    _enforce_size_limit()
+    return variant
+
+
+def pdf_image(url: str, width_in: float, dpi: int = PDF_IMAGE_DPI) -> Optional[Path]:
+    """Image variant sized to print `width_in` inches wide at `dpi`."""
+    if not HAS_PIL:
+        return get_asset(url)
+    return get_image_variant(url, pixels_for(width_in, dpi))
+
+
+def pdf_avatar(url: str) -> Optional[Path]:
+    """Avatar variant sized for the PDF header."""
+    return pdf_image(url, PDF_AVATAR_INCHES)
+
+
+def avatar_data_uri(url: str, max_px: int = HTML_AVATAR_PX) -> Optional[str]:
+    """Pre-resized avatar as a data: URI for self-contained HTML (None if unavailable)."""
+    path = get_image_variant(url, max_px)
+    if path is None:
+        return None
+    mime = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+    return f"data:{mime};base64,{base64.b64encode(path.read_bytes()).decode('ascii')}"
+
+
+def _enforce_size_limit() -> None:
+    """Evict least recently used blobs and variants until under ASSET_CACHE_MAX_BYTES."""
+    files = []
+    for sub in ("blobs", "variants"):
+        d = ASSET_CACHE_DIR / sub
+        if d.exists():
+            for p in d.iterdir():
+                if p.is_file() and not p.name.startswith("."):
+                    st = p.stat()
+                    files.append((st.st_mtime, st.st_size, p))
+    total = sum(size for _, size, _ in files)
+    if total <= ASSET_CACHE_MAX_BYTES:
+        return
+
+    # Trim to 90% so we don't evict on every write near the limit
+    target = int(ASSET_CACHE_MAX_BYTES * 0.9)
+    for _, size, p in sorted(files, key=lambda f: f[0]):
+        if total <= target:
+            break
+        try:
+            p.unlink()
+            total -= size
+        except OSError:
+            pass
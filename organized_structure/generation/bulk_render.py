@@ -0,0 +1,223 @@
+"""
+Bulk Portfolio Rendering
+Renders thousands of portfolio JSONs across warm render workers, skipping
+unchanged inputs and resuming from a checkpoint after interruption.
+
+Usage:
+    python bulk_render.py <portfolios_dir | portfolios.jsonl> [--out DIR] [--workers N]
+"""
+
+import os
+import sys
+import json
+import time
+import hashlib
+import argparse
+from collections import Counter, deque
+from concurrent.futures import FIRST_COMPLETED, wait
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple
+
+try:
+    from . import render_pool
+except ImportError:  # executed as a script
+    import render_pool
+
+CHECKPOINT_NAME = ".bulk_render_checkpoint.jsonl"
+# Print a progress line every this many finished documents
+PROGRESS_EVERY = 100
+
+
+def _github_username(line: bytes) -> str:
+    try:
+        return (json.loads(line).get("meta") or {}).get("github_username") or ""
+    except (ValueError, AttributeError):
+        return ""
+
+
+def iter_inputs(source: Path) -> Iterator[Tuple[str, bytes]]:
+    """
+    Yield (base_name, raw JSON bytes) for every portfolio in a directory or JSONL file.
+
+    Directory entries are named after the file stem. JSONL lines are named after
+    their GitHub username, so inserting or removing lines does not rename the
+    others; a username that appears on several lines gets a short hash of each
+    line's content, and a line without a username falls back to its line number.
+    """
+    if source.is_dir():
+        for path in sorted(source.glob("*.json")):
+            yield path.stem, path.read_bytes()
+        return
+
+    # First pass: which usernames are shared by several lines
+    with open(source, "rb") as f:
+        usernames = [_github_username(line) for line in (line.strip() for line in f) if line]
+    counts = Counter(usernames)
+
+    seen, usernames = set(), iter(usernames)
+    with open(source, "rb") as f:
+        for lineno, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            username = next(usernames)
+            if not username:
+                name = f"{lineno:06d}"
+            elif counts[username] > 1:
+                name = f"{username}_{hashlib.sha256(line).hexdigest()[:8]}"
+            else:
+                name = username
+            if name in seen:
+                # Identical duplicate lines (or a username that looks like a line number)
+                name = f"{name}_{lineno:06d}"
+            seen.add(name)
+            yield name, line
+
+
+def input_fingerprint(raw: bytes, renders: List[tuple]) -> str:
+    """Hash of the input document plus the render configuration."""
+    h = hashlib.sha256(raw)
+    h.update(json.dumps(renders).encode("utf-8"))
+    return h.hexdigest()
+
+
+def load_checkpoint(path: Path) -> Dict[str, dict]:
+    """Latest checkpoint record per base name (later lines win)."""
+    done = {}
+    if not path.exists():
+        return done
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # torn last line from an interrupted run
+            done[record["name"]] = record
+    return done
+
+
+def is_up_to_date(record: dict, fingerprint: str) -> bool:
+    return (
+        record is not None
+        and record.get("status") == "ok"
+        and record.get("fingerprint") == fingerprint
+        and all(Path(p).exists() for p in record.get("artifacts", []))
+    )
+
+
+def bulk_render(source: Path, out_dir: Path, renders: List[tuple],
+                workers: int, force: bool = False) -> dict:
+    """
+    Render every portfolio in `source` into `out_dir`.
+
+    Returns:
+        Summary counts and throughput
+    """
+    source = source.resolve()
+    out_dir.mkdir(parents=True, exist_ok=True)
+    # Renderers write generated_htmls/ and generated_pdfs/ relative to the cwd (inherited by workers)
+    os.chdir(out_dir)
+    render_pool.configure(workers=workers)
+    render_pool.warm_render_pool()
+
+    checkpoint_path = out_dir / CHECKPOINT_NAME
+    done = {} if force else load_checkpoint(checkpoint_path)
+    stats = {"rendered": 0, "skipped": 0, "failed": 0}
+    in_flight = deque()
+    max_in_flight = max(1, workers) * 4
+    started = time.perf_counter()
+
+    def report(final: bool = False):
+        elapsed = time.perf_counter() - started
+        rate = stats["rendered"] / elapsed if elapsed > 0 else 0.0
+        prefix = "[bulk_render] done:" if final else "[bulk_render]"
+        print(f"{prefix} rendered={stats['rendered']} skipped={stats['skipped']} failed={stats['failed']} "
+              f"elapsed={elapsed:.1f}s throughput={rate:.1f} docs/s")
+
+    with open(checkpoint_path, "a", encoding="utf-8") as checkpoint:
+        def collect(block_until_one: bool):
+            if not in_flight:
+                return
+            if block_until_one:
+                wait([f for _, _, f in in_flight], return_when=FIRST_COMPLETED)
+            still_running = deque()
+            while in_flight:
+                name, fingerprint, future = in_flight.popleft()
+                if not future.done():
+                    still_running.append((name, fingerprint, future))
+                    continue
+                record = {"name": name, "fingerprint": fingerprint}
+                try:
+                    record.update(status="ok", artifacts=[str(Path(p).resolve()) for p in future.result()])
+                    stats["rendered"] += 1
+                except Exception as e:
+                    record.update(status="error", error=str(e))
+                    stats["failed"] += 1
+                    print(f"[bulk_render] {name} failed: {e}")
+                checkpoint.write(json.dumps(record) + "\n")
+                checkpoint.flush()
+                finished = stats["rendered"] + stats["failed"]
+                if finished % PROGRESS_EVERY == 0:
+                    report()
+            in_flight.extend(still_running)
+
+        for name, raw in iter_inputs(source):
+            fingerprint = input_fingerprint(raw, renders)
+            if is_up_to_date(done.get(name), fingerprint):
+                stats["skipped"] += 1
+                continue
+            try:
+                portfolio = json.loads(raw)
+            except ValueError as e:
+                stats["failed"] += 1
+                print(f"[bulk_render] {name}: invalid JSON ({e})")
+                continue
+
+            while len(in_flight) >= max_in_flight:
+                collect(block_until_one=True)
+            in_flight.append((name, fingerprint, render_pool.submit_variants(portfolio, name, renders)))
+
+        while in_flight:
+            collect(block_until_one=True)
+
+    render_pool.shutdown_render_pool()
+    report(final=True)
+    elapsed = time.perf_counter() - started
+    stats["elapsed_seconds"] = round(elapsed, 3)
+    stats["docs_per_second"] = round(stats["rendered"] / elapsed, 2) if elapsed > 0 else 0.0
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render many portfolio JSONs to HTML/PDF.")
+    parser.add_argument("source", help="Directory of *.json portfolios or a .jsonl file (one portfolio per line)")
+    parser.add_argument("--out", default="bulk_output", help="Output directory (default: bulk_output)")
+    parser.add_argument("--workers", type=int, default=render_pool.RENDER_POOL_WORKERS,
+                        help="Render processes (0 renders inline)")
+    parser.add_argument("--formats", default="html,pdf", help="Comma-separated formats: html,pdf")
+    parser.add_argument("--html-theme", default="professional")
+    parser.add_argument("--pdf-theme", default="minimal")
+    parser.add_argument("--offline", action="store_true",
+                        help="Write self-contained HTML (system fonts, embedded avatar, pruned CSS)")
+    parser.add_argument("--force", action="store_true", help="Ignore the checkpoint and re-render everything")
+    args = parser.parse_args(argv)
+
+    source = Path(args.source)
+    if not source.exists():
+        print(f"❌ Input not found: {source}")
+        return 1
+
+    themes = {"html": args.html_theme, "pdf": args.pdf_theme}
+    renders = [(fmt, themes[fmt]) for fmt in args.formats.split(",") if fmt in themes]
+    if args.offline:
+        renders = [(fmt, theme, {"offline": True}) if fmt == "html" else (fmt, theme) for fmt, theme in renders]
+    if not renders:
+        print("❌ --formats must include html and/or pdf")
+        return 1
+
+    stats = bulk_render(source, Path(args.out).resolve(), renders, args.workers, force=args.force)
+    return 1 if stats["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
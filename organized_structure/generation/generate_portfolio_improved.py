@@ -16,10 +16,10 @@ try:
     HAS_JOBLIB = True
 except ImportError:
     HAS_JOBLIB = False
-    print("Warning: joblib not installed, using pickle")
 
 # Import label mappings
 import sys
+import logging
 MODEL_DIR = Path(__file__).parent.parent / "models"
 sys.path.insert(0, str(MODEL_DIR))
 from label_mappings import (
@@ -28,6 +28,15 @@ from label_mappings import (
     BEHAVIOR_DESCRIPTIONS
 )
 
+try:
+    from .log_config import get_logger
+except ImportError:  # imported as a top-level module
+    from log_config import get_logger
+
+logger = get_logger(__name__)
+if not HAS_JOBLIB:
+    logger.warning("joblib not installed, using pickle")
+
 # Model paths
 BEHAVIOR_MODEL_PATH = MODEL_DIR / "behavior_classifier.pkl"
 SKILLS_MODEL_PATH = MODEL_DIR / "skills_classifier.pkl"
@@ -38,16 +47,15 @@ def load_models() -> Dict[str, Any]:
     """Load trained ML models from pickle files."""
     models = {}
     
-    print(f"\n🔍 Model Directory: {MODEL_DIR}")
-    print(f"   Directory exists: {MODEL_DIR.exists()}")
-    if MODEL_DIR.exists():
-        print(f"   Contents: {list(MODEL_DIR.iterdir())}")
+    # The directory listing is only worth its syscalls when someone reads it
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Model directory: %s (exists=%s)", MODEL_DIR, MODEL_DIR.exists())
+        if MODEL_DIR.exists():
+            logger.debug("Model directory contents: %s", [p.name for p in MODEL_DIR.iterdir()])
     
     try:
         # Behavior Model
-        print(f"\n📦 Loading Behavior Model...")
-        print(f"   Path: {BEHAVIOR_MODEL_PATH}")
-        print(f"   Exists: {BEHAVIOR_MODEL_PATH.exists()}")
+        logger.debug("Loading behavior model from %s", BEHAVIOR_MODEL_PATH)
         
         if BEHAVIOR_MODEL_PATH.exists():
             try:
@@ -57,27 +65,25 @@ def load_models() -> Dict[str, Any]:
                 else:
                     with open(BEHAVIOR_MODEL_PATH, 'rb') as f:
                         models['behavior'] = pickle.load(f)
-                print(f"   ✓ Loaded successfully - Type: {type(models['behavior']).__name__}")
+                logger.debug("Loaded behavior model: %s", type(models['behavior']).__name__)
             except Exception as e:
-                print(f"   ❌ Failed to load: {e}")
+                logger.warning("Failed to load behavior model: %s", e)
                 # Try alternative method
                 try:
                     if HAS_JOBLIB:
                         with open(BEHAVIOR_MODEL_PATH, 'rb') as f:
                             models['behavior'] = pickle.load(f)
-                        print(f"   ✓ Loaded with pickle fallback")
+                        logger.info("Loaded behavior model with pickle fallback")
                     else:
                         models['behavior'] = None
                 except:
                     models['behavior'] = None
         else:
-            print(f"   ⚠ File not found")
+            logger.warning("Behavior model not found: %s", BEHAVIOR_MODEL_PATH)
             models['behavior'] = None
         
         # Skills Model
-        print(f"\n📦 Loading Skills Model...")
-        print(f"   Path: {SKILLS_MODEL_PATH}")
-        print(f"   Exists: {SKILLS_MODEL_PATH.exists()}")
+        logger.debug("Loading skills model from %s", SKILLS_MODEL_PATH)
         
         if SKILLS_MODEL_PATH.exists():
             try:
@@ -87,27 +93,25 @@ def load_models() -> Dict[str, Any]:
                 else:
                     with open(SKILLS_MODEL_PATH, 'rb') as f:
                         models['skills'] = pickle.load(f)
-                print(f"   ✓ Loaded successfully - Type: {type(models['skills']).__name__}")
+                logger.debug("Loaded skills model: %s", type(models['skills']).__name__)
             except Exception as e:
-                print(f"   ❌ Failed to load: {e}")
+                logger.warning("Failed to load skills model: %s", e)
                 # Try alternative method
                 try:
                     if HAS_JOBLIB:
                         with open(SKILLS_MODEL_PATH, 'rb') as f:
                             models['skills'] = pickle.load(f)
-                        print(f"   ✓ Loaded with pickle fallback")
+                        logger.info("Loaded skills model with pickle fallback")
                     else:
                         models['skills'] = None
                 except:
                     models['skills'] = None
         else:
-            print(f"   ⚠ File not found")
+            logger.warning("Skills model not found: %s", SKILLS_MODEL_PATH)
             models['skills'] = None
         
         # Ranking Model
-        print(f"\n📦 Loading Ranking Model...")
-        print(f"   Path: {RANKING_MODEL_PATH}")
-        print(f"   Exists: {RANKING_MODEL_PATH.exists()}")
+        logger.debug("Loading ranking model from %s", RANKING_MODEL_PATH)
         
         if RANKING_MODEL_PATH.exists():
             try:
@@ -117,32 +121,30 @@ def load_models() -> Dict[str, Any]:
                 else:
                     with open(RANKING_MODEL_PATH, 'rb') as f:
                         models['ranking'] = pickle.load(f)
-                print(f"   ✓ Loaded successfully - Type: {type(models['ranking']).__name__}")
+                logger.debug("Loaded ranking model: %s", type(models['ranking']).__name__)
             except Exception as e:
-                print(f"   ❌ Failed to load: {e}")
+                logger.warning("Failed to load ranking model: %s", e)
                 # Try alternative method
                 try:
                     if HAS_JOBLIB:
                         with open(RANKING_MODEL_PATH, 'rb') as f:
                             models['ranking'] = pickle.load(f)
-                        print(f"   ✓ Loaded with pickle fallback")
+                        logger.info("Loaded ranking model with pickle fallback")
                     else:
                         models['ranking'] = None
                 except:
                     models['ranking'] = None
         else:
-            print(f"   ⚠ File not found")
+            logger.warning("Ranking model not found: %s", RANKING_MODEL_PATH)
             models['ranking'] = None
             
-    except Exception as e:
-        print(f"❌ Error in load_models: {e}")
-        import traceback
-        traceback.print_exc()
+    except Exception:
+        logger.exception("Error in load_models")
     
-    print(f"\n📊 Model Loading Summary:")
-    print(f"   Behavior: {'✓ Loaded' if models.get('behavior') else '✗ Not loaded'}")
-    print(f"   Skills: {'✓ Loaded' if models.get('skills') else '✗ Not loaded'}")
-    print(f"   Ranking: {'✓ Loaded' if models.get('ranking') else '✗ Not loaded'}")
+    logger.info("Models loaded: behavior=%s skills=%s ranking=%s",
+                models.get('behavior') is not None,
+                models.get('skills') is not None,
+                models.get('ranking') is not None)
     
     return models
 
@@ -190,17 +192,14 @@ def predict_behavior_profile(behavior_features: pd.DataFrame, model: Any) -> Dic
                 'all': all_behaviors
             }
             
-            print(f"✓ Behavior predicted: {primary_type}" + 
-                  (f" + {', '.join(secondary_traits)}" if secondary_traits else ""))
+            logger.debug("Behavior predicted: %s (secondary: %s)", primary_type, secondary_traits)
             
             return profile
         else:
             raise ValueError("Model does not have predict method")
         
-    except Exception as e:
-        print(f"❌ Error in behavior prediction: {e}")
-        import traceback
-        traceback.print_exc()
+    except Exception:
+        logger.exception("Error in behavior prediction")
         raise  # Re-raise to force model usage
 
 
@@ -228,7 +227,7 @@ def extract_skills(skills_features: Dict[str, Any], model: Any, top_n: int = 10)
             all_langs = skills_features.get('languages', {})
         
         if not all_langs:
-            print("⚠ No language data available for skills prediction")
+            logger.warning("No language data available for skills prediction")
             return []
         
         # Get language names and their usage counts
@@ -361,17 +360,15 @@ def extract_skills(skills_features: Dict[str, Any], model: Any, top_n: int = 10)
             # Decode using the proper label mappings from training
             selected_skills = decode_skills_predictions(skill_output, top_n=top_n)
             
-            print(f"✓ Skills predicted by model: {selected_skills}")
+            logger.debug("Skills predicted by model: %s", selected_skills)
             
             # Return model predictions directly - NO FALLBACKS
             return selected_skills[:top_n]
         else:
             raise ValueError("Model does not have predict method")
         
-    except Exception as e:
-        print(f"❌ Error in skills prediction: {e}")
-        import traceback
-        traceback.print_exc()
+    except Exception:
+        logger.exception("Error in skills prediction")
         raise  # Re-raise to force model usage
 
 
@@ -405,7 +402,7 @@ def rank_repositories(repos_df: pd.DataFrame, ranking_features: pd.DataFrame, mo
         # "languages_total_size... bigger the value the better"
         # "languages_total_count... bigger the value the better"
         
-        print(f"\n🏆 Ranking {len(repos_df)} repositories by importance scores...")
+        logger.debug("Ranking %d repositories by importance scores", len(repos_df))
         
         # Calculate importance score for each repo based on your priorities
         repo_scores = []
@@ -453,11 +450,13 @@ def rank_repositories(repos_df: pd.DataFrame, ranking_features: pd.DataFrame, mo
         repo_scores = np.array(repo_scores)
         top_indices = np.argsort(repo_scores)[::-1][:top_n]
         
-        print(f"✓ Ranked {len(repo_scores)} repositories by importance")
-        print(f"  Top repos (prioritizing: stars > forks > watchers > commits > recency):")
-        for i in top_indices[:min(5, len(top_indices))]:
-            repo = repos_df.iloc[i]
-            print(f"    {repo['name']}: ⭐{int(repo.get('stars', 0))} 🍴{int(repo.get('forks', 0))} 👁{int(repo.get('watchers', 0))} 💻{int(repo.get('total_commits', 0))} → score: {repo_scores[i]:.3f}")
+        # Per-repo detail costs an iloc lookup per row, so build it only for DEBUG
+        if logger.isEnabledFor(logging.DEBUG):
+            for i in top_indices[:min(5, len(top_indices))]:
+                repo = repos_df.iloc[i]
+                logger.debug("Top repo %s: stars=%d forks=%d watchers=%d commits=%d score=%.3f",
+                             repo['name'], int(repo.get('stars', 0)), int(repo.get('forks', 0)),
+                             int(repo.get('watchers', 0)), int(repo.get('total_commits', 0)), repo_scores[i])
         
         return top_indices.tolist()
         
@@ -480,8 +479,8 @@ def rank_repositories(repos_df: pd.DataFrame, ranking_features: pd.DataFrame, mo
         else:
             raise ValueError("Ranking model does not have predict or rank method")
         
-    except Exception as e:
-        print(f"❌ Error in repository ranking: {e}")
+    except Exception:
+        logger.exception("Error in repository ranking")
         raise  # Re-raise to force model usage
 
 
@@ -499,7 +498,7 @@ def generate_portfolio_improved(user_data: Dict[str, Any], repos_df: pd.DataFram
     Returns:
         Portfolio dictionary ready for rendering
     """
-    print("\n🤖 Generating portfolio with ML models...")
+    logger.debug("Generating portfolio with ML models")
     
     # Load ML models
     models = load_models()
@@ -561,7 +560,7 @@ def generate_portfolio_improved(user_data: Dict[str, Any], repos_df: pd.DataFram
         
         # FILTER 2: Skip empty or archived repos (always)
         if repo.get('isEmpty', False) or repo.get('isArchived', False):
-            print(f"  ⊗ Skipping empty/archived repo: {repo['name']}")
+            logger.debug("Skipping empty/archived repo: %s", repo['name'])
             continue
         
         # SMART FILTER FOR FORKS:
@@ -572,19 +571,19 @@ def generate_portfolio_improved(user_data: Dict[str, Any], repos_df: pd.DataFram
         if is_fork:
             # Keep forked repos with >100 stars (popular contributions)
             if repo_stars > 100:
-                print(f"  ✓ Including popular forked repo: {repo['name']} ({repo_stars} stars)")
+                logger.debug("Including popular forked repo: %s (%d stars)", repo['name'], repo_stars)
             # Or keep forked repos with significant commits from user
             elif not is_owned:
                 # Skip forks of repos we don't own with low stars
-                print(f"  ⊗ Skipping forked repo (not owned, low stars): {repo['name']}")
+                logger.debug("Skipping forked repo (not owned, low stars): %s", repo['name'])
                 continue
             else:
-                print(f"  ⊗ Skipping forked repo: {repo['name']}")
+                logger.debug("Skipping forked repo: %s", repo['name'])
                 continue
         
         # Skip repos not owned by user (unless they have high stars)
         if not is_owned and repo_stars < 100:
-            print(f"  ⊗ Skipping repo not owned by user: {repo_name} (owner: {owner})")
+            logger.debug("Skipping repo not owned by user: %s (owner: %s)", repo_name, owner)
             continue
         
         # Find commit count for this repo
@@ -656,10 +655,9 @@ def generate_portfolio_improved(user_data: Dict[str, Any], repos_df: pd.DataFram
         }
     }
     
-    print(f"✓ Portfolio generated successfully for {user_data.get('login', 'user')}")
-    print(f"  - Skills: {len(skills)} identified")
-    print(f"  - Projects: {len(top_projects)} selected")
-    print(f"  - Behavior: {behavior_profile.get('type', 'N/A')}")
+    logger.info("Portfolio generated for %s: skills=%d projects=%d behavior=%s",
+                user_data.get('login', 'user'), len(skills), len(top_projects),
+                behavior_profile.get('type', 'N/A'))
     
     return portfolio
 
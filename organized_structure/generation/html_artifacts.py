@@ -0,0 +1,203 @@
+"""
+HTML Artifacts
+Minified HTML written once with gzip / brotli sidecars, so serving never compresses
+"""
+
+import os
+import re
+import gzip
+from pathlib import Path
+from typing import Dict, Optional
+
+try:
+    import brotli
+    HAS_BROTLI = True
+except ImportError:
+    HAS_BROTLI = False
+
+# Sidecar suffix per Content-Encoding, in server preference order
+SIDECAR_SUFFIXES = {"br": ".br", "gzip": ".gz"}
+BROTLI_QUALITY = int(os.environ.get("HTML_BROTLI_QUALITY", "11"))
+
+# Elements whose content must keep its whitespace byte-for-byte
+_RAW_BLOCK = re.compile(r"(<(pre|textarea|script)\b.*?</\2\s*>)", re.IGNORECASE | re.DOTALL)
+_STYLE_BLOCK = re.compile(r"(<style\b[^>]*>)(.*?)(</style\s*>)", re.IGNORECASE | re.DOTALL)
+# Plain comments go; conditional comments and the preview's <!--block:...--> markers stay
+_COMMENT = re.compile(r"<!--(?!\[if|\s*/?block:).*?-->", re.DOTALL)
+_CSS_COMMENT = re.compile(r"/\*.*?\*/", re.DOTALL)
+_CSS_PUNCTUATION = re.compile(r"\s*([{};,>])\s*")
+# Only the space after a colon: "a :hover" (descendant) differs from "a:hover"
+_CSS_COLON = re.compile(r":\s+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def minify_css(css: str) -> str:
+    """Drop comments and the whitespace around CSS punctuation."""
+    css = _CSS_COMMENT.sub("", css)
+    css = _WHITESPACE.sub(" ", css)
+    css = _CSS_PUNCTUATION.sub(r"\1", css)
+    css = _CSS_COLON.sub(":", css)
+    return css.replace(";}", "}").strip()
+
+
+def _minify_markup(html: str) -> str:
+    html = _COMMENT.sub("", html)
+    html = _STYLE_BLOCK.sub(lambda m: m.group(1) + minify_css(m.group(2)) + m.group(3), html)
+    # Browsers render any whitespace run as one space, so collapsing is lossless
+    return _WHITESPACE.sub(" ", html)
+
+
+def minify_html(html: str) -> str:
+    """
+    Collapse whitespace runs, strip comments and minify inline CSS.
+
+    <pre>, <textarea> and <script> contents are left untouched.
+    """
+    parts = _RAW_BLOCK.split(html)
+    out = []
+    # split() with two groups yields [text, raw_block, tag_name, text, ...]
+    for i in range(0, len(parts), 3):
+        out.append(_minify_markup(parts[i]))
+        if i + 1 < len(parts):
+            out.append(parts[i + 1])
+    return "".join(out).strip()
+
+
+_CLASS_ATTR = re.compile(r'\sclass\s*=\s*"([^"]*)"', re.IGNORECASE)
+_ID_ATTR = re.compile(r'\sid\s*=\s*"([^"]*)"', re.IGNORECASE)
+_TAG = re.compile(r"<([a-zA-Z][a-zA-Z0-9-]*)")
+# Pseudo-classes/elements never decide whether an element exists (":not(...)" is dropped whole)
+_PSEUDO = re.compile(r"::?[a-zA-Z-]+(\([^)]*\))?")
+_SELECTOR_CLASS = re.compile(r"\.([a-zA-Z_-][\w-]*)")
+_SELECTOR_ID = re.compile(r"#([a-zA-Z_-][\w-]*)")
+_SELECTOR_TYPE = re.compile(r"(?:^|[\s>+~])([a-zA-Z][a-zA-Z0-9-]*)")
+
+
+def _selector_can_match(selector: str, classes, ids, tags) -> bool:
+    """Conservative check: False only if the selector names a class, id or tag the page lacks."""
+    if "[" in selector:
+        return True  # attribute selectors are not analysed
+    bare = _PSEUDO.sub("", selector)
+    return (
+        all(c in classes for c in _SELECTOR_CLASS.findall(bare))
+        and all(i in ids for i in _SELECTOR_ID.findall(bare))
+        and all(t.lower() in tags for t in _SELECTOR_TYPE.findall(bare))
+    )
+
+
+def _split_rules(css: str):
+    """Yield (prelude, body) for each top-level rule of minified CSS."""
+    i, n = 0, len(css)
+    while i < n:
+        start = css.find("{", i)
+        if start < 0:
+            return
+        depth, j = 1, start + 1
+        while j < n and depth:
+            depth += {"{": 1, "}": -1}.get(css[j], 0)
+            j += 1
+        yield css[i:start].strip(), css[start + 1:j - 1]
+        i = j
+
+
+def prune_css(css: str, html: str) -> str:
+    """
+    Keep only the rules of (minified) CSS that can apply to `html`.
+
+    Rules inside @media are pruned the same way; other at-rules are kept.
+    """
+    classes = {c for value in _CLASS_ATTR.findall(html) for c in value.split()}
+    ids = set(_ID_ATTR.findall(html))
+    tags = {t.lower() for t in _TAG.findall(html)}
+
+    def prune(block: str) -> str:
+        kept = []
+        for prelude, body in _split_rules(block):
+            if prelude.startswith("@media"):
+                inner = prune(body)
+                if inner:
+                    kept.append(f"{prelude}{{{inner}}}")
+            elif prelude.startswith("@"):
+                kept.append(f"{prelude}{{{body}}}")
+            else:
+                selectors = [s for s in prelude.split(",") if _selector_can_match(s.strip(), classes, ids, tags)]
+                if selectors:
+                    kept.append(f"{','.join(selectors)}{{{body}}}")
+        return "".join(kept)
+
+    return prune(css)
+
+
+def inline_critical_css(html: str) -> str:
+    """Minify every <style> block and drop the rules the page cannot use."""
+    return _STYLE_BLOCK.sub(
+        lambda m: m.group(1) + prune_css(minify_css(m.group(2)), html) + m.group(3), html
+    )
+
+
+def sidecar_path(path, encoding: str) -> Path:
+    path = Path(path)
+    return path.with_name(path.name + SIDECAR_SUFFIXES[encoding])
+
+
+def write_html_artifact(path, html: str, minify: bool = True) -> str:
+    """
+    Write an HTML file plus its .gz (and .br when brotli is installed) sidecars.
+
+    Returns:
+        The path written
+    """
+    data = (minify_html(html) if minify else html).encode("utf-8")
+    with open(path, "wb") as f:
+        f.write(data)
+    # mtime=0 keeps the gzip bytes identical for identical HTML
+    with open(sidecar_path(path, "gzip"), "wb") as f:
+        f.write(gzip.compress(data, compresslevel=9, mtime=0))
+    if HAS_BROTLI:
+        with open(sidecar_path(path, "br"), "wb") as f:
+            f.write(brotli.compress(data, mode=brotli.MODE_TEXT, quality=BROTLI_QUALITY))
+    return str(path)
+
+
+def fresh_sidecars(path) -> Dict[str, Path]:
+    """Sidecars of an HTML file that are at least as new as the file itself."""
+    path = Path(path)
+    mtime = path.stat().st_mtime_ns
+    sidecars = {}
+    for encoding in SIDECAR_SUFFIXES:
+        candidate = sidecar_path(path, encoding)
+        if candidate.exists() and candidate.stat().st_mtime_ns >= mtime:
+            sidecars[encoding] = candidate
+    return sidecars
+
+
+def negotiate_encoding(accept_encoding: Optional[str], available) -> Optional[str]:
+    """
+    Pick the preferred encoding the client accepts (RFC 9110 q-values).
+
+    Args:
+        accept_encoding: Raw Accept-Encoding header
+        available: Encodings there is a sidecar for
+
+    Returns:
+        "br", "gzip" or None for identity
+    """
+    if not accept_encoding:
+        return None
+    accepted = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[name.strip().lower()] = q
+    best = None
+    for encoding in SIDECAR_SUFFIXES:
+        q = accepted.get(encoding, accepted.get("*", 0.0))
+        if encoding in available and q > 0 and (best is None or q > best[1]):
+            best = (encoding, q)
+    return best[0] if best else None
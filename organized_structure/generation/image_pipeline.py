@@ -0,0 +1,59 @@
+"""
+Image Pipeline
+Downsamples images to their print size and re-encodes them once for PDF embedding
+"""
+
+import io
+import math
+from pathlib import Path
+from typing import Tuple
+
+from PIL import Image as PILImage
+
+# Resolution images are prepared for; 150 DPI is sharp on screen and in print
+PDF_IMAGE_DPI = 150
+JPEG_QUALITY = 85
+
+
+def pixels_for(inches: float, dpi: int = PDF_IMAGE_DPI) -> int:
+    """Pixel length needed to fill `inches` at `dpi`."""
+    return max(1, int(math.ceil(inches * dpi)))
+
+
+def _has_transparency(im: PILImage.Image) -> bool:
+    if im.mode in ("RGBA", "LA"):
+        alpha = im.getchannel("A")
+        return alpha.getextrema()[0] < 255
+    return im.mode == "P" and "transparency" in im.info
+
+
+def encode_for_pdf(src: Path, max_px: int) -> Tuple[bytes, str]:
+    """
+    Downsample an image to at most `max_px` on its longest edge and re-encode it.
+
+    Opaque images become baseline JPEG, which ReportLab embeds as-is (DCTDecode)
+    instead of decoding and re-compressing the pixels on every build. Images
+    with real transparency stay PNG so their edges render correctly.
+
+    Args:
+        src: Path to the original image
+        max_px: Longest edge of the output in pixels
+
+    Returns:
+        Tuple of (encoded bytes, file extension including the dot)
+    """
+    with PILImage.open(src) as im:
+        im.draft("RGB", (max_px, max_px))  # cheap JPEG downscale while decoding
+        im.load()
+        if im.width > max_px or im.height > max_px:
+            im.thumbnail((max_px, max_px), PILImage.LANCZOS)
+
+        out = io.BytesIO()
+        if _has_transparency(im):
+            im.convert("RGBA").save(out, format="PNG", optimize=True)
+            return out.getvalue(), ".png"
+
+        if im.mode not in ("RGB", "L"):
+            im = im.convert("RGB")
+        im.save(out, format="JPEG", quality=JPEG_QUALITY, optimize=True)
+        return out.getvalue(), ".jpg"
@@ -0,0 +1,219 @@
+"""
+Incremental Rendering
+Per-session render state for the editor: only HTML blocks whose data changed are rendered again,
+and the PDF is only rebuilt when one of its sections changed
+"""
+
+import os
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from reportlab.platypus import SimpleDocTemplate
+
+try:
+    from .asset_cache import pdf_avatar
+    from .html_artifacts import write_html_artifact
+    from .pdf_theme import SECTION_INPUTS, SECTION_ORDER, get_pdf_theme
+    from .render_pdf import filter_behavior_profile
+    from .themes import get_theme_template
+    from .thumbnail import LayoutRecorder, write_thumbnail
+except ImportError:  # executed as a script
+    from asset_cache import pdf_avatar
+    from html_artifacts import write_html_artifact
+    from pdf_theme import SECTION_INPUTS, SECTION_ORDER, get_pdf_theme
+    from render_pdf import filter_behavior_profile
+    from themes import get_theme_template
+    from thumbnail import LayoutRecorder, write_thumbnail
+
+# Editing sessions remembered per process; the least recently used are dropped first
+MAX_RENDER_SESSIONS = int(os.environ.get("MAX_RENDER_SESSIONS", "64"))
+
+# Portfolio fields read by each {% block %} of the HTML themes; unlisted blocks depend on everything
+HTML_BLOCK_INPUTS = {
+    'header': ('name', 'headline', 'location', 'websiteUrl', 'meta', 'avatarUrl'),
+    'summary': ('summary',),
+    'skills': ('skills',),
+    'behavior': ('behavior_profile',),
+    'projects': ('top_projects',),
+    'stats': ('total_stats',),
+    'footer': ('meta',),
+}
+
+
+def section_digest(portfolio: Dict[str, Any], keys: Optional[Tuple[str, ...]], *extra: Any) -> str:
+    """Hash of the portfolio fields a section reads (all fields when keys is None)."""
+    data = portfolio if keys is None else {key: portfolio.get(key) for key in keys}
+    payload = json.dumps([data, extra], sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+class RenderSession:
+    """Last rendered HTML fragments and PDF section digests of one editing session."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        # (theme, section) -> (digest, rendered fragment)
+        self.html_blocks: Dict[Tuple[str, str], Tuple[str, str]] = {}
+        # (theme, section) -> digest of the inputs the PDF was last built from
+        self.pdf_sections: Dict[Tuple[str, str], str] = {}
+        # artifact path -> digest of the file as this session last wrote it
+        self.written: Dict[str, str] = {}
+
+
+_sessions: "OrderedDict[str, RenderSession]" = OrderedDict()
+_sessions_lock = threading.Lock()
+
+
+def get_session(session_id: str) -> RenderSession:
+    """Return the render state for a session, creating it (and evicting old ones) as needed."""
+    with _sessions_lock:
+        session = _sessions.get(session_id)
+        if session is None:
+            session = _sessions[session_id] = RenderSession()
+            while len(_sessions) > MAX_RENDER_SESSIONS:
+                _sessions.popitem(last=False)
+        else:
+            _sessions.move_to_end(session_id)
+        return session
+
+
+def drop_session(session_id: str) -> None:
+    with _sessions_lock:
+        _sessions.pop(session_id, None)
+
+
+def file_digest(path: str) -> Optional[str]:
+    """Hash of a file's bytes, or None when it does not exist."""
+    try:
+        with open(path, 'rb') as f:
+            return hashlib.sha1(f.read()).hexdigest()
+    except FileNotFoundError:
+        return None
+
+
+def _is_current(session: RenderSession, path: str) -> bool:
+    """Whether the file on disk is still the one this session wrote (another worker may have replaced it)."""
+    written = session.written.get(path)
+    return written is not None and written == file_digest(path)
+
+
+def prepare_html_portfolio(portfolio: Dict[str, Any]) -> Dict[str, Any]:
+    """Templating view of a portfolio: empty behavior_profile fields dropped, the input left untouched."""
+    if portfolio.get('behavior_profile'):
+        return dict(portfolio, behavior_profile=filter_behavior_profile(portfolio['behavior_profile']))
+    return portfolio
+
+
+def _fixed_block(fragment: str, marker: Optional[str] = None):
+    """Jinja block function that replays an already rendered fragment (optionally between comment markers)."""
+    def render(context) -> Iterator[str]:
+        if marker:
+            yield f"<!--block:{marker}-->"
+        yield fragment
+        if marker:
+            yield f"<!--/block:{marker}-->"
+    return render
+
+
+def render_html_blocks(session: RenderSession, portfolio: Dict[str, Any],
+                       theme: str = 'professional', mark_blocks: bool = False) -> Tuple[str, List[str]]:
+    """
+    Render a theme, re-rendering only the blocks whose inputs changed.
+
+    Args:
+        session: Render state holding the previous fragments
+        portfolio: Portfolio dict, already prepared for templating
+        theme: HTML theme name
+        mark_blocks: Wrap each block in <!--block:name--> comments so a live preview can swap it
+
+    Returns:
+        (complete HTML, names of the blocks that were rendered again)
+    """
+    template = get_theme_template(theme)
+    variables = {'portfolio': portfolio, 'theme': theme}
+    context = template.new_context(variables)
+    rebuilt = []
+    for name, render_block in template.blocks.items():
+        key = (theme, name)
+        digest = section_digest(portfolio, HTML_BLOCK_INPUTS.get(name))
+        cached = session.html_blocks.get(key)
+        if cached is None or cached[0] != digest:
+            fragment = template.environment.concat(render_block(template.new_context(variables)))
+            cached = session.html_blocks[key] = (digest, fragment)
+            rebuilt.append(name)
+        context.blocks[name] = [_fixed_block(cached[1], name if mark_blocks else None)]
+    # The page frame (head, CSS, layout) is static text around the block fragments
+    return template.environment.concat(template.root_render_func(context)), rebuilt
+
+
+def changed_pdf_sections(session: RenderSession, portfolio: Dict[str, Any], theme: str = 'minimal',
+                         avatar_path: Optional[str] = None) -> List[str]:
+    """
+    Names of the PDF sections whose inputs changed since the session's last render.
+
+    Only the digests are kept: doc.build() splits flowables across pages in place,
+    so a story is always built from fresh build_section() output (about 2 ms a section).
+    """
+    changed = []
+    for name in SECTION_ORDER:
+        key = (theme, name)
+        extra = (str(avatar_path),) if name == 'header' else ()
+        digest = section_digest(portfolio, SECTION_INPUTS[name], *extra)
+        if session.pdf_sections.get(key) != digest:
+            session.pdf_sections[key] = digest
+            changed.append(name)
+    return changed
+
+
+def render_edited(portfolio: Dict[str, Any], session_id: str, base_name: str,
+                  html_theme: str = 'professional', pdf_theme: str = 'minimal') -> Dict[str, Any]:
+    """
+    Render an edited portfolio to HTML and PDF, reusing the session's unchanged HTML blocks.
+
+    Artifacts keep the render_pdf naming (generated_htmls/portfolio_<theme>_<base_name>.html,
+    generated_pdfs/portfolio_<theme>_<base_name>.pdf) and are only rewritten when a section changed
+    or the file is no longer the one this session wrote: edits of a session may land on any pool
+    worker, each with its own session state, so a file may have been replaced by another worker.
+
+    Returns:
+        Dict with html_path, pdf_path and the rebuilt section names per format
+    """
+    session = get_session(session_id)
+    html_portfolio = prepare_html_portfolio(portfolio)
+
+    avatar_path = None
+    if portfolio.get('avatarUrl'):
+        try:
+            avatar_path = pdf_avatar(portfolio['avatarUrl'])
+        except Exception:
+            avatar_path = None
+
+    os.makedirs('generated_htmls', exist_ok=True)
+    os.makedirs('generated_pdfs', exist_ok=True)
+    html_filename = os.path.join('generated_htmls', f"portfolio_{html_theme}_{base_name}.html")
+    pdf_filename = os.path.join('generated_pdfs', f"portfolio_{pdf_theme}_{base_name}.pdf")
+
+    with session.lock:
+        html_content, html_rebuilt = render_html_blocks(session, html_portfolio, html_theme)
+        if html_rebuilt or not _is_current(session, html_filename):
+            write_html_artifact(html_filename, html_content)
+            session.written[html_filename] = file_digest(html_filename)
+
+        pdf_rebuilt = changed_pdf_sections(session, portfolio, pdf_theme, avatar_path)
+        if pdf_rebuilt or not _is_current(session, pdf_filename):
+            theme = get_pdf_theme(pdf_theme)
+            story = theme.build_story(portfolio, avatar_path)
+            doc = SimpleDocTemplate(pdf_filename, pagesize=theme.pagesize, **theme.margins)
+            layout = LayoutRecorder(doc)
+            doc.build(story)
+            write_thumbnail(pdf_filename, layout)
+            session.written[pdf_filename] = file_digest(pdf_filename)
+
+    return {
+        'html_path': html_filename,
+        'pdf_path': pdf_filename,
+        'rebuilt': {'html': html_rebuilt, 'pdf': pdf_rebuilt},
+    }
@@ -0,0 +1,116 @@
+"""
+Logging Setup
+Namespaced loggers with per-module levels, optional JSON output and a
+background writer thread so request threads never block on stdout
+"""
+
+import os
+import sys
+import json
+import queue
+import atexit
+import logging
+import logging.handlers
+import threading
+from typing import Dict, Optional
+
+# Every application logger lives under this namespace ("portfolio.render_pdf", ...)
+LOGGER_NAMESPACE = "portfolio"
+# Default level for the namespace; DEBUG detail is skipped (and never formatted) above DEBUG
+LOG_LEVEL = os.environ.get("LOG_LEVEL", "INFO").upper()
+# Per-module overrides, e.g. "render_pdf=DEBUG,backend=WARNING"
+LOG_LEVELS = os.environ.get("LOG_LEVELS", "")
+# "text" for humans, "json" for log collectors
+LOG_FORMAT = os.environ.get("LOG_FORMAT", "text").lower()
+
+TEXT_FORMAT = "%(asctime)s %(levelname)-7s %(name)s: %(message)s"
+
+_configured = False
+_configure_lock = threading.Lock()
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line; extra={...} fields are included."""
+
+    _RESERVED = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "ts": self.formatTime(record, "%Y-%m-%dT%H:%M:%S"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in self._RESERVED and not key.startswith("_"):
+                payload[key] = value
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(payload, default=str, ensure_ascii=False)
+
+
+def _short_name(name: str) -> str:
+    """Module name without its package path ("organized_structure.generation.render_pdf" -> "render_pdf")."""
+    return name.rsplit(".", 1)[-1]
+
+
+def get_logger(name: str) -> logging.Logger:
+    """
+    Logger for a module, e.g. get_logger(__name__).
+
+    The same module gets the same logger whether it was imported from the
+    package or run as a script.
+    """
+    configure_logging()
+    return logging.getLogger(f"{LOGGER_NAMESPACE}.{_short_name(name)}")
+
+
+def parse_levels(spec: str) -> Dict[str, int]:
+    """Parse "module=LEVEL,..." into {logger name: level}."""
+    levels = {}
+    for item in spec.split(","):
+        module, _, level = item.partition("=")
+        module, level = module.strip(), level.strip().upper()
+        if module and isinstance(logging.getLevelName(level), int):
+            levels[f"{LOGGER_NAMESPACE}.{_short_name(module)}"] = logging.getLevelName(level)
+    return levels
+
+
+def configure_logging(level: Optional[str] = None, fmt: Optional[str] = None, force: bool = False) -> None:
+    """
+    Install the handlers once per process (idempotent unless force=True).
+
+    Records go through a queue to a listener thread that owns the stream, so
+    a slow stdout never stalls the caller.
+    """
+    global _configured, _listener
+    if _configured and not force:
+        return
+    with _configure_lock:
+        if _configured and not force:
+            return
+        if _listener is not None:
+            _listener.stop()
+
+        stream_handler = logging.StreamHandler(sys.stdout)
+        fmt = (fmt or LOG_FORMAT).lower()
+        stream_handler.setFormatter(JsonFormatter() if fmt == "json" else logging.Formatter(TEXT_FORMAT))
+
+        log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+        _listener = logging.handlers.QueueListener(log_queue, stream_handler, respect_handler_level=False)
+        _listener.start()
+
+        namespace = logging.getLogger(LOGGER_NAMESPACE)
+        namespace.handlers[:] = [logging.handlers.QueueHandler(log_queue)]
+        namespace.propagate = False
+        namespace.setLevel((level or LOG_LEVEL).upper())
+        for name, module_level in parse_levels(LOG_LEVELS).items():
+            logging.getLogger(name).setLevel(module_level)
+        _configured = True
+
+
+@atexit.register
+def _flush_logs() -> None:
+    if _listener is not None:
+        _listener.stop()
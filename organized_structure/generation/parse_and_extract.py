@@ -8,6 +8,13 @@ import numpy as np
 from datetime import datetime
 from typing import Dict, List, Any
 
+try:
+    from .log_config import get_logger
+except ImportError:  # imported as a top-level module
+    from log_config import get_logger
+
+logger = get_logger(__name__)
+
 
 def extract_repo_features(repos: List[Dict[str, Any]]) -> pd.DataFrame:
     """
@@ -105,7 +112,7 @@ def extract_repo_features(repos: List[Dict[str, Any]]) -> pd.DataFrame:
             repo_data.append(repo_features)
             
         except Exception as e:
-            print(f"Warning: Error processing repo {repo.get('name', 'unknown')}: {e}")
+            logger.warning("Error processing repo %s: %s", repo.get('name', 'unknown'), e)
             continue
     
     df = pd.DataFrame(repo_data)
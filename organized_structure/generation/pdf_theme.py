@@ -0,0 +1,421 @@
+"""
+PDF Theme
+ReportLab styles, table styles and section layouts built once per process
+"""
+
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.platypus import Paragraph, Spacer, Table, TableStyle, Image
+from reportlab.lib.units import inch
+from reportlab.lib.colors import HexColor
+from reportlab.lib.enums import TA_LEFT, TA_JUSTIFY
+
+# Order in which sections appear in the document
+SECTION_ORDER = ('header', 'summary', 'skills', 'behavior', 'projects', 'stats')
+# Portfolio fields each section reads (the header also depends on the avatar image)
+SECTION_INPUTS = {
+    'header': ('name', 'headline', 'location', 'websiteUrl', 'meta', 'avatarUrl'),
+    'summary': ('summary',),
+    'skills': ('skills',),
+    'behavior': ('behavior_profile',),
+    'projects': ('top_projects',),
+    'stats': ('total_stats',),
+}
+# Upper bound on remembered parsed paragraphs (labels, headings, common skills)
+FRAG_CACHE_SIZE = 4096
+
+
+class PdfTheme:
+    """LaTeX-inspired single-page layout: everything except the portfolio data."""
+
+    pagesize = letter
+    margins = dict(rightMargin=50, leftMargin=50, topMargin=40, bottomMargin=40)
+    font_regular = 'Helvetica'
+    font_bold = 'Helvetica-Bold'
+
+    def __init__(self, name: str = 'minimal'):
+        self.name = name
+        self._frag_cache: Dict[tuple, list] = {}
+        styles = getSampleStyleSheet()
+
+        # LaTeX-inspired color scheme (minimal, professional)
+        self.primary_color = HexColor('#2c3e50')  # Dark blue-gray
+        self.accent_color = HexColor('#34495e')   # Slightly lighter
+        self.text_color = HexColor('#2c3e50')
+        self.light_gray = HexColor('#ecf0f1')
+        self.divider_color = HexColor('#bdc3c7')
+
+        # LaTeX-style typography (left-aligned, compact)
+        self.title_style = ParagraphStyle(
+            'LaTeXTitle',
+            parent=styles['Title'],
+            fontSize=12,
+            spaceAfter=2,
+            textColor=self.primary_color,
+            alignment=TA_LEFT,
+            fontName=self.font_bold,
+            leading=14
+        )
+        self.subtitle_style = ParagraphStyle(
+            'LaTeXSubtitle',
+            parent=styles['Normal'],
+            fontSize=8,
+            spaceAfter=3,
+            textColor=self.accent_color,
+            alignment=TA_LEFT,
+            fontName=self.font_regular,
+            leading=10
+        )
+        self.section_heading_style = ParagraphStyle(
+            'LaTeXSection',
+            parent=styles['Heading1'],
+            fontSize=10,
+            spaceBefore=10,
+            spaceAfter=4,
+            textColor=self.primary_color,
+            fontName=self.font_bold,
+            leading=12,
+            borderWidth=0,
+            borderPadding=0
+        )
+        self.subsection_heading_style = ParagraphStyle(
+            'LaTeXSubsection',
+            parent=styles['Heading2'],
+            fontSize=10,
+            spaceBefore=12,
+            spaceAfter=6,
+            textColor=self.text_color,
+            fontName=self.font_bold,
+            leading=12
+        )
+        self.normal_style = ParagraphStyle(
+            'LaTeXNormal',
+            parent=styles['Normal'],
+            fontSize=8,
+            spaceAfter=4,
+            leading=10,
+            textColor=self.text_color,
+            alignment=TA_JUSTIFY,
+            fontName=self.font_regular
+        )
+        self.contact_style = ParagraphStyle(
+            'LaTeXContact',
+            parent=self.normal_style,
+            fontSize=7,
+            alignment=TA_LEFT,
+            spaceAfter=8,
+            textColor=self.accent_color
+        )
+        self.skill_item_style = ParagraphStyle(
+            'LaTeXSkill',
+            parent=self.normal_style,
+            fontSize=7,
+            spaceAfter=2,
+            leading=9
+        )
+        self.project_title_style = ParagraphStyle(
+            'LaTeXProjectTitle',
+            parent=self.subsection_heading_style,
+            fontSize=9,
+            spaceBefore=6,
+            spaceAfter=2,
+            fontName=self.font_bold
+        )
+        self.project_detail_style = ParagraphStyle(
+            'LaTeXProjectDetail',
+            parent=self.normal_style,
+            fontSize=7,
+            spaceAfter=2,
+            leading=9
+        )
+        # Style specifically for behavior items with more spacing
+        self.behavior_item_style = ParagraphStyle(
+            'LaTeXBehaviorItem',
+            parent=self.project_detail_style,
+            fontSize=7,
+            spaceAfter=6,  # More space after each behavior item
+            leading=10,  # Line height for better readability
+            wordWrap='CJK'  # Better word wrapping to prevent extra spaces
+        )
+        self.summary_style = ParagraphStyle(
+            'LaTeXSummary',
+            parent=self.normal_style,
+            fontSize=8,
+            spaceAfter=8,
+            alignment=TA_JUSTIFY,
+            leading=10
+        )
+
+        # Table styles (TableStyle objects are read-only once applied, so they are shared)
+        self.divider_style = TableStyle([
+            ('LINEBELOW', (0, 0), (-1, -1), 0.5, self.divider_color),
+        ])
+        self.header_table_style = TableStyle([
+            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+            ('ALIGN', (0, 0), (0, 0), 'LEFT'),
+            ('ALIGN', (1, 0), (1, 0), 'LEFT'),
+            ('LEFTPADDING', (0, 0), (0, 0), 0),
+            ('RIGHTPADDING', (0, 0), (0, 0), 0),
+            ('LEFTPADDING', (1, 0), (1, 0), 8),
+            ('TOPPADDING', (0, 0), (-1, -1), 0),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 0),
+        ])
+        self.two_column_style = TableStyle([
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+            ('LEFTPADDING', (0, 0), (-1, -1), 0),
+            ('RIGHTPADDING', (0, 0), (-1, -1), 0),
+            ('TOPPADDING', (0, 0), (-1, -1), 1),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 1),
+        ])
+        self.behavior_table_style = TableStyle([
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+            ('LEFTPADDING', (0, 0), (0, -1), 4),  # Left column padding
+            ('RIGHTPADDING', (0, 0), (0, -1), 20),  # Extra right padding on left column for gap
+            ('LEFTPADDING', (1, 0), (1, -1), 20),  # Extra left padding on right column for gap
+            ('RIGHTPADDING', (1, 0), (1, -1), 4),  # Right column padding
+            ('TOPPADDING', (0, 0), (-1, -1), 4),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
+        ])
+        self.project_table_style = TableStyle([
+            ('ALIGN', (0, 0), (0, -1), 'LEFT'),
+            ('ALIGN', (1, 0), (1, -1), 'LEFT'),
+            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+            ('LEFTPADDING', (0, 0), (-1, -1), 0),
+            ('RIGHTPADDING', (0, 0), (-1, -1), 0),
+            ('TOPPADDING', (0, 0), (-1, -1), 1),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 1),
+        ])
+
+    # ---------- layout helpers ----------
+    def para(self, text: str, style: ParagraphStyle) -> Paragraph:
+        """Paragraph for text that repeats across documents; its markup is parsed once per process."""
+        key = (text, style.name)
+        frags = self._frag_cache.get(key)
+        if frags is not None:
+            return Paragraph(text, style, frags=frags)
+        paragraph = Paragraph(text, style)
+        if len(self._frag_cache) < FRAG_CACHE_SIZE:
+            self._frag_cache[key] = paragraph.frags
+        return paragraph
+
+    def divider(self, height: float = 0.2) -> Table:
+        """Horizontal rule (LaTeX-style)."""
+        rule = Table([['']], colWidths=[6.5*inch], rowHeights=[height])
+        rule.setStyle(self.divider_style)
+        return rule
+
+    def section_heading(self, title: str, space_after: float = 0.05) -> List[Any]:
+        return [
+            self.para(title, self.section_heading_style),
+            self.divider(),
+            Spacer(1, space_after*inch),
+        ]
+
+    @staticmethod
+    def two_columns(cells: List[Any]) -> List[List[Any]]:
+        """Split cells into two columns (first half left), padding the shorter one."""
+        mid_point = (len(cells) + 1) // 2
+        left, right = cells[:mid_point], cells[mid_point:]
+        right = right + [''] * (len(left) - len(right))
+        return [[l, r] for l, r in zip(left, right)]
+
+    # ---------- sections ----------
+    def header_section(self, portfolio: Dict[str, Any], avatar_path: Optional[str] = None) -> List[Any]:
+        """Avatar, name, headline and contact line, followed by the divider."""
+        content = [Spacer(1, 0.05*inch)]
+
+        name_text = portfolio['name']
+        if portfolio.get('headline'):
+            name_text += '<br/>' + portfolio['headline']
+
+        contact_parts = []
+        if portfolio.get('location'):
+            contact_parts.append(portfolio['location'])
+        if portfolio.get('websiteUrl'):
+            contact_parts.append(portfolio['websiteUrl'])
+        if portfolio.get('meta', {}).get('github_username'):
+            contact_parts.append(f"github.com/{portfolio['meta']['github_username']}")
+        if contact_parts:
+            name_text += '<br/>' + ' • '.join(contact_parts)
+
+        avatar_img = None
+        if avatar_path:
+            try:
+                avatar_img = Image(str(avatar_path), width=0.6*inch, height=0.6*inch)
+            except Exception:
+                # Fallback: skip avatar if it can't be loaded
+                avatar_img = None
+
+        if avatar_img:
+            # Avatar on the left, text on the right
+            header_table = Table([[avatar_img, Paragraph(name_text, self.title_style)]],
+                                 colWidths=[0.7*inch, 5.8*inch])
+            header_table.setStyle(self.header_table_style)
+            content.append(header_table)
+        else:
+            content.append(Paragraph(portfolio['name'], self.title_style))
+            if portfolio.get('headline'):
+                content.append(Paragraph(portfolio['headline'], self.subtitle_style))
+            if contact_parts:
+                content.append(Paragraph(' • '.join(contact_parts), self.contact_style))
+
+        content.append(Spacer(1, 0.08*inch))
+        content.append(self.divider(0.3))
+        content.append(Spacer(1, 0.1*inch))
+        return content
+
+    def summary_section(self, summary: Optional[str]) -> List[Any]:
+        """Justified summary, truncated to keep a single page."""
+        if not summary:
+            return []
+        summary_text = summary
+        if len(summary_text) > 200:
+            summary_text = summary_text[:200] + '...'
+        return [Paragraph(summary_text, self.summary_style), Spacer(1, 0.06*inch)]
+
+    def skills_section(self, skills: Optional[List[str]]) -> List[Any]:
+        """Two-column skill list (heading is shown even without skills)."""
+        content = self.section_heading('TECHNICAL SKILLS')
+        if skills:
+            cells = [self.para(f"• {skill}", self.skill_item_style) for skill in skills]
+            skill_table = Table(self.two_columns(cells), colWidths=[3.1*inch, 3.1*inch])
+            skill_table.setStyle(self.two_column_style)
+            content.append(skill_table)
+        content.append(Spacer(1, 0.08*inch))
+        return content
+
+    @staticmethod
+    def behavior_items(behavior_profile: Optional[Dict[str, Any]]) -> List[tuple]:
+        """Non-empty (Label, value) pairs of the behavior profile, whitespace-normalized."""
+        items = []
+        for key, value in (behavior_profile or {}).items():
+            if value is None:
+                continue
+            if isinstance(value, str) and value.strip() == '':
+                continue
+            if isinstance(value, (list, tuple)) and len(value) == 0:
+                continue
+
+            if isinstance(value, (list, tuple)):
+                filtered_list = [str(v).strip() for v in value if v and str(v).strip()]
+                if not filtered_list:
+                    continue
+                formatted_value = ' '.join(', '.join(filtered_list).split())
+            else:
+                formatted_value = ' '.join(str(value).strip().split())
+
+            if formatted_value:
+                items.append((key.replace('_', ' ').title(), formatted_value))
+        return items
+
+    def behavior_section(self, behavior_profile: Optional[Dict[str, Any]]) -> List[Any]:
+        items = self.behavior_items(behavior_profile)
+        if not items:
+            return []
+
+        content = [Spacer(1, 0.1*inch)]  # Extra space before section
+        content.extend(self.section_heading('BEHAVIORAL PROFILE', space_after=0.08))
+        cells = [
+            Paragraph(f"<b>{label}:</b> {value}", self.behavior_item_style)
+            for label, value in items
+        ]
+        behavior_table = Table(self.two_columns(cells), colWidths=[2.8*inch, 2.8*inch], hAlign='LEFT')
+        behavior_table.setStyle(self.behavior_table_style)
+        content.append(behavior_table)
+        content.append(Spacer(1, 0.12*inch))
+        return content
+
+    def project_block(self, proj: Dict[str, Any]) -> List[Any]:
+        """Title plus label/value table for one project."""
+        style = self.project_detail_style
+        content = [Paragraph(f"<b>{proj.get('name', 'Untitled Project')}</b>", self.project_title_style)]
+
+        details = []
+        if proj.get('url'):
+            details.append(('URL:', proj['url']))
+        if proj.get('highlights') and len(proj['highlights']) > 0:
+            highlights = proj['highlights']
+            details.append(('Highlights:', highlights[0] if isinstance(highlights, list) else str(highlights)))
+        if proj.get('forks', 0) > 0:
+            details.append(('Forks:', f"{proj['forks']} forks"))
+        if proj.get('tech') and len(proj['tech']) > 0:
+            details.append(('Technologies:', ', '.join(proj['tech'])))
+        if proj.get('primaryLanguage'):
+            details.append(('Primary Language:', str(proj['primaryLanguage'])))
+        if proj.get('description') and len(str(proj['description'])) > 10:
+            desc_text = str(proj['description'])
+            # Truncate if too long for single page
+            if len(desc_text) > 150:
+                desc_text = desc_text[:150] + '...'
+            details.append(('Description:', desc_text))
+        if proj.get('impact'):
+            details.append(('Impact:', str(proj['impact'])))
+        if proj.get('timeline'):
+            details.append(('Timeline:', str(proj['timeline'])))
+
+        if details:
+            proj_table = Table(
+                [[self.para(label, style), Paragraph(value, style)] for label, value in details],
+                colWidths=[1.2*inch, 5.3*inch],
+            )
+            proj_table.setStyle(self.project_table_style)
+            content.append(proj_table)
+        return content
+
+    def projects_section(self, projects: Optional[List[Dict[str, Any]]]) -> List[Any]:
+        if not projects:
+            return []
+        content = self.section_heading('PROJECTS')
+        for i, proj in enumerate(projects):
+            content.extend(self.project_block(proj))
+            # Spacing between projects (compact)
+            if i < len(projects) - 1:
+                content.append(Spacer(1, 0.06*inch))
+        return content
+
+    def stats_section(self, stats: Optional[Dict[str, Any]]) -> List[Any]:
+        if not stats:
+            return []
+        content = [Spacer(1, 0.06*inch)]
+        content.extend(self.section_heading('STATISTICS'))
+
+        stats_items = []
+        for key, label in (('followers', 'Followers'), ('total_stars', 'Stars'),
+                           ('total_commits', 'Commits'), ('total_forks', 'Forks'),
+                           ('total_pr_reviews', 'PR Reviews'), ('total_issues_solved', 'Issues')):
+            if stats.get(key, 0) > 0:
+                stats_items.append((label, f"{stats[key]:,}"))
+
+        if stats_items:
+            cells = [Paragraph(f"<b>{label}:</b> {value}", self.project_detail_style) for label, value in stats_items]
+            stats_table = Table(self.two_columns(cells), colWidths=[3.1*inch, 3.1*inch])
+            stats_table.setStyle(self.two_column_style)
+            content.append(stats_table)
+        return content
+
+    def build_section(self, name: str, portfolio: Dict[str, Any], avatar_path: Optional[str] = None) -> List[Any]:
+        """Fresh flowables for one section of SECTION_ORDER (doc.build() splits them in place, so build once)."""
+        if name == 'header':
+            return self.header_section(portfolio, avatar_path)
+        builder = getattr(self, f'{name}_section')
+        return builder(portfolio.get(SECTION_INPUTS[name][0]))
+
+    def build_sections(self, portfolio: Dict[str, Any], avatar_path: Optional[str] = None) -> Dict[str, List[Any]]:
+        """Flowables for every section, keyed by SECTION_ORDER names."""
+        return {name: self.build_section(name, portfolio, avatar_path) for name in SECTION_ORDER}
+
+    def build_story(self, portfolio: Dict[str, Any], avatar_path: Optional[str] = None) -> List[Any]:
+        """Complete flowable list for doc.build()."""
+        sections = self.build_sections(portfolio, avatar_path)
+        return [flowable for name in SECTION_ORDER for flowable in sections[name]]
+
+
+@lru_cache(maxsize=None)
+def get_pdf_theme(name: str = 'minimal') -> PdfTheme:
+    """Process-wide theme instance; every PDF theme name currently shares one design."""
+    return PdfTheme(name)
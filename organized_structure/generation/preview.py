@@ -0,0 +1,142 @@
+"""
+Live Preview
+HTML-only rendering for the editor's WebSocket preview: JSON patches in, changed fragments out
+"""
+
+import copy
+import time
+from typing import Any, Dict, List
+
+try:
+    from .incremental import RenderSession, prepare_html_portfolio, render_html_blocks
+except ImportError:  # executed as a script
+    from incremental import RenderSession, prepare_html_portfolio, render_html_blocks
+
+
+class PatchError(ValueError):
+    """Raised when a JSON patch cannot be applied to the portfolio, or its result cannot be rendered."""
+
+
+def _parse_pointer(pointer: str) -> List[str]:
+    """Split an RFC 6901 JSON pointer into unescaped reference tokens."""
+    if pointer == '':
+        return []
+    if not pointer.startswith('/'):
+        raise PatchError(f"invalid JSON pointer: {pointer!r}")
+    return [token.replace('~1', '/').replace('~0', '~') for token in pointer[1:].split('/')]
+
+
+def _list_index(container: list, token: str, allow_end: bool) -> int:
+    if token == '-' and allow_end:
+        return len(container)
+    if not token.isdigit():
+        raise PatchError(f"invalid array index: {token!r}")
+    index = int(token)
+    if index > len(container) or (index == len(container) and not allow_end):
+        raise PatchError(f"array index out of range: {index}")
+    return index
+
+
+def _resolve_parent(doc: Any, tokens: List[str]):
+    target = doc
+    for token in tokens[:-1]:
+        try:
+            target = target[_list_index(target, token, False)] if isinstance(target, list) else target[token]
+        except (KeyError, TypeError):
+            raise PatchError(f"path not found: /{'/'.join(tokens)}")
+    return target, tokens[-1]
+
+
+def apply_patch(doc: Dict[str, Any], operations: List[Dict[str, Any]]) -> None:
+    """
+    Apply RFC 6902 add / remove / replace operations to a document in place.
+
+    Raises:
+        PatchError: If an operation is malformed or its path does not exist
+    """
+    for op in operations:
+        if not isinstance(op, dict):
+            raise PatchError(f"patch operations must be objects, got {type(op).__name__}")
+        kind = op.get('op')
+        path = op.get('path', '')
+        if not isinstance(path, str):
+            raise PatchError(f"invalid JSON pointer: {path!r}")
+        tokens = _parse_pointer(path)
+        if not tokens:
+            raise PatchError("replacing the whole document is not supported; send a full portfolio instead")
+        parent, token = _resolve_parent(doc, tokens)
+
+        if kind == 'add':
+            if isinstance(parent, list):
+                parent.insert(_list_index(parent, token, True), op.get('value'))
+            elif isinstance(parent, dict):
+                parent[token] = op.get('value')
+            else:
+                raise PatchError(f"cannot add into {type(parent).__name__}: {op['path']}")
+        elif kind in ('remove', 'replace'):
+            if isinstance(parent, list):
+                index = _list_index(parent, token, False)
+            elif isinstance(parent, dict) and token in parent:
+                index = token
+            else:
+                raise PatchError(f"path not found: {op['path']}")
+            if kind == 'remove':
+                del parent[index]
+            else:
+                parent[index] = op.get('value')
+        else:
+            raise PatchError(f"unsupported patch op: {kind!r}")
+
+
+class PreviewSession:
+    """One editor connection: the working portfolio plus its rendered HTML blocks."""
+
+    def __init__(self, theme: str = 'professional'):
+        self.theme = theme
+        self.portfolio: Dict[str, Any] = {}
+        self.version = 0
+        self._render_state = RenderSession()
+
+    def _render(self, render_state: RenderSession, portfolio: Dict[str, Any]):
+        try:
+            return render_html_blocks(render_state, prepare_html_portfolio(portfolio),
+                                      self.theme, mark_blocks=True)
+        except Exception as e:
+            # Editor values of the wrong type (a string where the theme loops over a list, ...)
+            raise PatchError(f"portfolio cannot be rendered: {e}") from e
+
+    def load(self, portfolio: Dict[str, Any]) -> Dict[str, Any]:
+        """Start from a full portfolio; returns the complete marked-up document."""
+        working = copy.deepcopy(portfolio)
+        render_state = RenderSession()
+        started = time.perf_counter()
+        html, _ = self._render(render_state, working)
+        self.portfolio, self._render_state = working, render_state
+        self.version += 1
+        return {
+            'type': 'document',
+            'version': self.version,
+            'html': html,
+            'render_ms': round((time.perf_counter() - started) * 1000, 2),
+        }
+
+    def patch(self, operations: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Apply a JSON patch; returns only the blocks whose output changed."""
+        working = copy.deepcopy(self.portfolio)
+        apply_patch(working, operations)
+        started = time.perf_counter()
+        # A failed render must not leave fragments of the rejected portfolio behind
+        previous_blocks = dict(self._render_state.html_blocks)
+        try:
+            _, rebuilt = self._render(self._render_state, working)
+        except PatchError:
+            self._render_state.html_blocks = previous_blocks
+            raise
+        self.portfolio = working
+        self.version += 1
+        return {
+            'type': 'fragments',
+            'version': self.version,
+            'fragments': {name: self._render_state.html_blocks[(self.theme, name)][1] for name in rebuilt},
+            'render_ms': round((time.perf_counter() - started) * 1000, 2),
+        }
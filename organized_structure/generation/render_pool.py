@@ -0,0 +1,280 @@
+"""
+Render Worker Pool
+Long-lived worker processes for CPU-bound HTML/PDF rendering
+"""
+
+import os
+import time
+import threading
+import multiprocessing
+from pathlib import Path
+from concurrent.futures import Future, ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, List, Optional, Sequence
+
+# Number of render processes (0 renders inline in the calling process)
+RENDER_POOL_WORKERS = int(os.environ.get("RENDER_POOL_WORKERS", max(1, (os.cpu_count() or 2) - 1)))
+# Seconds a caller waits for a single render before giving up
+RENDER_TIMEOUT_SECONDS = float(os.environ.get("RENDER_TIMEOUT_SECONDS", "60"))
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+class RenderTimeoutError(Exception):
+    """Raised when a render task does not finish within its timeout."""
+
+
+def _render_module():
+    """The render_pdf module, whether this package was imported or run from a script."""
+    try:
+        from . import render_pdf
+    except ImportError:
+        import render_pdf
+    return render_pdf
+
+
+def _warm_worker() -> None:
+    """Import the rendering stack once per worker process."""
+    import jinja2  # noqa: F401
+    import reportlab.platypus  # noqa: F401
+    from xhtml2pdf import pisa  # noqa: F401
+    render_pdf = _render_module()
+    render_pdf.get_pdf_theme('minimal')
+    try:
+        from .themes import preload_themes
+    except ImportError:
+        from themes import preload_themes
+    preload_themes()
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+def _html_to_pdf_file(html_content: str, pdf_path: str) -> bool:
+    """Convert an xhtml2pdf-friendly HTML string to a PDF file (runs in a worker)."""
+    from xhtml2pdf import pisa
+
+    base_dir = Path(pdf_path).parent
+
+    def link_callback(uri, rel):
+        if uri.startswith("file://"):
+            return uri[7:]
+        if uri.startswith("/") or ":\\" in uri or ":/" in uri:
+            return uri
+        return str((base_dir / uri).resolve())
+
+    with open(pdf_path, "wb") as pdf_file:
+        result = pisa.CreatePDF(src=html_content, dest=pdf_file, encoding="utf-8", link_callback=link_callback)
+    return not result.err
+
+
+def _render_html_task(portfolio_json_path: str, theme: str) -> str:
+    return _render_module().render_html_portfolio(portfolio_json_path, theme=theme)
+
+
+def _render_pdf_task(portfolio_json_path: str, theme: str) -> str:
+    return _render_module().render_pdf_portfolio(portfolio_json_path, theme=theme)
+
+
+def _render_data_task(fmt: str, portfolio: dict, base_name: str, theme: str,
+                      view: Optional[dict] = None) -> str:
+    """Render an in-memory portfolio; fmt is 'html' or 'pdf', view holds max_skills/max_projects."""
+    module = _render_module()
+    renderer = module.render_html_from_data if fmt == 'html' else module.render_pdf_from_data
+    return renderer(portfolio, base_name, theme, **(view or {}))
+
+
+def _render_variants_task(portfolio: dict, base_name: str, renders: Sequence[tuple]) -> List[str]:
+    """Render one portfolio in several (fmt, theme[, view]) variants inside a single worker."""
+    return [_render_data_task(fmt, portfolio, base_name, theme, *view) for fmt, theme, *view in renders]
+
+
+def _render_edited_task(portfolio: dict, session_id: str, base_name: str) -> dict:
+    try:
+        from .incremental import render_edited as render_incremental
+    except ImportError:
+        from incremental import render_edited as render_incremental
+    return render_incremental(portfolio, session_id, base_name)
+
+
+def configure(workers: Optional[int] = None, timeout: Optional[float] = None) -> None:
+    """Override the pool size / default timeout (only before the pool is first used)."""
+    global RENDER_POOL_WORKERS, RENDER_TIMEOUT_SECONDS
+    if _pool is not None:
+        raise RuntimeError("render pool already started")
+    if workers is not None:
+        RENDER_POOL_WORKERS = workers
+    if timeout is not None:
+        RENDER_TIMEOUT_SECONDS = timeout
+
+
+def get_render_pool() -> Optional[ProcessPoolExecutor]:
+    """Return the shared render pool, creating it on first use."""
+    global _pool
+    if RENDER_POOL_WORKERS <= 0:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            # spawn: workers must not inherit the server's threads and sockets
+            _pool = ProcessPoolExecutor(
+                max_workers=RENDER_POOL_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_warm_worker,
+            )
+        return _pool
+
+
+def _discard_pool(pool: ProcessPoolExecutor) -> None:
+    """Replace a broken or stuck pool and kill its workers (a hung render never returns on its own)."""
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    # ProcessPoolExecutor has no public way to stop a running task; snapshot the
+    # worker processes before shutdown() drops the reference
+    processes = list((pool._processes or {}).values())
+    pool.shutdown(wait=False, cancel_futures=True)
+    for process in processes:
+        if process.is_alive():
+            process.terminate()
+
+
+def submit_render(fn: Callable[..., Any], *args: Any, timeout: Optional[float] = None) -> Any:
+    """
+    Run a render task on the pool and wait for its result.
+
+    Args:
+        fn: Module-level (picklable) task function
+        timeout: Seconds to wait, defaults to RENDER_TIMEOUT_SECONDS
+
+    Returns:
+        Whatever the task returns
+
+    Raises:
+        RenderTimeoutError: If the task does not finish in time
+    """
+    pool = get_render_pool()
+    if pool is None:
+        return fn(*args)
+
+    timeout = RENDER_TIMEOUT_SECONDS if timeout is None else timeout
+    pool, future = _submit(pool, fn, *args)
+    return _wait(pool, future, fn.__name__, timeout)
+
+
+def _submit(pool: ProcessPoolExecutor, fn: Callable[..., Any], *args: Any):
+    """Submit to the pool, replacing it once if it is broken."""
+    try:
+        return pool, pool.submit(fn, *args)
+    except BrokenProcessPool:
+        _discard_pool(pool)
+        pool = get_render_pool()
+        return pool, pool.submit(fn, *args)
+
+
+def _wait(pool: ProcessPoolExecutor, future, name: str, timeout: float) -> Any:
+    try:
+        return future.result(timeout=timeout)
+    except FutureTimeoutError:
+        if not future.cancel():
+            # Task is running: retire this pool and kill its workers
+            _discard_pool(pool)
+        raise RenderTimeoutError(f"{name} did not finish within {timeout:.0f}s")
+    except BrokenProcessPool:
+        _discard_pool(pool)
+        raise
+
+
+def render_all(jobs: Sequence[tuple], timeout: Optional[float] = None) -> List[str]:
+    """
+    Render several in-memory portfolios concurrently.
+
+    Args:
+        jobs: (fmt, portfolio, base_name, theme[, view]) tuples, fmt being 'html' or 'pdf'
+            and view an optional dict of max_skills/max_projects limits
+        timeout: Seconds to wait for the whole batch, defaults to RENDER_TIMEOUT_SECONDS
+
+    Returns:
+        Output paths in job order, once every artifact exists
+    """
+    pool = get_render_pool()
+    if pool is None:
+        return [_render_data_task(*job) for job in jobs]
+
+    timeout = RENDER_TIMEOUT_SECONDS if timeout is None else timeout
+    deadline = time.monotonic() + timeout
+    submitted = [_submit(pool, _render_data_task, *job) for job in jobs]
+    return [
+        _wait(job_pool, future, f"render {job[0]}/{job[3]}", max(0.0, deadline - time.monotonic()))
+        for (job_pool, future), job in zip(submitted, jobs)
+    ]
+
+
+def submit_variants(portfolio: dict, base_name: str, renders: Sequence[tuple]) -> Future:
+    """
+    Queue one portfolio for rendering without waiting (used for bulk jobs).
+
+    Args:
+        portfolio: Portfolio dict
+        base_name: Artifact base name
+        renders: (fmt, theme[, view]) tuples to produce
+
+    Returns:
+        Future resolving to the artifact paths, in `renders` order
+    """
+    pool = get_render_pool()
+    if pool is None:
+        future = Future()
+        try:
+            future.set_result(_render_variants_task(portfolio, base_name, renders))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+    return _submit(pool, _render_variants_task, portfolio, base_name, renders)[1]
+
+
+def render_html(portfolio_json_path: str, theme: str = "professional", timeout: Optional[float] = None) -> str:
+    """Render the HTML portfolio in a pool worker."""
+    return submit_render(_render_html_task, str(portfolio_json_path), theme, timeout=timeout)
+
+
+def render_pdf(portfolio_json_path: str, theme: str = "minimal", timeout: Optional[float] = None) -> str:
+    """Render the ReportLab PDF portfolio in a pool worker."""
+    return submit_render(_render_pdf_task, str(portfolio_json_path), theme, timeout=timeout)
+
+
+def render_edited(portfolio: dict, session_id: str, base_name: str, timeout: Optional[float] = None) -> dict:
+    """
+    Re-render an editor session's HTML and PDF, reusing its unchanged sections.
+
+    Session state lives in the worker process that rendered it, so the first
+    edit a worker sees for a session is a full render, and a worker rewrites an
+    artifact whenever another worker has replaced it since its own last write.
+    """
+    return submit_render(_render_edited_task, portfolio, session_id, base_name, timeout=timeout)
+
+
+def html_to_pdf(html_content: str, pdf_path: str, timeout: Optional[float] = None) -> bool:
+    """Convert HTML to PDF with xhtml2pdf in a pool worker."""
+    return submit_render(_html_to_pdf_file, html_content, str(pdf_path), timeout=timeout)
+
+
+def warm_render_pool() -> None:
+    """Start every worker now so the first requests don't pay the import cost."""
+    pool = get_render_pool()
+    if pool is None:
+        return
+    futures = [pool.submit(_ping) for _ in range(RENDER_POOL_WORKERS)]
+    for future in futures:
+        future.result(timeout=RENDER_TIMEOUT_SECONDS)
+
+
+def shutdown_render_pool() -> None:
+    """Stop the worker processes (called on server shutdown)."""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,66 @@
+"""
+HTML Theme Registry
+Jinja templates loaded from templates/, compiled once per process with a persistent bytecode cache
+"""
+
+import os
+import threading
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional, Tuple
+
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, Template
+
+TEMPLATES_DIR = Path(__file__).parent / "templates"
+# Compiled template bytecode survives restarts and is shared by render workers
+BYTECODE_CACHE_DIR = Path(os.environ.get(
+    "JINJA_BYTECODE_CACHE_DIR",
+    Path(__file__).parent.parent / "outputs" / "jinja_cache",
+))
+DEFAULT_THEME = "professional"
+
+_env: Optional[Environment] = None
+_env_lock = threading.Lock()
+
+
+def get_environment() -> Environment:
+    """Return the process-wide Jinja environment."""
+    global _env
+    if _env is None:
+        with _env_lock:
+            if _env is None:
+                BYTECODE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+                _env = Environment(
+                    loader=FileSystemLoader(str(TEMPLATES_DIR)),
+                    bytecode_cache=FileSystemBytecodeCache(str(BYTECODE_CACHE_DIR)),
+                    # Templates only change on deploy; skip the per-render mtime check
+                    auto_reload=False,
+                    cache_size=-1,
+                )
+    return _env
+
+
+@lru_cache(maxsize=None)
+def available_themes() -> Tuple[str, ...]:
+    """Names of the installed themes (one templates/<name>.html each)."""
+    return tuple(sorted(p.stem for p in TEMPLATES_DIR.glob("*.html")))
+
+
+def get_theme_template(theme: str = DEFAULT_THEME) -> Template:
+    """
+    Get the compiled template for a theme.
+
+    Args:
+        theme: Theme name; unknown names use DEFAULT_THEME
+
+    Returns:
+        Compiled jinja2 Template (cached after the first call)
+    """
+    name = theme if theme in available_themes() else DEFAULT_THEME
+    return get_environment().get_template(f"{name}.html")
+
+
+def preload_themes() -> None:
+    """Compile every theme now so the first render has no compile cost."""
+    for name in available_themes():
+        get_theme_template(name)
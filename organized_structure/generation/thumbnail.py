@@ -0,0 +1,163 @@
+"""
+PDF Thumbnails
+Small PNG previews of page 1, stored next to each PDF as <name>.thumb.png
+"""
+
+import os
+from pathlib import Path
+from typing import Any, List, Optional, Tuple
+
+from PIL import Image as PILImage, ImageDraw
+from reportlab.lib.pagesizes import letter
+from reportlab.platypus import Image, Paragraph, Table
+
+try:
+    import fitz  # PyMuPDF rasterizes the real page when it is installed
+    HAS_FITZ = True
+except ImportError:
+    HAS_FITZ = False
+
+# Thumbnail width in pixels (height follows the page aspect ratio)
+THUMBNAIL_WIDTH = int(os.environ.get("PDF_THUMBNAIL_WIDTH", "240"))
+# Sketches are drawn this many times larger, then downsampled for smooth edges
+SUPERSAMPLE = 2
+
+
+def thumbnail_path(pdf_path) -> Path:
+    """Sidecar location of a PDF's thumbnail."""
+    return Path(pdf_path).with_suffix(".thumb.png")
+
+
+class LayoutRecorder:
+    """Records where each flowable lands on page 1 while a doc template builds."""
+
+    def __init__(self, doc):
+        self.doc = doc
+        self.pagesize = doc.pagesize
+        self.items: List[Tuple[Any, float, float]] = []  # (flowable, x, bottom y) in points
+        doc.afterFlowable = self._after_flowable
+
+    def _after_flowable(self, flowable) -> None:
+        if self.doc.page != 1:
+            return
+        frame = self.doc.frame
+        # Frame.add leaves _y below the flowable's spaceAfter
+        x = frame._x + getattr(frame, "_leftExtraIndent", 0)
+        self.items.append((flowable, x, frame._y + flowable.getSpaceAfter()))
+
+
+class _Sketch:
+    """Pillow canvas in PDF point coordinates (origin bottom-left)."""
+
+    def __init__(self, pagesize, width: int):
+        self.page_height = pagesize[1]
+        self.scale = width * SUPERSAMPLE / pagesize[0]
+        self.image = PILImage.new("RGB", (width * SUPERSAMPLE, round(pagesize[1] * self.scale)), "white")
+        self.draw = ImageDraw.Draw(self.image)
+
+    def box(self, x: float, y: float, w: float, h: float) -> Tuple[int, int, int, int]:
+        s = self.scale
+        return (round(x * s), round((self.page_height - y - h) * s),
+                round((x + w) * s), round((self.page_height - y) * s))
+
+    def paragraph(self, para: Paragraph, x: float, y: float) -> None:
+        """One bar per laid-out line, as wide as the line's text."""
+        bl_para = getattr(para, "blPara", None)
+        if bl_para is None:
+            return
+        style = para.style
+        color = _rgb(style.textColor)
+        bar = style.fontSize * 0.55
+        top = y + para.height
+        for i, line in enumerate(bl_para.lines):
+            extra = getattr(line, "extraSpace", None)
+            if extra is None:
+                extra = line[0]
+            width = max(0.0, para.width - extra)
+            if style.alignment == 2:  # right aligned
+                left = x + extra
+            elif style.alignment == 1:  # centred
+                left = x + extra / 2
+            else:
+                left = x
+            baseline = top - (i + 1) * style.leading + (style.leading - style.fontSize)
+            self.draw.rectangle(self.box(left, baseline, width, bar), fill=color)
+
+    def picture(self, img: Image, x: float, y: float) -> None:
+        left, top, right, bottom = self.box(x, y, img.drawWidth, img.drawHeight)
+        try:
+            with PILImage.open(img.filename) as src:
+                self.image.paste(src.convert("RGB").resize((max(1, right - left), max(1, bottom - top))), (left, top))
+        except Exception:
+            self.draw.rectangle((left, top, right, bottom), fill=(220, 224, 228))
+
+    def table(self, table: Table, x: float, y: float) -> None:
+        cols, rows = getattr(table, "_colpositions", None), getattr(table, "_rowpositions", None)
+        if not cols or not rows:
+            return
+        for op, (sc, sr), (ec, er), weight, color, *_ in getattr(table, "_linecmds", []):
+            if op in ("LINEBELOW", "LINEABOVE"):
+                line_y = y if op == "LINEBELOW" else y + table._height
+                left, top, right, _ = self.box(x, line_y, table._width, 0)
+                self.draw.line([(left, top), (right, top)], fill=_rgb(color),
+                               width=max(1, round(weight * self.scale)))
+        for r, row in enumerate(table._cellvalues):
+            for c, value in enumerate(row):
+                style = table._cellStyles[r][c]
+                cell_x = x + cols[c] + style.leftPadding
+                cell_top = y + rows[r] - style.topPadding
+                for flowable in (value if isinstance(value, (list, tuple)) else [value]):
+                    if isinstance(flowable, Paragraph):
+                        self.paragraph(flowable, cell_x, cell_top - flowable.height)
+                        cell_top -= flowable.height
+                    elif isinstance(flowable, Image):
+                        self.picture(flowable, cell_x, cell_top - flowable.drawHeight)
+                        cell_top -= flowable.drawHeight
+
+    def flowable(self, flowable: Any, x: float, y: float) -> None:
+        if isinstance(flowable, Paragraph):
+            self.paragraph(flowable, x, y)
+        elif isinstance(flowable, Table):
+            self.table(flowable, x, y)
+        elif isinstance(flowable, Image):
+            self.picture(flowable, x, y)
+
+    def save(self, target: Path, width: int) -> None:
+        height = round(self.image.height / SUPERSAMPLE)
+        self.image.resize((width, height), PILImage.LANCZOS).save(target, "PNG", optimize=True)
+
+
+def _rgb(color) -> Tuple[int, int, int]:
+    if color is None:
+        return (0, 0, 0)
+    return tuple(round(channel * 255) for channel in color.rgb())
+
+
+def write_thumbnail(pdf_path, layout: Optional[LayoutRecorder] = None,
+                    width: int = THUMBNAIL_WIDTH) -> Optional[Path]:
+    """
+    Write the page-1 thumbnail for a PDF.
+
+    PyMuPDF rasterizes the actual page when installed; otherwise the layout
+    recorded during doc.build() is sketched (text lines as bars, real avatar).
+
+    Returns:
+        Thumbnail path, or None if no thumbnail could be produced
+    """
+    target = thumbnail_path(pdf_path)
+    try:
+        if HAS_FITZ:
+            with fitz.open(str(pdf_path)) as pdf:
+                page = pdf[0]
+                zoom = width / page.rect.width
+                page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False).save(str(target))
+            return target
+        if layout is None:
+            return None
+        sketch = _Sketch(layout.pagesize or letter, width)
+        for flowable, x, y in layout.items:
+            sketch.flowable(flowable, x, y)
+        sketch.save(target, width)
+        return target
+    except Exception:
+        return None
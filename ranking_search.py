@@ -0,0 +1,137 @@
+"""
+Ranking Model Search
+Successive-halving search over XGBoost parameters for the ranking regressor
+
+Every candidate starts on a small boosting-round budget; after each rung only
+the best 1/eta (by validation RMSE, with early stopping) go on to an eta-times
+larger budget, until the survivors train on the full budget. Candidates of a
+rung train in parallel processes that split the CPU budget, on matrices that
+were preprocessed once (and are memory-mapped into the workers by joblib).
+"""
+
+import os
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+from joblib import Parallel, delayed
+from scipy.stats import loguniform, randint, uniform
+from sklearn.model_selection import ParameterSampler
+from xgboost import XGBRegressor
+
+# Configuration the ranking model used before tuning; always candidate 0, so
+# the search compares every sampled configuration against it
+BASELINE_PARAMS: Dict[str, object] = {
+    'max_depth': 6,
+    'learning_rate': 0.05,
+    'subsample': 0.9,
+    'colsample_bytree': 0.9,
+    'min_child_weight': 1.0,
+    'reg_lambda': 1.0,
+}
+
+SEARCH_SPACE = {
+    'max_depth': randint(3, 11),
+    'learning_rate': loguniform(0.01, 0.3),
+    'subsample': uniform(0.6, 0.4),
+    'colsample_bytree': uniform(0.5, 0.5),
+    'min_child_weight': loguniform(1.0, 20.0),
+    'reg_lambda': loguniform(0.1, 10.0),
+}
+
+EARLY_STOPPING_ROUNDS = 50
+
+
+def _cpu_count(n_jobs: int) -> int:
+    """n_jobs as a CPU count (-1 or 0: all CPUs)."""
+    return (os.cpu_count() or 1) if n_jobs <= 0 else n_jobs
+
+
+def _fit_candidate(params: Dict, rounds: int, X_train, y_train, X_val, y_val,
+                   base: Dict, n_threads: int) -> Dict:
+    started = time.perf_counter()
+    model = XGBRegressor(
+        **base, **params,
+        n_estimators=rounds,
+        early_stopping_rounds=EARLY_STOPPING_ROUNDS,
+        eval_metric='rmse',
+        n_jobs=n_threads,
+    )
+    model.fit(X_train, y_train, eval_set=[(X_val, y_val)], verbose=False)
+    return {
+        'params': params,
+        'rounds': rounds,
+        'best_iteration': int(model.best_iteration),
+        'val_rmse': float(model.best_score),
+        'seconds': time.perf_counter() - started,
+    }
+
+
+def successive_halving(X_train, y_train, X_val, y_val,
+                       n_candidates: int = 27, max_rounds: int = 1000, eta: int = 3,
+                       n_jobs: int = -1, random_state: int = 42,
+                       base_params: Optional[Dict] = None,
+                       space: Optional[Dict] = None) -> Dict:
+    """
+    Search XGBoost parameters by successive halving on a fixed validation set.
+
+    Args:
+        X_train, y_train: Preprocessed training matrix and target
+        X_val, y_val: Preprocessed validation matrix and target (early stopping and ranking)
+        n_candidates: Configurations sampled (BASELINE_PARAMS included)
+        max_rounds: Boosting-round budget of the final rung
+        eta: Keep 1/eta of the candidates per rung, multiply the budget by eta
+        n_jobs: CPUs to use (-1: all)
+        random_state: Seed for sampling and for every model
+        base_params: Fixed XGBRegressor arguments (objective, tree_method, device, ...)
+        space: Parameter distributions (SEARCH_SPACE when None)
+
+    Returns:
+        Dict with best_params, best_rounds (boosting rounds at the best validation
+        score), best_val_rmse, the per-rung results and the search's wall-clock seconds
+    """
+    started = time.perf_counter()
+    base = {'objective': 'reg:squarederror', 'tree_method': 'hist',
+            'random_state': random_state, **(base_params or {})}
+    sampled = ParameterSampler(space or SEARCH_SPACE, n_iter=max(n_candidates - 1, 0),
+                               random_state=random_state)
+    candidates: List[Dict] = [dict(BASELINE_PARAMS)]
+    candidates += [{k: (v.item() if isinstance(v, np.generic) else v) for k, v in p.items()}
+                   for p in sampled]
+
+    n_rungs = 1
+    while len(candidates) // eta ** n_rungs >= 1:
+        n_rungs += 1
+    cpus = _cpu_count(n_jobs)
+    # One GPU trains one candidate at a time
+    gpu = str(base.get('device', 'cpu')).startswith('cuda')
+    X_train = np.ascontiguousarray(X_train, dtype=np.float32)
+    X_val = np.ascontiguousarray(X_val, dtype=np.float32)
+
+    rungs = []
+    for rung in range(n_rungs):
+        rounds = max(1, int(round(max_rounds / eta ** (n_rungs - 1 - rung))))
+        workers = 1 if gpu else min(len(candidates), cpus)
+        threads = max(1, cpus // workers)
+        results = Parallel(n_jobs=workers)(
+            delayed(_fit_candidate)(p, rounds, X_train, y_train, X_val, y_val, base, threads)
+            for p in candidates
+        )
+        results.sort(key=lambda r: r['val_rmse'])
+        rungs.append({'rounds': rounds, 'results': results})
+        print(f"   Rung {rung + 1}/{n_rungs}: {len(results)} candidates x {rounds} rounds, "
+              f"best val RMSE {results[0]['val_rmse']:.5f}")
+        candidates = [r['params'] for r in results[:max(1, len(results) // eta)]]
+
+    best = rungs[-1]['results'][0]
+    return {
+        'best_params': best['params'],
+        'best_rounds': best['best_iteration'] + 1,
+        'best_val_rmse': best['val_rmse'],
+        'n_candidates': len(rungs[0]['results']),
+        'eta': eta,
+        'max_rounds': max_rounds,
+        'cpus': cpus,
+        'rungs': rungs,
+        'wall_seconds': time.perf_counter() - started,
+    }
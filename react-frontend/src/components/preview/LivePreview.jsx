@@ -1,9 +1,34 @@
 import { useState, useEffect, useRef, useMemo } from 'react';
 import { User, Star, GitFork, Users, RefreshCw } from 'lucide-react';
+import api from '../../services/api';
+
+// JSON pointer token for a top-level portfolio key (RFC 6901 escaping)
+const pointer = (key) => `/${key.replace(/~/g, '~0').replace(/\//g, '~1')}`;
+
+// RFC 6902 ops turning one portfolio into the next, one per changed top-level field
+const diffPortfolio = (previous, next) => {
+  const ops = [];
+  Object.keys(next).forEach((key) => {
+    if (!(key in previous)) {
+      ops.push({ op: 'add', path: pointer(key), value: next[key] });
+    } else if (JSON.stringify(previous[key]) !== JSON.stringify(next[key])) {
+      ops.push({ op: 'replace', path: pointer(key), value: next[key] });
+    }
+  });
+  Object.keys(previous).forEach((key) => {
+    if (!(key in next)) ops.push({ op: 'remove', path: pointer(key) });
+  });
+  return ops;
+};
 
 export default function LivePreview({ portfolio }) {
   const iframeRef = useRef(null);
   const [isRefreshing, setIsRefreshing] = useState(false);
+  // Server-rendered theme preview over /ws/preview; the local template below is the fallback
+  const previewRef = useRef(null);
+  const sentPortfolioRef = useRef(null);
+  const portfolioRef = useRef(portfolio);
+  portfolioRef.current = portfolio;
 
   // Generate HTML from portfolio data
   const generateHTML = () => {
@@ -301,29 +326,89 @@ export default function LivePreview({ portfolio }) {
     `;
   };
 
+  // The socket handler outlives renders, so it reads the current template through a ref
+  const generateHTMLRef = useRef(generateHTML);
+  generateHTMLRef.current = generateHTML;
+
   const serializedPortfolio = useMemo(
     () => JSON.stringify(portfolio || {}),
     [portfolio]
   );
 
+  const getIframeDoc = () =>
+    iframeRef.current &&
+    (iframeRef.current.contentDocument || iframeRef.current.contentWindow.document);
+
+  const writeDocument = (html) => {
+    const iframeDoc = getIframeDoc();
+    if (!iframeDoc) return;
+    iframeDoc.open();
+    iframeDoc.write(html);
+    iframeDoc.close();
+  };
+
+  const isPreviewOpen = () =>
+    previewRef.current && previewRef.current.socket.readyState === WebSocket.OPEN;
+
+  // Send the whole portfolio (first render, refresh, or after the server rejected a patch)
+  const loadPreview = () => {
+    sentPortfolioRef.current = portfolioRef.current;
+    previewRef.current.load(portfolioRef.current);
+  };
+
+  // Open the preview channel once; edits are sent as patches and only changed blocks come back
+  useEffect(() => {
+    const preview = api.openPreview((message) => {
+      if (message.type === 'document') {
+        writeDocument(message.html);
+      } else if (message.type === 'fragments') {
+        const iframeDoc = getIframeDoc();
+        if (iframeDoc) api.applyPreviewFragments(iframeDoc, message.fragments);
+      } else if (message.type === 'error') {
+        console.warn('[LivePreview] Preview error:', message.detail);
+        // The server kept its last good portfolio; show the local render until the next edit
+        sentPortfolioRef.current = null;
+        writeDocument(generateHTMLRef.current());
+      }
+    });
+    previewRef.current = preview;
+    preview.socket.onopen = () => {
+      if (portfolioRef.current) loadPreview();
+    };
+    preview.socket.onclose = () => {
+      // A remount may already have opened the next channel
+      if (previewRef.current !== preview) return;
+      previewRef.current = null;
+      sentPortfolioRef.current = null;
+    };
+    return () => preview.close();
+  }, []);
+
   // Update iframe content when portfolio changes
   useEffect(() => {
-    if (iframeRef.current) {
-      const html = generateHTML();
-      const iframeDoc = iframeRef.current.contentDocument || iframeRef.current.contentWindow.document;
-      iframeDoc.open();
-      iframeDoc.write(html);
-      iframeDoc.close();
+    if (!portfolio) return;
+    if (!isPreviewOpen()) {
+      writeDocument(generateHTML());
+      return;
+    }
+    if (!sentPortfolioRef.current) {
+      loadPreview();
+      return;
+    }
+    const ops = diffPortfolio(sentPortfolioRef.current, portfolio);
+    if (ops.length > 0) {
+      sentPortfolioRef.current = portfolio;
+      previewRef.current.patch(ops);
     }
   }, [serializedPortfolio]);
 
   const handleRefresh = () => {
     setIsRefreshing(true);
-    const html = generateHTML();
-    const iframeDoc = iframeRef.current.contentDocument || iframeRef.current.contentWindow.document;
-    iframeDoc.open();
-    iframeDoc.write(html);
-    iframeDoc.close();
+    if (isPreviewOpen()) {
+      loadPreview();
+    } else {
+      writeDocument(generateHTML());
+    }
     setTimeout(() => setIsRefreshing(false), 500);
   };
 
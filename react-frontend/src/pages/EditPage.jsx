@@ -9,7 +9,7 @@ import {
   FileText,
   ExternalLink,
 } from "lucide-react";
-import { useQuery, useMutation } from "@tanstack/react-query";
+import { useQuery } from "@tanstack/react-query";
 import { usePortfolio } from "../hooks/usePortfolio";
 import api from "../services/api";
 import ProfileEditor from "../components/editor/ProfileEditor";
@@ -74,26 +74,8 @@ export default function EditPage() {
     retry: false,
   });
 
-  // Regenerate mutation for quick downloads
-  const regenerateMutation = useMutation({
-    mutationFn: () => {
-      // Use current portfolio state directly (has latest edits)
-      if (!portfolio) {
-        throw new Error("No portfolio data found");
-      }
-      // Save current portfolio first
-      if (hasChanges) {
-        saveToLocalStorage(username, portfolio);
-      }
-      // Use the current portfolio state directly
-      return api.generateFromEdited(portfolio);
-    },
-    onSuccess: () => {
-      refetchOutputs();
-    },
-  });
-
-  // Handle quick download - regenerate on backend with current edited data, then download
+  // Handle quick download - regenerate on backend with current edited data, then download.
+  // This is the only place the editor builds the PDF; the live preview is HTML-only over /ws/preview.
   const handleQuickDownload = useCallback(
     async (type) => {
       // Use the current portfolio state directly (has latest edits)
@@ -340,7 +322,17 @@ export default function EditPage() {
                       rel="noopener noreferrer"
                       className="px-3 py-1.5 bg-zinc-800 hover:bg-zinc-700 border border-zinc-700 text-white rounded text-xs flex items-center gap-1.5 transition-all"
                     >
-                      <ExternalLink className="w-3 h-3" />
+                      {/* First-page PNG instead of loading the whole PDF */}
+                      {outputs.pdf_thumbnail_url ? (
+                        <img
+                          src={api.getThumbnailUrl(outputs.pdf_thumbnail_url)}
+                          alt="PDF first page"
+                          loading="lazy"
+                          className="h-6 w-auto rounded-sm border border-zinc-700 bg-white"
+                        />
+                      ) : (
+                        <ExternalLink className="w-3 h-3" />
+                      )}
                       PDF
                     </a>
                   )}
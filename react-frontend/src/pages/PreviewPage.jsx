@@ -273,7 +273,17 @@ export default function PreviewPage() {
                     rel="noopener noreferrer"
                     className="px-4 py-2 bg-zinc-800 hover:bg-zinc-700 border border-zinc-700 text-white rounded-lg flex items-center gap-2 transition-all text-sm"
                   >
-                    <ExternalLink className="w-4 h-4" />
+                    {/* First-page PNG instead of loading the whole PDF */}
+                    {outputs.pdf_thumbnail_url ? (
+                      <img
+                        src={api.getThumbnailUrl(outputs.pdf_thumbnail_url)}
+                        alt="PDF first page"
+                        loading="lazy"
+                        className="h-10 w-auto rounded border border-zinc-700 bg-white"
+                      />
+                    ) : (
+                      <ExternalLink className="w-4 h-4" />
+                    )}
                     View PDF
                   </a>
                 )}
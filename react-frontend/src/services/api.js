@@ -96,6 +96,55 @@ export const api = {
   getViewUrl: (path) => {
     return `${API_BASE}/view?path=${encodeURIComponent(path)}`;
   },
+
+  // Get a PDF's first-page thumbnail (pass pdf_thumbnail_url from a response for an immutable, cacheable URL)
+  getThumbnailUrl: (pathOrThumbnailUrl) => {
+    if (pathOrThumbnailUrl.startsWith("/thumbnail?")) {
+      return `${API_BASE}${pathOrThumbnailUrl}`;
+    }
+    return `${API_BASE}/thumbnail?path=${encodeURIComponent(pathOrThumbnailUrl)}`;
+  },
+
+  // Open the live HTML preview channel (PDF is only generated on export)
+  openPreview: (onMessage) => {
+    const socket = new WebSocket(`${API_BASE.replace(/^http/, "ws")}/ws/preview`);
+    socket.onmessage = (event) => onMessage(JSON.parse(event.data));
+    const send = (message) => {
+      if (socket.readyState === WebSocket.OPEN) {
+        socket.send(JSON.stringify(message));
+      }
+    };
+    return {
+      socket,
+      // Send the full portfolio; the reply is {type: "document", html}
+      load: (portfolio) => send({ type: "load", portfolio }),
+      // Send RFC 6902 ops; the reply is {type: "fragments", fragments: {block: html}}
+      patch: (ops) => send({ type: "patch", patch: ops }),
+      close: () => socket.close(),
+    };
+  },
+
+  // Swap changed blocks into a preview document (delimited by <!--block:name--> comments)
+  applyPreviewFragments: (doc, fragments) => {
+    const walker = doc.createTreeWalker(doc.documentElement, NodeFilter.SHOW_COMMENT);
+    const starts = {};
+    const ends = {};
+    while (walker.nextNode()) {
+      const match = /^(\/?)block:(\w+)$/.exec(walker.currentNode.nodeValue);
+      if (match) (match[1] ? ends : starts)[match[2]] = walker.currentNode;
+    }
+    Object.entries(fragments).forEach(([name, html]) => {
+      const start = starts[name];
+      const end = ends[name];
+      if (!start || !end) return;
+      while (start.nextSibling && start.nextSibling !== end) {
+        start.parentNode.removeChild(start.nextSibling);
+      }
+      const range = doc.createRange();
+      range.setStartAfter(start);
+      start.parentNode.insertBefore(range.createContextualFragment(html), end);
+    });
+  },
 };
 
 export default api;
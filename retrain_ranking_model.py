@@ -2,8 +2,26 @@
 Retrain Ranking Model with Direct Priority Metrics
 This script retrains the ranking model to naturally prioritize:
 - Stars, Watchers, Forks, Commits, and Recency
+
+Full mode (default) searches the XGBoost parameters and trains from scratch.
+Incremental mode starts from the latest registered model version and learns
+only from rows it has not seen: the scaler's running statistics absorb the new
+rows, then boosting continues on them (or, with --refresh, the existing trees'
+leaf values are re-fitted on all rows). Both modes publish a new version to the
+model registry and the live organized_structure/models/ranking_xgboost.pkl.
+
+Usage:
+    python retrain_ranking_model.py [--data CSV]
+    python retrain_ranking_model.py --incremental [--rounds N | --refresh] [--compare]
 """
 
+import os
+import sys
+import copy
+import json
+import time
+import argparse
+
 import pandas as pd
 import numpy as np
 from sklearn.model_selection import train_test_split
@@ -11,61 +29,19 @@ from sklearn.preprocessing import StandardScaler
 from sklearn.impute import SimpleImputer
 from sklearn.pipeline import Pipeline
 from sklearn.compose import ColumnTransformer
+from sklearn.metrics import mean_squared_error, r2_score
+import xgboost as xgb
 from xgboost import XGBRegressor
-import joblib
-
-# ============================================================================
-# STEP 1: Load Your GitHub User Data
-# ============================================================================
-print("📂 Loading data...")
-
-# Load the training data collected by collect_training_data.py
-try:
-    df = pd.read_csv('github_training_data.csv')
-    print("✅ Data loaded from github_training_data.csv!")
-except FileNotFoundError:
-    print("❌ ERROR: github_training_data.csv not found!")
-    print("\n📝 Please run: python collect_training_data.py first")
-    print("   This will collect GitHub data and create the training dataset.")
-    exit(1)
-
-print(f"   Shape: {df.shape}")
-print(f"   Columns: {list(df.columns)}")
-
-# Verify required columns exist
-required_cols = ['stars', 'watchers', 'forks', 'total_commits', 'days_since_update']
-missing_cols = [col for col in required_cols if col not in df.columns]
-
-if missing_cols:
-    print(f"\n❌ ERROR: Missing required columns: {missing_cols}")
-    print("   Please ensure github_training_data.csv has all required columns.")
-    exit(1)
-
-print(f"✅ All required columns present: {required_cols}")
-
-# ============================================================================
-# STEP 2: Create NEW Rank Target with Your Priorities
-# ============================================================================
-print("\n🎯 Creating new rank_target with priority metrics...")
-
-def robust01(x):
-    """Normalize to 0-1 range using robust scaling"""
-    q25, q75 = x.quantile([0.25, 0.75])
-    iqr = q75 - q25
-    if iqr == 0:
-        return (x - x.min()) / (x.max() - x.min() + 1e-9)
-    return np.clip((x - q25) / (iqr * 1.5), 0, 1)
 
-# Normalize each priority metric
-normalized_stars = robust01(df['stars'])
-normalized_watchers = robust01(df['watchers'])
-normalized_forks = robust01(df['forks'])
-normalized_commits = robust01(df['total_commits'])
+import model_registry
+from ranking_search import successive_halving
 
-# Recency score (higher = more recent)
-# Invert days_since_update so recent repos score higher
-df['recency_score'] = 1.0 / (1.0 + df['days_since_update'] / 30.0)
-normalized_recency = robust01(df['recency_score'])
+REGISTRY_NAME = "ranking_xgboost"
+REQUIRED_COLS = ['stars', 'watchers', 'forks', 'total_commits', 'days_since_update']
+# Columns identifying a row across collections, in order of preference
+KEY_COLS = ['nameWithOwner', 'url', 'id']
+# Boosting rounds added per incremental update
+DEFAULT_INCREMENTAL_ROUNDS = 50
 
 # Calculate NEW rank_target with YOUR priority weights
 NEW_WEIGHTS = {
@@ -76,147 +52,490 @@ NEW_WEIGHTS = {
     'recency': 0.10,       # 10% - Recent activity bonus
 }
 
-df['rank_target'] = (
-    NEW_WEIGHTS['stars'] * normalized_stars +
-    NEW_WEIGHTS['forks'] * normalized_forks +
-    NEW_WEIGHTS['watchers'] * normalized_watchers +
-    NEW_WEIGHTS['commits'] * normalized_commits +
-    NEW_WEIGHTS['recency'] * normalized_recency
-)
 
-print("✅ New rank_target created!")
-print(f"   Weights: {NEW_WEIGHTS}")
-print(f"   Target stats - Mean: {df['rank_target'].mean():.4f}, Std: {df['rank_target'].std():.4f}")
-print(f"   Target range: [{df['rank_target'].min():.4f}, {df['rank_target'].max():.4f}]")
-
-# ============================================================================
-# STEP 3: Prepare Features
-# ============================================================================
-print("\n🔧 Preparing features...")
+def robust01_params(x):
+    """Offset, span and clipping robust01 uses for x (JSON-serializable, stored with each version)"""
+    q25, q75 = x.quantile([0.25, 0.75])
+    iqr = q75 - q25
+    if iqr == 0:
+        return {"offset": float(x.min()), "span": float(x.max() - x.min() + 1e-9), "clip": False}
+    return {"offset": float(q25), "span": float(iqr * 1.5), "clip": True}
 
-# Drop target and ID columns
-drop_cols = ['rank_target', 'recency_score']
-if 'id' in df.columns:
-    drop_cols.append('id')
 
-X = df.drop(columns=[c for c in drop_cols if c in df.columns]).copy()
-y = df['rank_target'].values
+def robust01(x, params=None):
+    """Normalize to 0-1 range using robust scaling (params: frozen robust01_params of an earlier table)"""
+    params = params or robust01_params(x)
+    scaled = (x - params["offset"]) / params["span"]
+    return np.clip(scaled, 0, 1) if params["clip"] else scaled
 
-print(f"✅ Features prepared!")
-print(f"   Features: {X.shape[1]}")
-print(f"   Samples: {X.shape[0]}")
 
 # ============================================================================
-# STEP 4: Split Data
+# STEP 1: Load Your GitHub User Data
 # ============================================================================
-print("\n✂️ Splitting data...")
+def load_data(path):
+    """Load the training CSV written by collect_training_data.py (exits if unusable)."""
+    print("📂 Loading data...")
+
+    # Load the training data collected by collect_training_data.py
+    try:
+        df = pd.read_csv(path)
+        print(f"✅ Data loaded from {path}!")
+    except FileNotFoundError:
+        print(f"❌ ERROR: {path} not found!")
+        print("\n📝 Please run: python collect_training_data.py first")
+        print("   This will collect GitHub data and create the training dataset.")
+        sys.exit(1)
+
+    print(f"   Shape: {df.shape}")
+    print(f"   Columns: {list(df.columns)}")
+
+    # Verify required columns exist
+    missing_cols = [col for col in REQUIRED_COLS if col not in df.columns]
+    if missing_cols:
+        print(f"\n❌ ERROR: Missing required columns: {missing_cols}")
+        print(f"   Please ensure {path} has all required columns.")
+        sys.exit(1)
+
+    print(f"✅ All required columns present: {REQUIRED_COLS}")
+    return df
 
-X_train, X_test, y_train, y_test = train_test_split(
-    X, y, test_size=0.2, random_state=42
-)
-
-print(f"✅ Split completed!")
-print(f"   Training: {X_train.shape}")
-print(f"   Test: {X_test.shape}")
 
 # ============================================================================
-# STEP 5: Create and Train Pipeline
+# STEP 2: Create NEW Rank Target with Your Priorities
 # ============================================================================
-print("\n🚀 Training XGBoost Ranker with new target...")
-
-# Get numeric columns
-num_features = list(X.columns)
-
-# Preprocessing pipeline
-preprocessor = ColumnTransformer([
-    ("num", Pipeline([
-        ("impute", SimpleImputer(strategy="median")),
-        ("scale", StandardScaler(with_mean=False))
-    ]), num_features)
-])
-
-# XGBoost with optimized parameters for your priorities
-xgb_model = XGBRegressor(
-    objective="reg:squarederror",
-    tree_method="hist",
-    n_estimators=600,
-    max_depth=6,
-    learning_rate=0.05,
-    subsample=0.9,
-    colsample_bytree=0.9,
-    random_state=42,
-    importance_type='gain'
-)
-
-# Complete pipeline
-pipeline = Pipeline([
-    ("prep", preprocessor),
-    ("model", xgb_model)
-])
-
-# Train the model
-pipeline.fit(X_train, y_train)
-
-print("✅ Training completed!")
+def add_rank_target(df, normalization=None):
+    """
+    Add recency_score and rank_target.
+
+    Each metric is normalized with robust01 over the whole table, or with the
+    frozen `normalization` of an earlier version (incremental updates), so rows
+    already learned keep their targets when new rows arrive.
+
+    Returns:
+        (df, the normalization used per metric)
+    """
+    print("\n🎯 Creating new rank_target with priority metrics...")
+
+    # Recency score (higher = more recent)
+    # Invert days_since_update so recent repos score higher
+    df['recency_score'] = 1.0 / (1.0 + df['days_since_update'] / 30.0)
+
+    metrics = {'stars': 'stars', 'watchers': 'watchers', 'forks': 'forks',
+               'commits': 'total_commits', 'recency': 'recency_score'}
+    if normalization is None:
+        normalization = {name: robust01_params(df[col]) for name, col in metrics.items()}
+        print("   Normalization: quantiles of this table")
+    else:
+        print("   Normalization: frozen from the base version")
+
+    # Normalize each priority metric
+    normalized_stars = robust01(df['stars'], normalization['stars'])
+    normalized_watchers = robust01(df['watchers'], normalization['watchers'])
+    normalized_forks = robust01(df['forks'], normalization['forks'])
+    normalized_commits = robust01(df['total_commits'], normalization['commits'])
+    normalized_recency = robust01(df['recency_score'], normalization['recency'])
+
+    df['rank_target'] = (
+        NEW_WEIGHTS['stars'] * normalized_stars +
+        NEW_WEIGHTS['forks'] * normalized_forks +
+        NEW_WEIGHTS['watchers'] * normalized_watchers +
+        NEW_WEIGHTS['commits'] * normalized_commits +
+        NEW_WEIGHTS['recency'] * normalized_recency
+    )
+
+    print("✅ New rank_target created!")
+    print(f"   Weights: {NEW_WEIGHTS}")
+    print(f"   Target stats - Mean: {df['rank_target'].mean():.4f}, Std: {df['rank_target'].std():.4f}")
+    print(f"   Target range: [{df['rank_target'].min():.4f}, {df['rank_target'].max():.4f}]")
+    return df, normalization
+
 
 # ============================================================================
-# STEP 6: Evaluate Model
+# STEP 3: Prepare Features
 # ============================================================================
-print("\n📊 Evaluating model...")
-
-from sklearn.metrics import mean_squared_error, r2_score
-
-y_pred = pipeline.predict(X_test)
+def prepare_features(df):
+    """Numeric feature frame (booleans as 0/1), target vector and row keys (None without a key column)."""
+    print("\n🔧 Preparing features...")
+
+    # Drop target and ID columns; text columns (names, URLs, descriptions) are not features
+    drop_cols = ['rank_target', 'recency_score'] + [c for c in KEY_COLS if c in df.columns]
+    X = df.drop(columns=[c for c in drop_cols if c in df.columns]).select_dtypes(include=['number', 'bool'])
+    X = X.astype({c: int for c in X.columns if X[c].dtype == bool})
+    y = df['rank_target'].values
+    key_col = next((c for c in KEY_COLS if c in df.columns), None)
+    keys = df[key_col].astype(str) if key_col else None
+
+    print(f"✅ Features prepared!")
+    print(f"   Features: {X.shape[1]}")
+    print(f"   Samples: {X.shape[0]}")
+    print(f"   Row key: {key_col or 'none (incremental mode unavailable)'}")
+    return X, y, keys
+
+
+def make_preprocessor(num_features):
+    return ColumnTransformer([
+        ("num", Pipeline([
+            ("impute", SimpleImputer(strategy="median")),
+            ("scale", StandardScaler(with_mean=False))
+        ]), num_features)
+    ])
+
+
+def evaluate(pipeline, X_test, y_test):
+    """RMSE and R² on a test split (NaN when it is empty)."""
+    if len(X_test) == 0:
+        return float('nan'), float('nan')
+    y_pred = pipeline.predict(X_test)
+    return float(mean_squared_error(y_test, y_pred, squared=False)), float(r2_score(y_test, y_pred))
+
+
+def print_feature_importance(pipeline, feature_names):
+    # Show feature importance
+    print("\n🎯 Top 10 Most Important Features:")
+    importance_df = pd.DataFrame({
+        'feature': feature_names,
+        'importance': pipeline.named_steps['model'].feature_importances_
+    }).sort_values('importance', ascending=False).head(10)
+    print(importance_df.to_string(index=False))
 
-rmse = mean_squared_error(y_test, y_pred, squared=False)
-r2 = r2_score(y_test, y_pred)
-
-print(f"✅ Evaluation Results:")
-print(f"   RMSE: {rmse:.4f}")
-print(f"   R² Score: {r2:.4f}")
-
-# Show feature importance
-print("\n🎯 Top 10 Most Important Features:")
-feature_importance = xgb_model.feature_importances_
-feature_names = X.columns
-importance_df = pd.DataFrame({
-    'feature': feature_names,
-    'importance': feature_importance
-}).sort_values('importance', ascending=False).head(10)
-
-print(importance_df.to_string(index=False))
 
 # ============================================================================
-# STEP 7: Save the Retrained Model
+# STEP 5: Create and Train Pipeline (full retrain)
 # ============================================================================
-print("\n💾 Saving model...")
+def full_retrain(X_train, y_train, params=None):
+    """
+    Train the ranking pipeline from scratch.
+
+    Without `params` the XGBoost parameters are searched first (successive
+    halving on a validation split of the training set).
+
+    Returns:
+        (pipeline, search result or None)
+    """
+    num_features = list(X_train.columns)
+    preprocessor = make_preprocessor(num_features)
+    search = None
+
+    if params is None:
+        # Search the XGBoost parameters on a validation split of the training set
+        # (the preprocessing is fitted once and shared by every candidate)
+        print("🔎 Searching XGBoost parameters (successive halving)...")
+        X_fit, X_val, y_fit, y_val = train_test_split(X_train, y_train, test_size=0.25, random_state=42)
+        preprocessor.fit(X_fit)
+        search = successive_halving(
+            preprocessor.transform(X_fit), y_fit, preprocessor.transform(X_val), y_val,
+            n_candidates=int(os.environ.get("RANK_SEARCH_CANDIDATES", "27")),
+            max_rounds=int(os.environ.get("RANK_SEARCH_MAX_ROUNDS", "1000")),
+            n_jobs=-1,
+            random_state=42,
+        )
+        print(f"✅ Search completed in {search['wall_seconds']:.1f}s on {search['cpus']} CPU(s)")
+        print(f"   Best parameters: {search['best_params']} ({search['best_rounds']} rounds)")
+        params = {"n_estimators": search['best_rounds'], **search['best_params']}
+
+    # XGBoost with the searched parameters
+    xgb_model = XGBRegressor(
+        objective="reg:squarederror",
+        tree_method="hist",
+        **params,
+        random_state=42,
+        importance_type='gain'
+    )
+
+    # Complete pipeline
+    pipeline = Pipeline([
+        ("prep", preprocessor),
+        ("model", xgb_model)
+    ])
+
+    # Train the model
+    pipeline.fit(X_train, y_train)
+    return pipeline, search
 
-# Save to the models directory
-joblib.dump(pipeline, 'organized_structure/models/ranking_xgboost.pkl')
-
-print("✅ Model saved to: organized_structure/models/ranking_xgboost.pkl")
 
 # ============================================================================
-# STEP 8: Test Predictions
+# Incremental update (warm start from the registry)
 # ============================================================================
-print("\n🧪 Testing predictions on sample repos...")
-
-# Get top 10 by true scores
-top_indices = np.argsort(y_test)[-10:][::-1]
-
-print("\nTop 10 Repositories by New Ranking:")
-print("-" * 80)
-for i, idx in enumerate(top_indices, 1):
-    true_score = y_test[idx]
-    pred_score = y_pred[idx]
-    print(f"{i}. True: {true_score:.3f} | Predicted: {pred_score:.3f} | Diff: {abs(true_score-pred_score):.3f}")
-
-print("\n" + "="*80)
-print("✅ RETRAINING COMPLETE!")
-print("="*80)
-print("\n📝 Next Steps:")
-print("1. Remove the hardcoded priority scoring from generate_portfolio_improved.py")
-print("2. Use ONLY the model predictions (base_scores)")
-print("3. Your model now naturally understands: Stars > Forks > Watchers > Commits > Recency")
-print("\n🎯 The model has learned your priorities!")
-
+def rescale_split_thresholds(model, old_scale, new_scale, X_raw):
+    """
+    Copy of a fitted XGBRegressor whose splits route rows as before after a change of input scale.
+
+    A tree tests x / old_scale < t, so each threshold on feature j becomes
+    t * old_scale / new_scale, which routes every input the same way up to float32
+    rounding. Where that rounding would send an observed raw value of X_raw[:, j]
+    to the other branch, the threshold is nudged one float32 step (np.nextafter)
+    past it.
+    """
+    raw = json.loads(model.get_booster().save_raw("json"))
+    values = [np.unique(X_raw[:, j]) for j in range(X_raw.shape[1])]
+    moved = {}
+    for tree in raw["learner"]["gradient_booster"]["model"]["trees"]:
+        conditions = tree["split_conditions"]
+        for node, (left, feature) in enumerate(zip(tree["left_children"], tree["split_indices"])):
+            if left == -1:  # leaves keep their weight in split_conditions
+                continue
+            key = (feature, conditions[node])
+            if key not in moved:
+                t = np.float32(conditions[node])
+                threshold = np.float32(float(t) * old_scale[feature] / new_scale[feature])
+                v = values[feature]
+                n_left = np.searchsorted((v / old_scale[feature]).astype(np.float32), t, side="left")
+                if n_left > 0:
+                    # Largest observed value that went left must stay below the threshold
+                    last_left = np.float32(v[n_left - 1] / new_scale[feature])
+                    if last_left >= threshold:
+                        threshold = np.nextafter(last_left, np.float32(np.inf))
+                if n_left < len(v):
+                    # Smallest observed value that went right must stay at or above it
+                    first_right = np.float32(v[n_left] / new_scale[feature])
+                    if first_right < threshold:
+                        threshold = first_right
+                moved[key] = float(threshold)
+            conditions[node] = moved[key]
+    rescaled = XGBRegressor(**model.get_params())
+    rescaled.load_model(bytearray(json.dumps(raw).encode("utf-8")))
+    return rescaled
+
+
+def warm_start(parent, X_new, y_new, X_all, y_all, rounds=DEFAULT_INCREMENTAL_ROUNDS, refresh=False):
+    """
+    Update a fitted ranking pipeline with new rows instead of retraining it.
+
+    The scaler's running statistics (StandardScaler.partial_fit) take in the new
+    rows and the trees' thresholds are moved to match (see rescale_split_thresholds;
+    X_all, every row seen so far, supplies the observed values); the imputation
+    medians stay as fitted. Then either `rounds` boosting rounds are added on the
+    new rows, or (refresh) every tree keeps its structure and gets leaf values
+    re-fitted on X_all/y_all.
+
+    Returns:
+        The updated copy of the pipeline
+    """
+    pipeline = copy.deepcopy(parent)
+    prep = pipeline.named_steps['prep']
+    features = prep.transformers_[0][2]
+    num = prep.named_transformers_['num']
+    imputer, scaler = num.named_steps['impute'], num.named_steps['scale']
+
+    old_scale = scaler.scale_.copy()
+    scaler.partial_fit(imputer.transform(X_new[features]))
+    model = rescale_split_thresholds(pipeline.named_steps['model'], old_scale, scaler.scale_,
+                                     imputer.transform(X_all[features]))
+
+    if refresh:
+        booster = model.get_booster()
+        params = {k: v for k, v in model.get_xgb_params().items() if v is not None}
+        params.pop("n_jobs", None)
+        params.pop("tree_method", None)  # the refresh updater replaces the tree builder
+        params["seed"] = params.pop("random_state", 0)
+        params.update(process_type="update", updater="refresh", refresh_leaf=True)
+        dall = xgb.DMatrix(prep.transform(X_all[features]), label=y_all)
+        booster = xgb.train(params, dall, num_boost_round=booster.num_boosted_rounds(), xgb_model=booster)
+        model = XGBRegressor(**model.get_params())
+        model.load_model(bytearray(booster.save_raw("json")))
+    else:
+        total = model.get_booster().num_boosted_rounds() + rounds
+        model.set_params(n_estimators=rounds)
+        model.fit(prep.transform(X_new[features]), y_new, xgb_model=model.get_booster())
+        model.set_params(n_estimators=total)
+
+    pipeline.steps[-1] = ("model", model)
+    return pipeline
+
+
+def run_full(args, X, y, keys):
+    # ============================================================================
+    # STEP 4: Split Data
+    # ============================================================================
+    print("\n✂️ Splitting data...")
+
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=0.2, random_state=42
+    )
+
+    print(f"✅ Split completed!")
+    print(f"   Training: {X_train.shape}")
+    print(f"   Test: {X_test.shape}")
+
+    print("\n🚀 Training XGBoost Ranker with new target...")
+    started = time.perf_counter()
+    pipeline, search = full_retrain(X_train, y_train)
+    seconds = time.perf_counter() - started
+    print(f"✅ Training completed in {seconds:.1f}s!")
+
+    # ============================================================================
+    # STEP 6: Evaluate Model
+    # ============================================================================
+    print("\n📊 Evaluating model...")
+    rmse, r2 = evaluate(pipeline, X_test, y_test)
+    print(f"✅ Evaluation Results:")
+    print(f"   RMSE: {rmse:.4f}")
+    print(f"   R² Score: {r2:.4f}")
+    print_feature_importance(pipeline, X.columns)
+
+    record = {
+        "mode": "full",
+        "params": {k: v for k, v in pipeline.named_steps['model'].get_params().items()
+                   if k in ("n_estimators", *search['best_params'])},
+        "n_boosted_rounds": int(pipeline.named_steps['model'].get_booster().num_boosted_rounds()),
+        "rows_trained": len(X_train),
+        "train_seconds": round(seconds, 2),
+        "test_rmse": rmse,
+        "test_r2": r2,
+        "search": {
+            "method": "successive_halving",
+            "n_candidates": search['n_candidates'],
+            "eta": search['eta'],
+            "max_rounds": search['max_rounds'],
+            "best_val_rmse": search['best_val_rmse'],
+            "cpus": search['cpus'],
+            "wall_seconds": round(search['wall_seconds'], 2),
+        },
+    }
+    train_keys = keys.loc[X_train.index] if keys is not None else None
+    return pipeline, record, train_keys, (X_test, y_test)
+
+
+def run_incremental(args, X, y, keys):
+    parent_record = model_registry.latest(REGISTRY_NAME)
+    seen = model_registry.trained_keys(REGISTRY_NAME, parent_record) if parent_record else None
+    if keys is None or seen is None:
+        print("\n❌ ERROR: Incremental mode needs a registered model with recorded training rows")
+        print("   and a row key column; run a full retrain first: python retrain_ranking_model.py")
+        sys.exit(1)
+
+    parent = model_registry.load_version(REGISTRY_NAME, parent_record)
+    is_new = ~keys.isin(seen)
+    print(f"\n🧩 Base model: version {parent_record['version']} ({parent_record['mode']}, "
+          f"{parent_record['rows_trained']:,} rows)")
+    print(f"   New rows: {int(is_new.sum()):,} of {len(X):,}")
+    if not is_new.any():
+        print("✅ Nothing to learn: every row is already in the latest model")
+        return None
+
+    # Hold out part of the new rows: neither the base model nor the updates have seen them
+    X_new, y_new = X[is_new.values], y[is_new.values]
+    if len(X_new) >= 5:
+        X_new, X_test, y_new, y_test = train_test_split(X_new, y_new, test_size=0.2, random_state=42)
+    else:
+        X_test, y_test = X_new.iloc[:0], y_new[:0]
+    X_seen, y_seen = X[~is_new.values], y[~is_new.values]
+    X_all, y_all = pd.concat([X_seen, X_new]), np.concatenate([y_seen, y_new])
+
+    mode = "refresh" if args.refresh else "continue"
+    print(f"\n🚀 Updating version {parent_record['version']} ({mode}"
+          f"{'' if args.refresh else f', +{args.rounds} rounds'})...")
+    started = time.perf_counter()
+    pipeline = warm_start(parent, X_new, y_new, X_all, y_all, rounds=args.rounds, refresh=args.refresh)
+    seconds = time.perf_counter() - started
+    print(f"✅ Update completed in {seconds:.2f}s!")
+
+    rmse, r2 = evaluate(pipeline, X_test, y_test)
+    base_rmse, base_r2 = evaluate(parent, X_test, y_test)
+    rows = [("base (no update)", base_rmse, base_r2, 0.0), (f"incremental ({mode})", rmse, r2, seconds)]
+
+    if args.compare:
+        print("\n🔁 Full retrain with the same configuration, for comparison...")
+        params = dict(parent_record["params"])
+        started = time.perf_counter()
+        full_pipeline, _ = full_retrain(X_all, y_all, params=params)
+        full_seconds = time.perf_counter() - started
+        full_rmse, full_r2 = evaluate(full_pipeline, X_test, y_test)
+        rows.append(("full retrain", full_rmse, full_r2, full_seconds))
+
+    print(f"\n📊 Held-out new rows ({len(X_test):,}):")
+    print(pd.DataFrame(rows, columns=["Model", "RMSE", "R²", "Seconds"]).to_string(index=False))
+
+    record = {
+        "mode": f"incremental_{mode}",
+        # The configuration a full retrain would use; the booster itself has grown
+        "params": parent_record["params"],
+        "n_boosted_rounds": int(pipeline.named_steps['model'].get_booster().num_boosted_rounds()),
+        "rows_trained": len(X_all),
+        "new_rows": len(X_new),
+        "train_seconds": round(seconds, 2),
+        "test_rmse": rmse,
+        "test_r2": r2,
+    }
+    if args.compare:
+        record["full_retrain"] = {"test_rmse": full_rmse, "test_r2": full_r2,
+                                  "train_seconds": round(full_seconds, 2)}
+    train_keys = pd.concat([keys[~is_new], keys.loc[X_new.index]])
+    return pipeline, record, train_keys, (X_test, y_test)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Retrain the ranking model on github_training_data.csv")
+    parser.add_argument("--data", default="github_training_data.csv", help="Training CSV (collect_training_data.py)")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Update the latest registered version with the rows it has not seen")
+    parser.add_argument("--rounds", type=int, default=DEFAULT_INCREMENTAL_ROUNDS,
+                        help="Boosting rounds to add in incremental mode")
+    parser.add_argument("--refresh", action="store_true",
+                        help="Incremental: re-fit the existing trees' leaf values on all rows instead of adding rounds")
+    parser.add_argument("--compare", action="store_true",
+                        help="Incremental: also run a full retrain and compare on held-out new rows")
+    args = parser.parse_args(argv)
+
+    df = load_data(args.data)
+    normalization = None
+    if args.incremental:
+        # Targets of rows the base model learned must not move because new rows shift the quantiles
+        base_record = model_registry.latest(REGISTRY_NAME)
+        normalization = (base_record or {}).get("target_normalization")
+        if base_record and normalization is None:
+            print("\n⚠️ The base version has no frozen target normalization (published before it was")
+            print("   recorded); targets are normalized over this table, which shifts already-seen rows.")
+    df, normalization = add_rank_target(df, normalization)
+    X, y, keys = prepare_features(df)
+
+    if args.incremental:
+        result = run_incremental(args, X, y, keys)
+        if result is None:
+            return 0
+        pipeline, record, train_keys, (X_test, y_test) = result
+    else:
+        pipeline, record, train_keys, (X_test, y_test) = run_full(args, X, y, keys)
+
+    # ============================================================================
+    # STEP 7: Save the Retrained Model
+    # ============================================================================
+    print("\n💾 Saving model...")
+
+    record["target_normalization"] = normalization
+    record = model_registry.publish(REGISTRY_NAME, pipeline, record, keys=train_keys)
+
+    print(f"✅ Model saved to: {model_registry.MODEL_DIR / 'ranking_xgboost.pkl'} (version {record['version']})")
+    print(f"✅ Manifest updated: {model_registry.MODEL_DIR / model_registry.MANIFEST_NAME}")
+
+    # ============================================================================
+    # STEP 8: Test Predictions
+    # ============================================================================
+    if len(X_test):
+        print("\n🧪 Testing predictions on sample repos...")
+
+        y_pred = pipeline.predict(X_test)
+        # Get top 10 by true scores
+        top_indices = np.argsort(y_test)[-10:][::-1]
+
+        print("\nTop 10 Repositories by New Ranking:")
+        print("-" * 80)
+        for i, idx in enumerate(top_indices, 1):
+            true_score = y_test[idx]
+            pred_score = y_pred[idx]
+            print(f"{i}. True: {true_score:.3f} | Predicted: {pred_score:.3f} | Diff: {abs(true_score-pred_score):.3f}")
+
+    print("\n" + "="*80)
+    print("✅ RETRAINING COMPLETE!")
+    print("="*80)
+    print("\n📝 Next Steps:")
+    print("1. Remove the hardcoded priority scoring from generate_portfolio_improved.py")
+    print("2. Use ONLY the model predictions (base_scores)")
+    print("3. Your model now naturally understands: Stars > Forks > Watchers > Commits > Recency")
+    print("4. After collecting more data: python retrain_ranking_model.py --incremental --compare")
+    print("\n🎯 The model has learned your priorities!")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,479 @@
+"""
+Training DAG
+Runs a stage-annotated training script (ml_model.py) as a dependency graph:
+stages whose code, inputs and source files did not change are loaded from
+the cache instead of re-run, and independent stages run in parallel processes
+
+Annotations are comment lines, so the script still runs top to bottom:
+
+    # %% setup
+    ...imports, config and helpers; run before every stage...
+    # %% stage: ranking | inputs: df, rank_components | outputs: pipe_rank_xgb | files: repos_csv | code: feature_engineering.py
+    # %% stage: save | inputs: pipe_rank_xgb | writes: {SAVE_DIR}/ranking_xgboost.pkl
+
+`inputs` are globals produced by an earlier stage's `outputs`; `files` are
+paths (or setup-region variables holding a path) the stage reads; `code` are
+modules whose source the stage depends on; `writes` are the files the stage
+saves, as paths or globs formatted with the stage's variables after it ran.
+The digests of written files go into the cache entry, so a stage whose files
+were deleted or changed since is run again rather than loaded from the cache. A stage's cache key hashes its own
+code, every setup region, those files and modules, the values of the environment
+variables the stage reads (directly or through a setup variable, see stage_env)
+and the content of each input value, so an upstream stage that re-runs but
+produces the same values does not invalidate anything downstream.
+
+Stages that start together split the CPU budget: each gets its share as
+TRAINING_N_JOBS (read by the script) and as the BLAS/OpenMP thread limit, and
+loads its inputs as copy-on-write memory maps of the cached arrays, so the
+feature frame the model families share is read from one page cache instead of
+being copied into every process.
+
+Usage:
+    python training_dag.py [--script ml_model.py] [--cpus N] [--workers N] [--force STAGE ...] [--list] [STAGE ...]
+"""
+
+import os
+import re
+import sys
+import ast
+import json
+import time
+import shutil
+import glob
+import hashlib
+import argparse
+import contextlib
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from typing import Dict, List, Optional
+
+import joblib
+
+try:
+    from threadpoolctl import threadpool_limits
+    HAS_THREADPOOLCTL = True
+except ImportError:
+    HAS_THREADPOOLCTL = False
+
+DEFAULT_SCRIPT = "ml_model.py"
+CACHE_DIR = Path(os.environ.get("TRAINING_DAG_CACHE", "training_outputs/stages"))
+# Cache entries kept per stage (newest first); older ones are deleted after a run
+KEEP_ENTRIES = int(os.environ.get("TRAINING_DAG_KEEP", "3"))
+
+# Read by the script but only set how many cores a stage uses (this runner sets it per stage)
+ENV_IGNORED = {"TRAINING_N_JOBS"}
+
+_MARKER = re.compile(r"^# %% (setup|stage:\s*(\w+)(.*))$")
+_FIELDS = ("inputs", "outputs", "files", "code", "writes")
+
+
+class Stage:
+    """One "# %% stage:" region of the script."""
+
+    def __init__(self, name: str, source: str, first_line: int, **fields: List[str]):
+        self.name = name
+        self.source = source
+        self.first_line = first_line
+        self.inputs: List[str] = fields.get("inputs", [])
+        self.outputs: List[str] = fields.get("outputs", [])
+        self.files: List[str] = fields.get("files", [])
+        self.code: List[str] = fields.get("code", [])
+        self.writes: List[str] = fields.get("writes", [])
+        # Producing stage of each input, filled in by parse_script()
+        self.producers: Dict[str, str] = {}
+
+    @property
+    def upstream(self) -> List[str]:
+        return sorted(set(self.producers.values()))
+
+
+def parse_script(path) -> "tuple[str, Dict[str, Stage]]":
+    """
+    Split a script into its setup code and its stages (in file order).
+
+    Raises:
+        ValueError: A stage input no earlier stage outputs, or a duplicate stage name
+    """
+    lines = Path(path).read_text(encoding="utf-8").splitlines(keepends=True)
+    marks = [(i, _MARKER.match(line.rstrip("\n"))) for i, line in enumerate(lines)]
+    marks = [(i, m) for i, m in marks if m]
+    setup_parts, stages = [], {}
+    # Code before the first marker is setup too
+    if marks and marks[0][0] > 0:
+        setup_parts.append((0, "".join(lines[:marks[0][0]])))
+    for n, (i, m) in enumerate(marks):
+        end = marks[n + 1][0] if n + 1 < len(marks) else len(lines)
+        body = "".join(lines[i + 1:end])
+        if m.group(1) == "setup":
+            setup_parts.append((i + 1, body))
+            continue
+        name, fields = m.group(2), {}
+        for part in m.group(3).split("|"):
+            key, _, values = part.partition(":")
+            if key.strip() in _FIELDS:
+                fields[key.strip()] = [v.strip() for v in values.split(",") if v.strip()]
+        if name in stages:
+            raise ValueError(f"Duplicate stage '{name}' in {path}")
+        stages[name] = Stage(name, body, i + 2, **fields)
+
+    produced: Dict[str, str] = {}
+    for stage in stages.values():
+        for name in stage.inputs:
+            if name not in produced:
+                raise ValueError(f"Stage '{stage.name}' needs '{name}', which no earlier stage outputs")
+            stage.producers[name] = produced[name]
+        for name in stage.outputs:
+            produced[name] = stage.name
+    return _padded(setup_parts), stages
+
+
+def _padded(parts) -> str:
+    """Setup regions joined with blank lines so tracebacks keep the script's line numbers."""
+    out, line = [], 0
+    for first_line, body in parts:
+        out.append("\n" * (first_line - line))
+        out.append(body)
+        line = first_line + body.count("\n")
+    return "".join(out)
+
+
+def _setup_paths(setup: str) -> Dict[str, str]:
+    """Module-level `name = "literal"` assignments of the setup code (e.g. users_csv)."""
+    paths = {}
+    for node in ast.parse(setup).body:
+        if (isinstance(node, ast.Assign) and len(node.targets) == 1 and isinstance(node.targets[0], ast.Name)
+                and isinstance(node.value, ast.Constant) and isinstance(node.value.value, str)):
+            paths[node.targets[0].id] = node.value.value
+    return paths
+
+
+def _env_name(node: ast.AST) -> Optional[str]:
+    """NAME of an os.environ.get("NAME", ...), os.getenv("NAME", ...) or os.environ["NAME"] expression."""
+    if isinstance(node, ast.Call) and node.args and isinstance(node.args[0], ast.Constant):
+        func = ast.unparse(node.func)
+        if func in ("os.environ.get", "os.getenv", "environ.get", "getenv"):
+            return node.args[0].value if isinstance(node.args[0].value, str) else None
+    if isinstance(node, ast.Subscript) and ast.unparse(node.value) in ("os.environ", "environ"):
+        key = node.slice
+        if isinstance(key, ast.Constant) and isinstance(key.value, str):
+            return key.value
+    return None
+
+
+def _env_reads(tree: ast.AST) -> List[str]:
+    return sorted({name for node in ast.walk(tree) for name in [_env_name(node)] if name})
+
+
+def stage_env(stage: Stage, setup: str) -> List[str]:
+    """
+    Environment variables a stage's results depend on.
+
+    Those the stage reads itself, plus those the setup code reads into a variable
+    the stage uses (e.g. RANK_SEARCH_CANDIDATES for ranking_tune). A setup knob
+    that other setup code uses as well counts for every stage. ENV_IGNORED knobs
+    only change how a stage runs, not what it produces.
+    """
+    names = set(_env_reads(ast.parse(stage.source)))
+    stage_names = {node.id for node in ast.walk(ast.parse(stage.source)) if isinstance(node, ast.Name)}
+    setup_tree = ast.parse(setup)
+    for node in setup_tree.body:
+        knobs = _env_reads(node)
+        if not knobs:
+            continue
+        targets = ({t.id for t in node.targets if isinstance(t, ast.Name)}
+                   if isinstance(node, ast.Assign) else set())
+        used_in_setup = any(
+            isinstance(other, ast.Name) and isinstance(other.ctx, ast.Load) and other.id in targets
+            for top in setup_tree.body if top is not node for other in ast.walk(top)
+        )
+        if not targets or used_in_setup or targets & stage_names:
+            names.update(knobs)
+    return sorted(names - ENV_IGNORED)
+
+
+def _file_digest(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def stage_key(stage: Stage, setup: str, input_hashes: Dict[str, str], base: Path) -> str:
+    """Content hash of everything a stage's outputs depend on."""
+    paths = _setup_paths(setup)
+    h = hashlib.sha256()
+    for part in (stage.name, stage.source, setup):
+        h.update(part.encode("utf-8"))
+        h.update(b"\0")
+    for name in stage.files:
+        path = base / paths.get(name, name)
+        h.update(f"file:{name}:{_file_digest(path) if path.exists() else 'missing'}\0".encode())
+    for name in stage.code:
+        h.update(f"code:{name}:{_file_digest(base / name)}\0".encode())
+    for name in stage.inputs:
+        h.update(f"input:{name}:{input_hashes[name]}\0".encode())
+    for pattern in stage.writes:
+        h.update(f"writes:{pattern}\0".encode())
+    for name in stage_env(stage, setup):
+        h.update(f"env:{name}:{os.environ.get(name)!r}\0".encode())
+    return h.hexdigest()[:20]
+
+
+def _written_files(stage: Stage, namespace: dict) -> Dict[str, dict]:
+    """
+    {path: size, mtime and digest} of the existing files matching a stage's `writes` patterns.
+
+    Raises:
+        RuntimeError: A pattern names a variable the stage did not define
+    """
+    values = {k: str(v) for k, v in namespace.items() if isinstance(v, (str, Path))}
+    written = {}
+    for pattern in stage.writes:
+        try:
+            pattern = pattern.format(**values)
+        except (KeyError, IndexError, ValueError) as e:
+            raise RuntimeError(f"Stage '{stage.name}' writes '{pattern}', which it cannot format ({e})") from e
+        for path in sorted(glob.glob(pattern)):
+            if os.path.isfile(path):
+                st = os.stat(path)
+                written[os.path.abspath(path)] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns,
+                                                  "sha256": _file_digest(Path(path))}
+    return written
+
+
+def _unchanged(path: str, record: dict) -> bool:
+    """Whether a written file is still as the stage left it (digest only when size or mtime moved)."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return False
+    if st.st_size == record["size"] and st.st_mtime_ns == record["mtime_ns"]:
+        return True
+    return st.st_size == record["size"] and _file_digest(Path(path)) == record["sha256"]
+
+
+def _entry_dir(stage: str, key: str) -> Path:
+    return CACHE_DIR / stage / key
+
+
+def load_manifest(stage: str, key: str) -> Optional[dict]:
+    """Manifest of a complete cache entry whose path-valued outputs and written files are intact, else None."""
+    manifest_path = _entry_dir(stage, key) / "manifest.json"
+    if not manifest_path.exists():
+        return None
+    manifest = json.loads(manifest_path.read_text())
+    # Stages that write files hand their paths downstream; a deleted file means re-run
+    if any(not os.path.exists(p) for p in manifest.get("paths", [])):
+        return None
+    # A deleted or edited file the stage wrote means its side effects are gone: re-run
+    if any(not _unchanged(p, record) for p, record in manifest.get("writes", {}).items()):
+        return None
+    return manifest
+
+
+def _release_joblib_workers() -> None:
+    """Stop the stage's joblib worker processes now rather than after their idle timeout."""
+    loky = sys.modules.get("joblib.externals.loky.reusable_executor")
+    executor = getattr(loky, "_executor", None)
+    if executor is not None:
+        executor.shutdown(wait=True)
+
+
+def _run_stage(script: str, stage_name: str, key: str, inputs: Dict[str, str], cpus: int = 0) -> dict:
+    """
+    Execute one stage in this (worker) process.
+
+    Runs every setup region, maps the inputs from their producers' cache
+    entries, executes the stage and stores each output as its own file,
+    recording the digests of the files it wrote.
+    stdout/stderr go to the entry's stage.log. `cpus` > 0 caps the threads
+    the stage uses.
+    """
+    setup, stages = parse_script(script)
+    stage = stages[stage_name]
+    final_dir = _entry_dir(stage_name, key)
+    work_dir = final_dir.with_name(final_dir.name + ".tmp")
+    shutil.rmtree(work_dir, ignore_errors=True)
+    work_dir.mkdir(parents=True)
+
+    if cpus > 0:
+        # Libraries that start their thread pools later (XGBoost, TensorFlow) read these
+        for var in ("TRAINING_N_JOBS", "OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS"):
+            os.environ[var] = str(cpus)
+    limits = threadpool_limits(limits=cpus) if cpus > 0 and HAS_THREADPOOLCTL else contextlib.nullcontext()
+
+    started = time.perf_counter()
+    namespace = {"__name__": "__training_stage__", "__file__": os.path.abspath(script)}
+    with open(work_dir / "stage.log", "w", encoding="utf-8") as log, \
+            contextlib.redirect_stdout(log), contextlib.redirect_stderr(log), limits:
+        exec(compile(setup, script, "exec"), namespace)
+        for name, path in inputs.items():
+            # Numeric arrays stay memory-mapped (copy-on-write), so parallel stages share the pages
+            namespace[name] = joblib.load(path, mmap_mode="c")
+        code = "\n" * (stage.first_line - 1) + stage.source
+        try:
+            exec(compile(code, script, "exec"), namespace)
+        finally:
+            _release_joblib_workers()
+
+    missing = [name for name in stage.outputs if name not in namespace]
+    if missing:
+        raise RuntimeError(f"Stage '{stage_name}' did not define its outputs {missing}")
+    hashes, paths = {}, []
+    for name in stage.outputs:
+        value = namespace[name]
+        joblib.dump(value, work_dir / f"{name}.joblib")
+        hashes[name] = _file_digest(work_dir / f"{name}.joblib")
+        if isinstance(value, (str, Path)) and os.path.isfile(value):
+            paths.append(os.path.abspath(value))
+    manifest = {
+        "stage": stage_name,
+        "key": key,
+        "outputs": hashes,
+        "paths": paths,
+        "writes": _written_files(stage, namespace),
+        "seconds": round(time.perf_counter() - started, 2),
+        "cpus": cpus,
+        "finished": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+    (work_dir / "manifest.json").write_text(json.dumps(manifest, indent=2))
+    shutil.rmtree(final_dir, ignore_errors=True)
+    os.replace(work_dir, final_dir)
+    return manifest
+
+
+def _prune(stage: str) -> None:
+    entries = sorted((p for p in (CACHE_DIR / stage).glob("*") if p.is_dir() and not p.name.endswith(".tmp")),
+                     key=lambda p: p.stat().st_mtime, reverse=True)
+    for old in entries[KEEP_ENTRIES:]:
+        shutil.rmtree(old, ignore_errors=True)
+
+
+def _needed(stages: Dict[str, Stage], targets: List[str]) -> List[str]:
+    """Targets plus everything upstream of them, in script order."""
+    keep, todo = set(), list(targets)
+    while todo:
+        name = todo.pop()
+        if name not in stages:
+            raise ValueError(f"Unknown stage '{name}' (stages: {', '.join(stages)})")
+        if name not in keep:
+            keep.add(name)
+            todo.extend(stages[name].upstream)
+    return [name for name in stages if name in keep]
+
+
+def _shares(free: int, n: int) -> List[int]:
+    """Split `free` cores over `n` stages (at least one each, the remainder to the first ones)."""
+    base, extra = divmod(max(free, n), n)
+    return [base + (1 if i < extra else 0) for i in range(n)]
+
+
+def run(script: str = DEFAULT_SCRIPT, targets: Optional[List[str]] = None, workers: Optional[int] = None,
+        force: Optional[List[str]] = None, cpus: Optional[int] = None) -> Dict[str, dict]:
+    """
+    Run the stages needed for `targets` (all stages by default).
+
+    A stage starts as soon as its upstream stages are done, in its own
+    process, with at most `workers` running at once. Stages starting together
+    split the cores not held by running stages (`cpus` in total). Cached
+    stages are not run; `force` names stages to re-run regardless.
+
+    Returns:
+        {stage: manifest}, with manifest["cached"] telling which were reused
+    """
+    script = str(script)
+    setup, stages = parse_script(script)
+    base = Path(script).resolve().parent
+    order = _needed(stages, targets or list(stages))
+    force = set(force or [])
+    cpus = cpus or os.cpu_count() or 1
+    workers = workers or cpus
+
+    done: Dict[str, dict] = {}
+    pending = list(order)
+    ready: Dict[str, str] = {}  # stage -> key, upstream done and not cached
+    running = {}
+    # A fresh process per stage: thread limits apply before any library starts its pools,
+    # and no imports or globals carry over from the previous stage
+    pool_options = {"max_tasks_per_child": 1} if sys.version_info >= (3, 11) else {}
+    with ProcessPoolExecutor(max_workers=workers, **pool_options) as pool:
+        while pending or ready or running:
+            # Resolve cache hits first: each one can unblock stages further down
+            progress = True
+            while progress:
+                progress = False
+                for name in list(pending):
+                    stage = stages[name]
+                    if any(up not in done for up in stage.upstream):
+                        continue
+                    pending.remove(name)
+                    input_hashes = {i: done[p]["outputs"][i] for i, p in stage.producers.items()}
+                    key = stage_key(stage, setup, input_hashes, base)
+                    manifest = None if name in force else load_manifest(name, key)
+                    if manifest is None:
+                        ready[name] = key
+                        continue
+                    done[name] = dict(manifest, cached=True)
+                    print(f"[dag] {name}: cached ({key})")
+                    progress = True
+
+            free = cpus - sum(budget for _, _, budget in running.values())
+            n = min(len(ready), workers - len(running), free)
+            if n <= 0 and ready and not running:
+                n = 1
+            if n > 0:
+                for (name, key), budget in zip(list(ready.items())[:n], _shares(free, n)):
+                    del ready[name]
+                    stage = stages[name]
+                    inputs = {i: str(_entry_dir(p, done[p]["key"]) / f"{i}.joblib") for i, p in stage.producers.items()}
+                    print(f"[dag] {name}: running on {budget} cpu(s) ({key}), log: {_entry_dir(name, key) / 'stage.log'}")
+                    running[pool.submit(_run_stage, script, name, key, inputs, budget)] = (name, key, budget)
+            if not running:
+                continue
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                name, key, _ = running.pop(future)
+                try:
+                    manifest = future.result()
+                except Exception as e:
+                    for other in running:
+                        other.cancel()
+                    log = _entry_dir(name, key + ".tmp") / "stage.log"
+                    print(f"[dag] {name}: failed ({type(e).__name__}: {e}), log: {log}")
+                    raise
+                done[name] = dict(manifest, cached=False)
+                print(f"[dag] {name}: done in {manifest['seconds']:.1f}s")
+                _prune(name)
+    return done
+
+
+def describe(script: str = DEFAULT_SCRIPT) -> None:
+    """Print the stage graph."""
+    _, stages = parse_script(script)
+    for stage in stages.values():
+        after = ", ".join(stage.upstream) or "-"
+        print(f"{stage.name:14s} after: {after:28s} outputs: {', '.join(stage.outputs)}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run a stage-annotated training script as a cached DAG.")
+    parser.add_argument("targets", nargs="*", help="Stages to bring up to date (default: all)")
+    parser.add_argument("--script", default=DEFAULT_SCRIPT, help=f"Annotated script (default: {DEFAULT_SCRIPT})")
+    parser.add_argument("--cpus", type=int, default=None, help="Cores shared by the running stages (default: CPU count)")
+    parser.add_argument("--workers", type=int, default=None, help="Stages run at once (default: --cpus)")
+    parser.add_argument("--force", nargs="+", default=[], metavar="STAGE", help="Re-run these stages even if cached")
+    parser.add_argument("--list", action="store_true", help="Print the stage graph and exit")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        describe(args.script)
+        return 0
+    results = run(args.script, args.targets, args.workers, args.force, args.cpus)
+    reused = [name for name, m in results.items() if m["cached"]]
+    print(f"[dag] {len(results)} stages, {len(reused)} from cache")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,209 @@
+"""
+Training Data Ingestion
+Crawl CSVs converted once to a columnar cache with compact dtypes, so each
+training stage reads only the columns it needs
+
+Without pyarrow the CSVs are read directly (same dtypes, same column
+selection), just without the cache.
+"""
+
+import os
+import hashlib
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401  (Parquet engine)
+    import pyarrow.parquet as pq
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+CACHE_DIR = Path(os.environ.get("TRAINING_CACHE_DIR", "training_outputs/cache"))
+CACHE_SUFFIX = ".parquet"
+
+# Repeated strings become categoricals; counts that stay far below 2**31 become int32.
+# Sizes and line counts keep int64 (their sums overflow int32); floats are float32.
+USER_DTYPES: Dict[str, str] = {
+    **{c: 'int32' for c in [
+        'total_commit_contributions', 'total_pr_contributions', 'total_issue_contributions',
+        'total_pr_review_contributions', 'total_repositories', 'account_age_days',
+        'contributions_this_year', 'unique_repos_committed', 'active_repos',
+        'total_gist_comments', 'following_count', 'followers_count', 'organizations_count',
+        'forked_repositories_count', 'pinned_items_count', 'total_languages',
+        'sponsoring_count', 'sponsors_count', 'total_started_repos', 'total_forked_repos',
+        'total_contributions', 'total_issue_comments', 'total_discussion_comments',
+        'total_commit_comments',
+    ]},
+    'total_recent_additions': 'int64',
+    'total_recent_deletions': 'int64',
+}
+
+REPO_DTYPES: Dict[str, str] = {
+    'owner_login': 'category',
+    'primary_language': 'category',
+    'stargazer_count': 'int32',
+    'fork_count': 'int32',
+    'watchers_count': 'int32',
+    'languages_total_count': 'int32',
+    'releases_count': 'int32',
+    'languages_total_size': 'int64',
+    'is_private': 'bool',
+    'is_fork': 'bool',
+}
+
+
+def compact_dtypes(df: pd.DataFrame, dtypes: Optional[Dict[str, str]] = None) -> pd.DataFrame:
+    """
+    Cast columns in place to the dtype map; other float64 columns become float32.
+
+    Integer columns with gaps become floats (NaN needs a float), boolean
+    columns with gaps and values outside an integer type's range are left as read.
+    """
+    dtypes = dtypes or {}
+    for col in df.columns:
+        s = df[col]
+        target = dtypes.get(col)
+        if target == 'category':
+            df[col] = s.astype('category')
+        elif target == 'bool':
+            if pd.api.types.is_bool_dtype(s) and not s.isna().any():
+                df[col] = s.astype(bool)
+        elif target is not None and pd.api.types.is_numeric_dtype(s) and not pd.api.types.is_bool_dtype(s):
+            if s.isna().any():
+                df[col] = s.astype('float32' if np.dtype(target).itemsize <= 4 else 'float64')
+            elif pd.api.types.is_integer_dtype(s) or (s == s.round()).all():
+                info = np.iinfo(target)
+                if s.empty or (info.min <= s.min() and s.max() <= info.max):
+                    df[col] = s.astype(target)
+            else:
+                df[col] = s.astype('float32')
+        elif target is None and s.dtype == np.float64:
+            df[col] = s.astype('float32')
+    return df
+
+
+def _wanted(columns: Optional[Iterable[str]]):
+    return None if columns is None else set(columns)
+
+
+def _select(df: pd.DataFrame, columns: Optional[Iterable[str]]) -> pd.DataFrame:
+    if columns is None:
+        return df
+    return df[[c for c in columns if c in df.columns]]
+
+
+def _read_parquet(path: Path, columns: Optional[Iterable[str]]) -> pd.DataFrame:
+    if columns is not None:
+        available = set(pq.ParquetFile(path).schema_arrow.names)
+        columns = [c for c in columns if c in available]
+    return pd.read_parquet(path, columns=columns)
+
+
+def _read_csv(path, columns: Optional[Iterable[str]]) -> pd.DataFrame:
+    wanted = _wanted(columns)
+    usecols = None if wanted is None else (lambda c: c in wanted)
+    return pd.read_csv(path, usecols=usecols, low_memory=False)
+
+
+def cache_path(csv_path, dtypes: Optional[Dict[str, str]] = None) -> Path:
+    """
+    Cache file for a CSV under CACHE_DIR.
+
+    The name carries a fingerprint of the dtype map, so changing the map
+    never serves a table cached with the old dtypes.
+    """
+    fingerprint = hashlib.sha1(repr(sorted((dtypes or {}).items())).encode()).hexdigest()[:8]
+    return CACHE_DIR / f"{Path(csv_path).stem}.{fingerprint}{CACHE_SUFFIX}"
+
+
+def _is_fresh(derived: Path, source: Path) -> bool:
+    return derived.exists() and derived.stat().st_mtime_ns >= source.stat().st_mtime_ns
+
+
+def _write_parquet(df: pd.DataFrame, path: Path) -> bool:
+    """Write atomically; False if the frame has columns Parquet cannot hold."""
+    tmp = path.with_name(path.name + ".tmp")
+    try:
+        df.to_parquet(tmp, index=False)
+    except (ValueError, TypeError, pyarrow.ArrowException) as e:
+        print(f"   ⚠️ Not caching {path.name}: {e}")
+        tmp.unlink(missing_ok=True)
+        return False
+    os.replace(tmp, path)
+    return True
+
+
+def load_table(csv_path, dtypes: Optional[Dict[str, str]] = None,
+               columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Load a crawl CSV with compact dtypes.
+
+    The first load converts the whole CSV to Parquet under CACHE_DIR; later
+    loads read just `columns` from it until the CSV changes. Requested columns
+    the table does not have are skipped.
+
+    Args:
+        csv_path: Source CSV
+        dtypes: Dtype map, e.g. USER_DTYPES or REPO_DTYPES
+        columns: Columns to return (all when None)
+    """
+    csv_path = Path(csv_path)
+    if not HAS_PYARROW:
+        return compact_dtypes(_read_csv(csv_path, columns), dtypes)
+
+    cached = cache_path(csv_path, dtypes)
+    if _is_fresh(cached, csv_path):
+        return _read_parquet(cached, columns)
+
+    df = compact_dtypes(pd.read_csv(csv_path, low_memory=False), dtypes)
+    cached.parent.mkdir(parents=True, exist_ok=True)
+    if _write_parquet(df, cached):
+        for stale in cached.parent.glob(f"{csv_path.stem}.*{CACHE_SUFFIX}"):
+            if stale != cached:
+                stale.unlink(missing_ok=True)
+        print(f"   💾 Cached {csv_path.name} -> {cached}")
+    return _select(df, columns)
+
+
+def sibling_path(csv_path) -> Path:
+    """Parquet copy written next to a training artifact CSV."""
+    return Path(csv_path).with_suffix(CACHE_SUFFIX)
+
+
+def _arrow_safe(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Mixed-type object columns as strings (e.g. an email column holding the 0 of a
+    frame-wide fillna), which is also how they read back from the CSV.
+    """
+    mixed = [c for c in df.columns
+             if df[c].dtype == object and pd.api.types.infer_dtype(df[c], skipna=True).startswith('mixed')]
+    if not mixed:
+        return df
+    return df.assign(**{c: df[c].where(df[c].isna(), df[c].astype(str)) for c in mixed})
+
+
+def write_table(df: pd.DataFrame, csv_path) -> str:
+    """
+    Write a training artifact as CSV plus (with pyarrow) a Parquet copy next to it.
+
+    The CSV stays the human-readable artifact; read_table() prefers the copy.
+
+    Returns:
+        The CSV path written
+    """
+    df.to_csv(csv_path, index=False)
+    if HAS_PYARROW:
+        _write_parquet(_arrow_safe(df), sibling_path(csv_path))
+    return str(csv_path)
+
+
+def read_table(csv_path, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """Read `columns` of an artifact written by write_table(), from its Parquet copy when fresh."""
+    sibling = sibling_path(csv_path)
+    if HAS_PYARROW and _is_fresh(sibling, Path(csv_path)):
+        return _read_parquet(sibling, columns)
+    return _read_csv(csv_path, columns)